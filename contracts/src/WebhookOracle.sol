@@ -71,6 +71,15 @@ contract WebhookOracle is OwnableRoles {
         uint32 nonce
     );
 
+    /*  
+    ┌──────────────────────────────────────────────────────────────────────────╮
+    │                                 errors                                   │
+    ╰──────────────────────────────────────────────────────────────────────────┘
+    */
+
+    /// @notice Thrown when batch submission arrays differ in length
+    error LengthMismatch();
+
     /*  
     ┌──────────────────────────────────────────────────────────────────────────╮
     │                               modifiers                                 │
@@ -139,6 +148,42 @@ contract WebhookOracle is OwnableRoles {
         bytes16 _alertId,
         Action _action
     ) external onlySubmitter {
+        _submitAlert(_alertId, _action);
+    }
+
+    /**
+     * @notice Submits several trading alerts in a single transaction.
+     * @dev Each alert is processed exactly as in submitAlert, in array order, so repeated
+     *   alert IDs within one batch each increment the nonce and the last action wins.
+     *   Amortizes the base transaction cost and role check across the batch.
+     * 
+     * Requirements:
+     * - Caller must have SUBMITTER_ROLE or be the contract owner
+     * - `_alertIds` and `_actions` must have the same length
+     * 
+     * @param _alertIds Unique identifiers of the alerts
+     * @param _actions Trading actions, one per alert ID
+     */
+    function submitAlerts(
+        bytes16[] calldata _alertIds,
+        Action[] calldata _actions
+    ) external onlySubmitter {
+        if (_alertIds.length != _actions.length) revert LengthMismatch();
+        for (uint256 i = 0; i < _alertIds.length; ++i) {
+            _submitAlert(_alertIds[i], _actions[i]);
+        }
+    }
+
+    /*  
+    ┌──────────────────────────────────────────────────────────────────────────╮
+    │                            internal functions                            │
+    ╰──────────────────────────────────────────────────────────────────────────┘
+    */
+
+    /**
+     * @dev Stores an alert with an incremented nonce and emits AlertSubmitted.
+     */
+    function _submitAlert(bytes16 _alertId, Action _action) internal {
         AlertData storage currentAlert = alerts[_alertId];
         uint32 newNonce = currentAlert.nonce + 1;
         
@@ -162,4 +162,74 @@ contract WebhookOracleTest is Test {
         assertTrue(alert2.timestamp > firstTimestamp);
         assertEq(alert2.timestamp, uint32(block.timestamp));
     }
-}
\ No newline at end of file
+
+    // === Batch Submission Tests ===
+
+    function test_SubmitAlerts() public {
+        bytes16 alertId2 = 0x44444444444444444444444444444444;
+        bytes16[] memory alertIds = new bytes16[](2);
+        WebhookOracle.Action[] memory actions = new WebhookOracle.Action[](2);
+        alertIds[0] = ALERT_ID;
+        alertIds[1] = alertId2;
+        actions[0] = WebhookOracle.Action.LONG;
+        actions[1] = WebhookOracle.Action.SHORT;
+
+        oracle.submitAlerts(alertIds, actions);
+
+        WebhookOracle.AlertData memory alert1 = oracle.getAlert(ALERT_ID);
+        WebhookOracle.AlertData memory alert2 = oracle.getAlert(alertId2);
+        assertTrue(alert1.action == WebhookOracle.Action.LONG);
+        assertTrue(alert2.action == WebhookOracle.Action.SHORT);
+        assertEq(alert1.nonce, 1);
+        assertEq(alert2.nonce, 1);
+    }
+
+    function test_SubmitAlertsRepeatedIdLastWins() public {
+        bytes16[] memory alertIds = new bytes16[](2);
+        WebhookOracle.Action[] memory actions = new WebhookOracle.Action[](2);
+        alertIds[0] = ALERT_ID;
+        alertIds[1] = ALERT_ID;
+        actions[0] = WebhookOracle.Action.LONG;
+        actions[1] = WebhookOracle.Action.SHORT;
+
+        oracle.submitAlerts(alertIds, actions);
+
+        WebhookOracle.AlertData memory alert = oracle.getAlert(ALERT_ID);
+        assertTrue(alert.action == WebhookOracle.Action.SHORT);
+        assertEq(alert.nonce, 2);
+    }
+
+    function test_SubmitAlertsEmitsPerAlert() public {
+        bytes16[] memory alertIds = new bytes16[](2);
+        WebhookOracle.Action[] memory actions = new WebhookOracle.Action[](2);
+        alertIds[0] = ALERT_ID;
+        alertIds[1] = ALERT_ID;
+        actions[0] = WebhookOracle.Action.LONG;
+        actions[1] = WebhookOracle.Action.SHORT;
+
+        vm.expectEmit(true, false, false, true);
+        emit WebhookOracle.AlertSubmitted(ALERT_ID, WebhookOracle.Action.LONG, uint32(block.timestamp), 1);
+        vm.expectEmit(true, false, false, true);
+        emit WebhookOracle.AlertSubmitted(ALERT_ID, WebhookOracle.Action.SHORT, uint32(block.timestamp), 2);
+
+        oracle.submitAlerts(alertIds, actions);
+    }
+
+    function test_SubmitAlertsLengthMismatch() public {
+        bytes16[] memory alertIds = new bytes16[](2);
+        WebhookOracle.Action[] memory actions = new WebhookOracle.Action[](1);
+
+        vm.expectRevert(WebhookOracle.LengthMismatch.selector);
+        oracle.submitAlerts(alertIds, actions);
+    }
+
+    function test_SubmitAlertsUnauthorized() public {
+        bytes16[] memory alertIds = new bytes16[](1);
+        WebhookOracle.Action[] memory actions = new WebhookOracle.Action[](1);
+        alertIds[0] = ALERT_ID;
+
+        vm.expectRevert(Unauthorized.selector);
+        vm.prank(user1);
+        oracle.submitAlerts(alertIds, actions);
+    }
+}
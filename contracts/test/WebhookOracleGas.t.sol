@@ -0,0 +1,67 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.13;
+
+import {Test, console} from "forge-std/Test.sol";
+import {WebhookOracle} from "../src/WebhookOracle.sol";
+
+/// @notice Gas comparison of single submitAlert calls against submitAlerts batches.
+/// Run with `forge test --match-contract WebhookOracleGasTest -vv` to print per-alert costs.
+/// Each single submission is charged the 21000 intrinsic transaction cost it would pay
+/// on-chain while a batch pays it once; calldata costs are not included.
+contract WebhookOracleGasTest is Test {
+    uint256 constant TX_BASE_GAS = 21000;
+
+    WebhookOracle public oracle;
+
+    function setUp() public {
+        oracle = new WebhookOracle();
+    }
+
+    function test_Gas_Single() public {
+        _benchmarkSingle(10);
+    }
+
+    function test_Gas_Batch10() public {
+        _benchmarkBatch(10);
+    }
+
+    function test_Gas_Batch50() public {
+        _benchmarkBatch(50);
+    }
+
+    function test_Gas_Batch100() public {
+        _benchmarkBatch(100);
+    }
+
+    function _benchmarkSingle(uint256 count) internal {
+        (bytes16[] memory alertIds, WebhookOracle.Action[] memory actions) = _alerts(count);
+
+        uint256 total;
+        for (uint256 i = 0; i < count; ++i) {
+            uint256 gasBefore = gasleft();
+            oracle.submitAlert(alertIds[i], actions[i]);
+            total += gasBefore - gasleft() + TX_BASE_GAS;
+        }
+        console.log("single: alerts", count, "gas per alert", total / count);
+    }
+
+    function _benchmarkBatch(uint256 count) internal {
+        (bytes16[] memory alertIds, WebhookOracle.Action[] memory actions) = _alerts(count);
+
+        uint256 gasBefore = gasleft();
+        oracle.submitAlerts(alertIds, actions);
+        uint256 total = gasBefore - gasleft() + TX_BASE_GAS;
+        console.log("batch: alerts", count, "gas per alert", total / count);
+
+        assertEq(oracle.getAlert(alertIds[count - 1]).nonce, 1);
+    }
+
+    function _alerts(uint256 count) internal pure returns (bytes16[] memory alertIds, WebhookOracle.Action[] memory actions) {
+        alertIds = new bytes16[](count);
+        actions = new WebhookOracle.Action[](count);
+        for (uint256 i = 0; i < count; ++i) {
+            alertIds[i] = bytes16(keccak256(abi.encode(i)));
+            actions[i] = i % 2 == 0 ? WebhookOracle.Action.LONG : WebhookOracle.Action.SHORT;
+        }
+    }
+}
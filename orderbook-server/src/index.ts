@@ -10,6 +10,7 @@ import { OrderRepository } from './database/repository.js';
 import { AlertMonitor, AlertMonitorConfig } from './services/alert-monitor.js';
 import ordersRouter from './routes/orders.js';
 import statsRouter from './routes/stats.js';
+import { createAlertsRouter } from './routes/alerts.js';
 
 // Load environment variables
 dotenv.config();
@@ -137,7 +138,11 @@ const specs = swaggerJsdoc(swaggerOptions);
 
 // Middleware
 app.use(helmet());
-app.use(express.json({ limit: '10mb' }));
+app.use(express.json({
+    limit: '10mb',
+    // Alert callbacks are signed over the exact bytes received
+    verify: (req, _res, buf) => { (req as any).rawBody = buf; }
+}));
 app.use(express.urlencoded({ extended: true }));
 
 // Swagger UI
@@ -234,6 +239,7 @@ app.get('/health', async (_req, res) => {
 // API routes
 app.use('/api/orders', ordersRouter);
 app.use('/api/stats', statsRouter);
+app.use('/api/alerts', createAlertsRouter(() => alertMonitor));
 
 /**
  * @swagger
@@ -271,6 +277,9 @@ app.use('/api/stats', statsRouter);
  *                     stats:
  *                       type: string
  *                       example: "/api/stats"
+ *                     alertCallback:
+ *                       type: string
+ *                       example: "/api/alerts/callback"
  *                     docs:
  *                       type: string
  *                       example: "/docs"
@@ -284,6 +293,7 @@ app.get('/', (_req, res) => {
             health: '/health',
             orders: '/api/orders',
             stats: '/api/stats',
+            alertCallback: '/api/alerts/callback',
             docs: '/docs'
         }
     });
@@ -0,0 +1,147 @@
+import { Router, Request, Response } from 'express';
+import { OrderRepository } from '../database/repository.js';
+import { AlertMonitor } from '../services/alert-monitor.js';
+import {
+    AlertCallbackBody,
+    SIGNATURE_HEADER,
+    TIMESTAMP_HEADER,
+    verifyAlertCallback
+} from '../services/alert-callback.js';
+
+/**
+ * Alert callback routes
+ *
+ * Takes the AlertMonitor lazily, as it is created once the server has started.
+ */
+export function createAlertsRouter(getAlertMonitor: () => AlertMonitor | null): Router {
+    const router = Router();
+    const orderRepo = new OrderRepository();
+
+    /**
+     * @swagger
+     * /api/alerts/callback:
+     *   post:
+     *     summary: Receive mined alerts from the webhook server
+     *     description: |
+     *       Called by the webhook server as soon as an alert transaction is mined (its
+     *       ALERT_CALLBACK_URLS). Requests are signed with the shared ALERT_CALLBACK_SECRET.
+     *       Pending orders for each alert are triggered through the AlertMonitor predicate
+     *       check when it is running, or marked as triggered directly otherwise. Deliveries
+     *       are at least once, so a repeated alert is a no-op.
+     *     tags: [Alerts]
+     *     parameters:
+     *       - in: header
+     *         name: X-Yeti-Timestamp
+     *         required: true
+     *         schema:
+     *           type: string
+     *         description: Unix time the callback was signed
+     *       - in: header
+     *         name: X-Yeti-Signature
+     *         required: true
+     *         schema:
+     *           type: string
+     *         description: "sha256=<hex HMAC-SHA256 of '{timestamp}.{body}'>"
+     *     requestBody:
+     *       required: true
+     *       content:
+     *         application/json:
+     *           schema:
+     *             type: object
+     *             properties:
+     *               alerts:
+     *                 type: array
+     *                 items:
+     *                   type: object
+     *                   properties:
+     *                     alert_id:
+     *                       type: string
+     *                     webhook_id:
+     *                       type: string
+     *                     action:
+     *                       type: number
+     *                     action_name:
+     *                       type: string
+     *                     nonce:
+     *                       type: number
+     *                     block_number:
+     *                       type: number
+     *                     tx_hash:
+     *                       type: string
+     *     responses:
+     *       200:
+     *         description: Alerts processed
+     *         content:
+     *           application/json:
+     *             schema:
+     *               type: object
+     *               properties:
+     *                 success:
+     *                   type: boolean
+     *                   example: true
+     *                 received:
+     *                   type: number
+     *                   example: 3
+     *                 triggered:
+     *                   type: number
+     *                   example: 2
+     *       401:
+     *         description: Missing, invalid or expired signature
+     *       503:
+     *         description: ALERT_CALLBACK_SECRET is not configured
+     */
+    router.post('/callback', async (req: Request, res: Response) => {
+        const secret = process.env.ALERT_CALLBACK_SECRET;
+        if (!secret) {
+            return res.status(503).json({
+                error: 'Alert callbacks are not configured',
+                details: 'Set ALERT_CALLBACK_SECRET to accept callbacks'
+            });
+        }
+
+        const rawBody: Buffer | undefined = (req as any).rawBody;
+        if (!rawBody || !verifyAlertCallback(rawBody, req.get(TIMESTAMP_HEADER), req.get(SIGNATURE_HEADER), secret)) {
+            return res.status(401).json({
+                error: 'Invalid alert callback signature'
+            });
+        }
+
+        try {
+            const { alerts = [] } = req.body as AlertCallbackBody;
+            const alertMonitor = getAlertMonitor();
+            let triggered = 0;
+
+            // In the order the webhook server mined them
+            for (const alert of alerts) {
+                if (alertMonitor && alertMonitor.getStatus().isRunning) {
+                    triggered += await alertMonitor.handleAlertCallback({
+                        alertId: alert.alert_id,
+                        action: alert.action,
+                        timestamp: Math.floor(Date.now() / 1000),
+                        nonce: alert.nonce ?? undefined,
+                        blockNumber: alert.block_number,
+                        transactionHash: alert.tx_hash
+                    });
+                } else {
+                    triggered += await orderRepo.markOrdersAsTriggered(alert.alert_id);
+                }
+            }
+
+            console.log(`📨 Alert callback: ${alerts.length} alert(s), ${triggered} order(s) triggered`);
+
+            res.json({
+                success: true,
+                received: alerts.length,
+                triggered
+            });
+        } catch (error: any) {
+            console.error('Error processing alert callback:', error);
+            res.status(500).json({
+                error: 'Failed to process alert callback',
+                details: error.message
+            });
+        }
+    });
+
+    return router;
+}
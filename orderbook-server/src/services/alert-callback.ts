@@ -0,0 +1,53 @@
+import { createHmac, timingSafeEqual } from 'crypto';
+
+export const SIGNATURE_HEADER = 'X-Yeti-Signature';
+export const TIMESTAMP_HEADER = 'X-Yeti-Timestamp';
+
+// Callbacks signed longer ago than this are rejected as replays
+export const MAX_CLOCK_SKEW_SECONDS = 300;
+
+/**
+ * One mined alert as posted by the webhook server's alert callbacks
+ */
+export interface AlertCallback {
+    alert_id: string;
+    webhook_id: string;
+    action: number;
+    action_name: string;
+    nonce: number | null;
+    block_number: number;
+    tx_hash: string;
+}
+
+export interface AlertCallbackBody {
+    alerts: AlertCallback[];
+}
+
+/**
+ * Verify an alert callback signature
+ *
+ * The webhook server signs "{timestamp}.{body}" with HMAC-SHA256 under ALERT_CALLBACK_SECRET
+ * and sends "sha256=<hex>" in X-Yeti-Signature alongside the unix timestamp in X-Yeti-Timestamp.
+ */
+export function verifyAlertCallback(
+    rawBody: Buffer,
+    timestamp: string | undefined,
+    signature: string | undefined,
+    secret: string,
+    maxClockSkewSeconds: number = MAX_CLOCK_SKEW_SECONDS
+): boolean {
+    if (!timestamp || !signature || !/^\d+$/.test(timestamp)) {
+        return false;
+    }
+
+    if (Math.abs(Date.now() / 1000 - Number(timestamp)) > maxClockSkewSeconds) {
+        return false;
+    }
+
+    const expected = Buffer.from(
+        'sha256=' + createHmac('sha256', secret).update(`${timestamp}.`).update(rawBody).digest('hex')
+    );
+    const received = Buffer.from(signature);
+
+    return expected.length === received.length && timingSafeEqual(expected, received);
+}
@@ -15,6 +15,7 @@ export interface AlertEvent {
     alertId: string;
     action: number;
     timestamp: number;
+    nonce?: number;
     blockNumber: number;
     transactionHash: string;
 }
@@ -56,7 +57,7 @@ export class AlertMonitor {
         
         const webhookOracleAbi = [
             'function getAlert(bytes16 _alertId) external view returns (tuple(bytes16 alertId, uint32 timestamp, uint8 action))',
-            'event AlertSubmitted(bytes16 indexed alertId, uint8 action, uint32 timestamp)'
+            'event AlertSubmitted(bytes16 indexed alertId, uint8 action, uint32 timestamp, uint32 nonce)'
         ];
         
         const webhookPredicateAbi = [
@@ -138,7 +139,7 @@ export class AlertMonitor {
     private startEventListening(): void {
         console.log('👂 Starting event listening...');
         
-        this.webhookOracle.on('AlertSubmitted', async (alertId: string, action: number, timestamp: number, event: EventLog) => {
+        this.webhookOracle.on('AlertSubmitted', async (alertId: string, action: number, timestamp: number, nonce: number, event: EventLog) => {
             try {
                 console.log(`🚨 AlertSubmitted event detected: ${alertId}, action: ${action}`);
                 
@@ -146,6 +147,7 @@ export class AlertMonitor {
                     alertId,
                     action,
                     timestamp,
+                    nonce: Number(nonce),
                     blockNumber: event.blockNumber,
                     transactionHash: event.transactionHash
                 });
@@ -180,10 +182,23 @@ export class AlertMonitor {
     }
 
     /**
-     * Process an alert event
+     * Process an alert pushed by the webhook server's alert callback
+     * 
+     * The callback arrives as soon as the webhook server sees the receipt, ahead of the
+     * event subscription and the polling fallback. Alerts already processed through either
+     * path are skipped, as their orders are no longer pending.
      */
-    private async processAlert(alertEvent: AlertEvent): Promise<void> {
+    async handleAlertCallback(alertEvent: AlertEvent): Promise<number> {
+        console.log(`📨 Alert callback received: ${alertEvent.alertId}, action: ${alertEvent.action}`);
+        return await this.processAlert(alertEvent);
+    }
+
+    /**
+     * Process an alert event, returning the number of orders triggered
+     */
+    private async processAlert(alertEvent: AlertEvent): Promise<number> {
         const { alertId, action } = alertEvent;
+        let triggeredCount = 0;
         
         try {
             // Find orders with this alert ID
@@ -191,14 +206,12 @@ export class AlertMonitor {
             
             if (orders.length === 0) {
                 console.log(`ℹ️ No orders found for alert ${alertId}`);
-                return;
+                return 0;
             }
             
             console.log(`📋 Found ${orders.length} orders for alert ${alertId}`);
             
             // Process each order
-            let triggeredCount = 0;
-            
             for (const order of orders) {
                 try {
                     // Skip if not in pending status
@@ -236,6 +249,8 @@ export class AlertMonitor {
         } catch (error) {
             console.error(`❌ Error processing alert ${alertId}:`, error);
         }
+        
+        return triggeredCount;
     }
 
     /**
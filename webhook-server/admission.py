@@ -0,0 +1,120 @@
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+from contract_config import (
+    ADMISSION_GLOBAL_RATE,
+    ADMISSION_GLOBAL_BURST,
+    ADMISSION_WEBHOOK_RATE,
+    ADMISSION_WEBHOOK_BURST,
+    ADMISSION_MAX_INFLIGHT,
+    ADMISSION_TESTING_SHARE,
+    ADMISSION_MAX_BUCKETS,
+    SUBMISSION_QUEUE_LIMIT
+)
+
+class Lane:
+    """Traffic classes, in priority order"""
+    LIVE = 0
+    TESTING = 1
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, now: float) -> bool:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def refund(self):
+        """Give back a token taken for a request that was turned away after all"""
+        self.tokens = min(self.burst, self.tokens + 1)
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil((1 - self.tokens) / self.rate))
+
+class Rejection:
+    def __init__(self, status_code: int, reason: str, detail: str, retry_after: int = 1):
+        self.status_code = status_code
+        self.reason = reason
+        self.detail = detail
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """Decides whether to take on a webhook before any parsing or HMAC work.
+
+    Checks first the number of webhooks being handled and the submission backlog (503), then
+    the global and per-webhook-ID token buckets (429), so a rejected webhook does not use up
+    rate its retries are held to; tokens taken before a later bucket refuses are given back.
+    Test-mode traffic only gets ADMISSION_TESTING_SHARE of the global rate and of the
+    in-flight and backlog limits, so it is shed well before live alerts are. Per-webhook
+    buckets are keyed on the unverified path ID and kept for at most ADMISSION_MAX_BUCKETS
+    IDs; the global bucket bounds a spray of made-up IDs.
+    """
+
+    def __init__(self, backlog: Callable[[], int]):
+        self.backlog = backlog
+        self.global_bucket = TokenBucket(ADMISSION_GLOBAL_RATE, ADMISSION_GLOBAL_BURST) if ADMISSION_GLOBAL_RATE > 0 else None
+        # Test-mode traffic also has to fit in its share of the global rate
+        self.testing_bucket = TokenBucket(ADMISSION_GLOBAL_RATE * ADMISSION_TESTING_SHARE,
+                                          max(1, ADMISSION_GLOBAL_BURST * ADMISSION_TESTING_SHARE)) if self.global_bucket else None
+        self._webhook_buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self.inflight = {Lane.LIVE: 0, Lane.TESTING: 0}
+
+    def admit(self, webhook_id: str, lane: int) -> Optional[Rejection]:
+        """None if the webhook may proceed (call release when done), otherwise why not"""
+        share = 1 if lane == Lane.LIVE else ADMISSION_TESTING_SHARE
+        if sum(self.inflight.values()) >= ADMISSION_MAX_INFLIGHT or self.inflight[lane] >= ADMISSION_MAX_INFLIGHT * share:
+            return Rejection(503, "inflight", "Server busy, retry shortly")
+        if self.backlog() >= SUBMISSION_QUEUE_LIMIT * share:
+            return Rejection(503, "backlog", "Submission queue full, retry shortly")
+
+        now = time.monotonic()
+        taken: list[TokenBucket] = []
+        if self.global_bucket:
+            if not self.global_bucket.take(now):
+                return Rejection(429, "global_rate", "Too many webhooks, slow down", self.global_bucket.retry_after())
+            taken.append(self.global_bucket)
+        if lane == Lane.TESTING and self.testing_bucket:
+            if not self.testing_bucket.take(now):
+                self._refund(taken)
+                return Rejection(429, "testing_rate", "Too many test webhooks, slow down", self.testing_bucket.retry_after())
+            taken.append(self.testing_bucket)
+
+        if ADMISSION_WEBHOOK_RATE > 0:
+            bucket = self._webhook_buckets.get(webhook_id)
+            if bucket is None:
+                bucket = self._webhook_buckets[webhook_id] = TokenBucket(ADMISSION_WEBHOOK_RATE, ADMISSION_WEBHOOK_BURST)
+                if len(self._webhook_buckets) > ADMISSION_MAX_BUCKETS:
+                    self._webhook_buckets.popitem(last=False)
+            else:
+                self._webhook_buckets.move_to_end(webhook_id)
+            if not bucket.take(now):
+                self._refund(taken)
+                return Rejection(429, "webhook_rate", "Too many alerts for this webhook, slow down", bucket.retry_after())
+
+        self.inflight[lane] += 1
+        return None
+
+    @staticmethod
+    def _refund(buckets: list[TokenBucket]):
+        for bucket in buckets:
+            bucket.refund()
+
+    def release(self, lane: int):
+        self.inflight[lane] -= 1
+
+    def stats(self) -> dict:
+        return {
+            "inflight": sum(self.inflight.values()),
+            "inflight_testing": self.inflight[Lane.TESTING],
+            "backlog": self.backlog(),
+            "webhook_buckets": len(self._webhook_buckets)
+        }
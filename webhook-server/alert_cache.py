@@ -0,0 +1,90 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+from contract_config import ALERT_CACHE_MAX_ENTRIES, ALERT_CACHE_TTL
+
+class AlertCache:
+    """Bounded LRU/TTL cache of getAlert results with single-flight loading.
+
+    Concurrent misses for the same alert ID share one in-flight load, so a burst of
+    polls costs a single eth_call; if that load is cancelled, they load it themselves.
+    Only successful lookups are cached.
+    """
+
+    def __init__(self, max_entries: int = ALERT_CACHE_MAX_ENTRIES, ttl: float = ALERT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._loading: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    async def get(self, alert_id: str, loader: Callable[[str], Awaitable[dict]]) -> dict:
+        entry = self._entries.get(alert_id)
+        if entry is not None:
+            expires_at, result = entry
+            if time.monotonic() < expires_at:
+                self.hits += 1
+                self._entries.move_to_end(alert_id)
+                return result
+            del self._entries[alert_id]
+
+        loading = self._loading.get(alert_id)
+        if loading is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(loading)
+            except asyncio.CancelledError:
+                if not loading.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                return await self.get(alert_id, loader)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._loading[alert_id] = future
+        try:
+            result = await loader(alert_id)
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so the loop does not warn when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            # An invalidation during the load means the result may already be stale
+            if result.get("success") and self._loading.get(alert_id) is future:
+                self._store(alert_id, result)
+            return result
+        finally:
+            # The loader was cancelled: callers sharing the load must not wait for it forever
+            if not future.done():
+                future.cancel()
+            if self._loading.get(alert_id) is future:
+                del self._loading[alert_id]
+
+    def invalidate(self, alert_id: str):
+        self._loading.pop(alert_id, None)
+        if self._entries.pop(alert_id, None) is not None:
+            self.invalidations += 1
+
+    def _store(self, alert_id: str, result: dict):
+        self._entries[alert_id] = (time.monotonic() + self.ttl, result)
+        self._entries.move_to_end(alert_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
@@ -0,0 +1,152 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import time
+import uuid
+from collections import deque
+from typing import Optional
+import aiohttp
+from fast_lane import encode_json
+from metrics import CALLBACKS
+from contract_config import (
+    ALERT_CALLBACK_URLS,
+    ALERT_CALLBACK_SECRET,
+    ALERT_CALLBACK_WINDOW_MS,
+    ALERT_CALLBACK_BATCH_SIZE,
+    ALERT_CALLBACK_MAX_RETRIES,
+    ALERT_CALLBACK_TIMEOUT,
+    ALERT_CALLBACK_MAX_PENDING
+)
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Yeti-Signature"
+TIMESTAMP_HEADER = "X-Yeti-Timestamp"
+
+def sign_callback(secret: str, timestamp: str, body: bytes) -> str:
+    """HMAC-SHA256 over "{timestamp}.{body}", so a captured request cannot be replayed later"""
+    return "sha256=" + hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+
+class CallbackSubscriber:
+    """One callback URL with the alerts waiting to be delivered to it, oldest first"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.pending: deque[dict] = deque()
+        self.wakeup = asyncio.Event()
+        self.delivered = 0
+        self.dropped = 0
+        self.last_error: Optional[str] = None
+
+    def stats(self) -> dict:
+        return {
+            "url": self.url,
+            "pending": len(self.pending),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "last_error": self.last_error
+        }
+
+class AlertCallbacks:
+    """Pushes mined alerts to subscribers such as the orderbook server.
+
+    Registered as a mined listener on the submission tracker, so subscribers hear about an
+    alert as soon as its receipt is seen instead of waiting for their own event polling.
+    Each subscriber has its own queue and sender: alerts mined within
+    ALERT_CALLBACK_WINDOW_MS are posted together as {"alerts": [...]}, signed with
+    ALERT_CALLBACK_SECRET, and a failed request is retried with backoff before later alerts
+    are sent, so every subscriber sees alerts in the order they were mined. Deliveries are
+    at least once; subscribers should treat a repeated alert ID and nonce as a duplicate.
+    """
+
+    def __init__(self, urls: list[str] = ALERT_CALLBACK_URLS, secret: Optional[str] = ALERT_CALLBACK_SECRET):
+        self.secret = secret
+        self.subscribers = [CallbackSubscriber(url) for url in urls]
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self):
+        self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=ALERT_CALLBACK_TIMEOUT))
+        self._tasks = [asyncio.create_task(self._deliver(subscriber)) for subscriber in self.subscribers]
+        logger.info(f"Alert callbacks enabled for {', '.join(subscriber.url for subscriber in self.subscribers)}")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        undelivered = sum(len(subscriber.pending) for subscriber in self.subscribers)
+        if undelivered:
+            logger.warning(f"Alert callbacks stopped with {undelivered} alerts undelivered")
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def stats(self) -> list[dict]:
+        return [subscriber.stats() for subscriber in self.subscribers]
+
+    def notify(self, batch: list) -> None:
+        """Mined listener: queue the batch's alerts for every subscriber"""
+        alerts = [{
+            # The bytes16 alert ID as the oracle and the orderbook know it
+            "alert_id": "0x" + uuid.UUID(submission.webhook_id).hex,
+            "webhook_id": submission.webhook_id,
+            "action": submission.action,
+            "action_name": submission.action_name,
+            "nonce": submission.alert_nonce,
+            "block_number": submission.block_number,
+            "tx_hash": submission.tx_hash
+        } for submission in batch]
+        for subscriber in self.subscribers:
+            subscriber.pending.extend(alerts)
+            overflow = len(subscriber.pending) - ALERT_CALLBACK_MAX_PENDING
+            if overflow > 0:
+                for _ in range(overflow):
+                    subscriber.pending.popleft()
+                subscriber.dropped += overflow
+                CALLBACKS.labels("dropped").inc(overflow)
+                logger.warning(f"Callback queue for {subscriber.url} full, dropped {overflow} oldest alerts")
+            subscriber.wakeup.set()
+
+    async def _deliver(self, subscriber: CallbackSubscriber):
+        while True:
+            await subscriber.wakeup.wait()
+            subscriber.wakeup.clear()
+            # Let the other receipts of the same block arrive and go out in the same request
+            await asyncio.sleep(ALERT_CALLBACK_WINDOW_MS / 1000)
+            while subscriber.pending:
+                alerts = [subscriber.pending.popleft() for _ in range(min(ALERT_CALLBACK_BATCH_SIZE, len(subscriber.pending)))]
+                if await self._post_with_retries(subscriber, alerts):
+                    subscriber.delivered += len(alerts)
+                    CALLBACKS.labels("delivered").inc(len(alerts))
+                else:
+                    subscriber.dropped += len(alerts)
+                    CALLBACKS.labels("dropped").inc(len(alerts))
+
+    async def _post_with_retries(self, subscriber: CallbackSubscriber, alerts: list[dict]) -> bool:
+        body = encode_json({"alerts": alerts})
+        for attempt in range(ALERT_CALLBACK_MAX_RETRIES + 1):
+            if attempt:
+                CALLBACKS.labels("retried").inc(len(alerts))
+                await asyncio.sleep(min(2 ** (attempt - 1), 30))
+            # Signed per attempt so retries carry a fresh timestamp
+            timestamp = str(int(time.time()))
+            headers = {
+                "Content-Type": "application/json",
+                TIMESTAMP_HEADER: timestamp,
+                SIGNATURE_HEADER: sign_callback(self.secret, timestamp, body)
+            }
+            try:
+                async with self.session.post(subscriber.url, data=body, headers=headers) as response:
+                    if response.status < 300:
+                        subscriber.last_error = None
+                        return True
+                    subscriber.last_error = f"HTTP {response.status}"
+                    # Client errors other than timeouts and rate limits will not go away on retry
+                    if 400 <= response.status < 500 and response.status not in (408, 429):
+                        break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                subscriber.last_error = str(e) or type(e).__name__
+        logger.error(f"Alert callback to {subscriber.url} failed, dropping {len(alerts)} alerts: {subscriber.last_error}")
+        return False
@@ -0,0 +1,95 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+from contract_config import DEDUP_WINDOW, DEDUP_MAX_ENTRIES
+from submission_tracker import Submission, SubmissionStatus
+
+# Every suppressed submission saves at least its eth_sendRawTransaction and one
+# eth_getTransactionReceipt (see benchmarks/rpc_calls.py)
+RPC_CALLS_PER_SUBMISSION = 2
+
+class AlertDeduplicator:
+    """Bounded window of recent submissions keyed on (webhook ID, action, idempotency key).
+
+    A delivery whose key was seen within DEDUP_WINDOW seconds is answered with the
+    original submission instead of creating a new one, as long as no other alert for
+    the webhook was submitted since (buy, sell, buy must still end on buy). Concurrent
+    identical deliveries share the first one's enqueue, and submit themselves if it is
+    cancelled. Failed submissions do not suppress later retries.
+    """
+
+    def __init__(self, window: float = DEDUP_WINDOW, max_entries: int = DEDUP_MAX_ENTRIES):
+        self.window = window
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[float, asyncio.Future]] = OrderedDict()
+        # Key of the most recent submission per webhook ID
+        self._latest: dict[str, tuple] = {}
+        self.duplicates = 0
+        self.unchanged = 0
+        self.saved_gas = 0
+
+    async def submit(self, key: tuple, enqueue: Callable[[], Awaitable[Submission]]) -> tuple[Submission, bool]:
+        """Return (submission, duplicate), calling enqueue only for keys not seen within the window"""
+        if self.window <= 0:
+            return await enqueue(), False
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, future = entry
+            if time.monotonic() < expires_at and self._latest.get(key[0]) == key and not self._failed(future):
+                try:
+                    submission = await asyncio.shield(future)
+                except asyncio.CancelledError:
+                    # The first delivery's request went away before enqueueing: this one takes over
+                    if not future.cancelled() or asyncio.current_task().cancelling():
+                        raise
+                    return await self.submit(key, enqueue)
+                self.duplicates += 1
+                return submission, True
+            del self._entries[key]
+
+        future = asyncio.get_running_loop().create_future()
+        self._entries[key] = (time.monotonic() + self.window, future)
+        self._entries.move_to_end(key)
+        self._latest[key[0]] = key
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            if self._latest.get(evicted[0]) == evicted:
+                del self._latest[evicted[0]]
+        try:
+            submission = await enqueue()
+        except BaseException as e:
+            if isinstance(e, Exception):
+                future.set_exception(e)
+                # Mark retrieved so the loop does not warn when nobody else was waiting
+                future.exception()
+            else:
+                # Cancelled: waiters must not hang on a future nobody will complete
+                future.cancel()
+            if self._entries.get(key, (None, None))[1] is future:
+                del self._entries[key]
+            raise
+        future.set_result(submission)
+        return submission, False
+
+    def record_saved(self, gas: int, unchanged: bool = False):
+        if unchanged:
+            self.unchanged += 1
+        self.saved_gas += gas
+
+    @staticmethod
+    def _failed(future: asyncio.Future) -> bool:
+        return future.done() and (future.cancelled() or future.exception() is not None
+                                  or future.result().status == SubmissionStatus.FAILED)
+
+    def stats(self) -> dict:
+        return {
+            "window": self.window,
+            "size": len(self._entries),
+            "duplicates": self.duplicates,
+            "unchanged": self.unchanged,
+            "saved_transactions": self.duplicates + self.unchanged,
+            "saved_gas": self.saved_gas,
+            "saved_rpc_calls": (self.duplicates + self.unchanged) * RPC_CALLS_PER_SUBMISSION
+        }
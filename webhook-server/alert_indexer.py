@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import uuid
+from typing import Callable, Optional
+from blockchain_utils import BlockchainManager
+from contract_config import (
+    INDEXER_DB_PATH,
+    INDEXER_START_BLOCK,
+    INDEXER_CHUNK_SIZE,
+    INDEXER_REORG_DEPTH,
+    ALERT_LOG_POLL_INTERVAL
+)
+
+logger = logging.getLogger(__name__)
+
+class AlertStore:
+    """SQLite store of indexed AlertSubmitted events and the indexer cursor.
+
+    Its methods block; callers on the event loop run them with asyncio.to_thread. Worker
+    threads share the one connection, one call at a time.
+    """
+
+    def __init__(self, path: str = INDEXER_DB_PATH):
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS alert_events (
+                block_number INTEGER NOT NULL,
+                log_index INTEGER NOT NULL,
+                tx_hash TEXT NOT NULL,
+                alert_id TEXT NOT NULL,
+                action INTEGER NOT NULL,
+                timestamp INTEGER NOT NULL,
+                nonce INTEGER NOT NULL,
+                PRIMARY KEY (block_number, log_index)
+            );
+            CREATE INDEX IF NOT EXISTS alert_events_alert_id ON alert_events (alert_id, block_number);
+            CREATE TABLE IF NOT EXISTS indexer_cursor (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                block_number INTEGER NOT NULL,
+                block_hash TEXT NOT NULL
+            );
+        """)
+
+    def get_cursor(self) -> Optional[tuple[int, str]]:
+        with self._lock:
+            row = self.conn.execute("SELECT block_number, block_hash FROM indexer_cursor WHERE id = 1").fetchone()
+        return (row["block_number"], row["block_hash"]) if row else None
+
+    def save(self, events: list[dict], block_number: int, block_hash: str):
+        """Store a chunk of events and advance the cursor in one transaction"""
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO alert_events VALUES "
+                "(:block_number, :log_index, :tx_hash, :alert_id, :action, :timestamp, :nonce)",
+                events
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO indexer_cursor (id, block_number, block_hash) VALUES (1, ?, ?)",
+                (block_number, block_hash)
+            )
+
+    def rewind(self, block_number: int):
+        """Drop events after block_number; the cursor is rewritten by the next save"""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM alert_events WHERE block_number > ?", (block_number,))
+
+    def events_since(self, since_block: int, alert_id: Optional[str] = None, limit: int = 500,
+                     after_log_index: int = -1) -> list[dict]:
+        """Events from since_block onwards, oldest first, leaving out those of since_block up to
+        after_log_index (to page on from the last event of a full page)"""
+        query = "SELECT * FROM alert_events WHERE (block_number > ? OR (block_number = ? AND log_index > ?))"
+        params: list = [since_block, since_block, after_log_index]
+        if alert_id:
+            query += " AND alert_id = ?"
+            params.append(alert_id)
+        query += " ORDER BY block_number, log_index LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(query, params)]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+class AlertIndexer:
+    """Follows AlertSubmitted logs into an AlertStore and pushes them to subscribers.
+
+    Backfills in chunks of INDEXER_CHUNK_SIZE blocks (halved when the node rejects a
+    range) from the persisted cursor, then polls for new blocks. If the hash of the
+    cursor block changes, the last INDEXER_REORG_DEPTH blocks are dropped and re-indexed.
+    """
+
+    def __init__(self, blockchain_manager: BlockchainManager, store: AlertStore):
+        self.blockchain_manager = blockchain_manager
+        self.store = store
+        self.event = blockchain_manager.contract.events.AlertSubmitted()
+        self.chunk_size = INDEXER_CHUNK_SIZE
+        self._task: Optional[asyncio.Task] = None
+        self._subscribers: set[asyncio.Queue] = set()
+        self._listeners: list[Callable[[dict], None]] = []
+        cursor = store.get_cursor()
+        self._indexed_block: Optional[int] = cursor[0] if cursor else None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.store.close()
+
+    def add_listener(self, listener: Callable[[dict], None]):
+        """Register a callback invoked for every indexed event"""
+        self._listeners.append(listener)
+
+    def subscribe(self, max_pending: int = 1000) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=max_pending)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    @property
+    def indexed_block(self) -> Optional[int]:
+        return self._indexed_block
+
+    async def _run(self):
+        while True:
+            try:
+                await self._sync()
+            except Exception as e:
+                logger.warning(f"Alert indexer sync failed: {e}")
+            await asyncio.sleep(ALERT_LOG_POLL_INTERVAL)
+
+    async def _sync(self):
+        w3 = self.blockchain_manager.w3
+        latest = await w3.eth.block_number
+        cursor = await asyncio.to_thread(self.store.get_cursor)
+
+        if cursor is None:
+            start = INDEXER_START_BLOCK if INDEXER_START_BLOCK is not None else latest
+            next_block = start
+        else:
+            cursor_block, cursor_hash = cursor
+            current_hash = (await w3.eth.get_block(cursor_block))["hash"].hex()
+            if current_hash != cursor_hash:
+                rewind_to = max(cursor_block - INDEXER_REORG_DEPTH, -1)
+                logger.warning(f"Reorg detected at block {cursor_block}, re-indexing from {rewind_to + 1}")
+                await asyncio.to_thread(self.store.rewind, rewind_to)
+                self._publish({"type": "reorg", "from_block": rewind_to + 1})
+                next_block = rewind_to + 1
+            else:
+                next_block = cursor_block + 1
+
+        while next_block <= latest:
+            to_block = min(next_block + self.chunk_size - 1, latest)
+            try:
+                logs = await w3.eth.get_logs({
+                    "address": self.blockchain_manager.contract.address,
+                    "fromBlock": next_block,
+                    "toBlock": to_block,
+                    "topics": [self.event.topic]
+                })
+            except Exception as e:
+                if self.chunk_size == 1:
+                    raise
+                self.chunk_size = max(1, self.chunk_size // 2)
+                logger.warning(f"eth_getLogs failed for {next_block}-{to_block} ({e}), chunk size now {self.chunk_size}")
+                continue
+
+            block_hash = (await w3.eth.get_block(to_block))["hash"].hex()
+            events = [self._decode(log) for log in logs]
+            await asyncio.to_thread(self.store.save, events, to_block, block_hash)
+            self._indexed_block = to_block
+            for event in events:
+                self._publish(dict(event, type="alert"))
+            next_block = to_block + 1
+
+    def _decode(self, log) -> dict:
+        args = self.event.process_log(log)["args"]
+        return {
+            "block_number": log["blockNumber"],
+            "log_index": log["logIndex"],
+            "tx_hash": log["transactionHash"].hex(),
+            "alert_id": str(uuid.UUID(bytes=args["alertId"])),
+            "action": args["action"],
+            "timestamp": args["timestamp"],
+            "nonce": args["nonce"]
+        }
+
+    def _publish(self, event: dict):
+        if event["type"] == "alert":
+            for listener in self._listeners:
+                try:
+                    listener(event)
+                except Exception as e:
+                    logger.error(f"Indexer listener failed: {e}")
+
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow consumer: end its stream so it reconnects with since_block
+                logger.warning("Alert stream subscriber fell behind, disconnecting")
+                self._subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
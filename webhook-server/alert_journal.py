@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import sqlite3
+import time
+from typing import Optional
+from contract_config import JOURNAL_DB_PATH, JOURNAL_MAX_GROUP, JOURNAL_RETENTION
+
+logger = logging.getLogger(__name__)
+
+class AlertJournal:
+    """Durable write-ahead log of authenticated alerts and their submission state.
+
+    Appends are acknowledged only once committed with a full fsync (SQLite WAL,
+    synchronous=FULL). A single writer commits every operation queued while the
+    previous commit was syncing in one transaction (group commit, at most max_group
+    operations), so concurrent alerts share an fsync. State updates ride along in the
+    same commits without being awaited: losing one in a crash only causes a replay.
+    """
+
+    def __init__(self, path: str = JOURNAL_DB_PATH, max_group: int = JOURNAL_MAX_GROUP):
+        self.max_group = max_group
+        # Commits run in a worker thread, one at a time
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS alert_journal (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                webhook_id TEXT NOT NULL,
+                action INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                tx_hash TEXT,
+                nonce INTEGER,
+                sender TEXT,
+                received_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS alert_journal_status ON alert_journal (status);
+        """)
+        self.commits = 0
+        self._ops: asyncio.Queue = asyncio.Queue()
+        self._writer: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._writer = asyncio.create_task(self._write_loop())
+
+    async def close(self):
+        """Flush queued operations and close the database"""
+        if self._writer:
+            await self._ops.join()
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+            self._writer = None
+        self.conn.close()
+
+    async def append(self, webhook_id: str, action: int) -> int:
+        """Durably record an accepted alert and return its journal ID"""
+        future = asyncio.get_running_loop().create_future()
+        self._ops.put_nowait(("append", (webhook_id, action), future))
+        return await future
+
+    def update(self, journal_ids: list[int], status: str, tx_hash: Optional[str] = None,
+               nonce: Optional[int] = None, sender: Optional[str] = None):
+        """Record a state change for some entries with the next commit, and with a broadcast
+        the nonce and account it was sent from"""
+        self._ops.put_nowait(("update", (journal_ids, status, tx_hash, nonce, sender), None))
+
+    def unfinished(self, final_statuses: tuple[str, ...]) -> list[dict]:
+        """Entries not yet in a final state, oldest first, for replay on startup"""
+        placeholders = ", ".join("?" for _ in final_statuses)
+        rows = self.conn.execute(
+            f"SELECT id, webhook_id, action, status, tx_hash, nonce, sender FROM alert_journal "
+            f"WHERE status NOT IN ({placeholders}) ORDER BY id",
+            final_statuses
+        ).fetchall()
+        return [
+            {"id": row[0], "webhook_id": row[1], "action": row[2], "status": row[3], "tx_hash": row[4],
+             "nonce": row[5], "sender": row[6]}
+            for row in rows
+        ]
+
+    def prune(self, final_statuses: tuple[str, ...], retention: float = JOURNAL_RETENTION) -> int:
+        """Delete final entries older than retention seconds"""
+        placeholders = ", ".join("?" for _ in final_statuses)
+        with self.conn:
+            cursor = self.conn.execute(
+                f"DELETE FROM alert_journal WHERE status IN ({placeholders}) AND updated_at < ?",
+                (*final_statuses, time.time() - retention)
+            )
+        return cursor.rowcount
+
+    async def _write_loop(self):
+        while True:
+            ops = [await self._ops.get()]
+            # Everything that queued up during the previous commit goes into this one
+            while len(ops) < self.max_group and not self._ops.empty():
+                ops.append(self._ops.get_nowait())
+            try:
+                results = await asyncio.to_thread(self._commit, ops)
+            except Exception as e:
+                logger.error(f"Journal commit of {len(ops)} operations failed: {e}")
+                results = [e] * len(ops)
+            for (kind, _, future), result in zip(ops, results):
+                if future is not None and not future.done():
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+                self._ops.task_done()
+
+    def _commit(self, ops: list) -> list:
+        now = time.time()
+        results = []
+        with self.conn:
+            for kind, args, _ in ops:
+                if kind == "append":
+                    webhook_id, action = args
+                    cursor = self.conn.execute(
+                        "INSERT INTO alert_journal (webhook_id, action, status, received_at, updated_at) "
+                        "VALUES (?, ?, 'queued', ?, ?)",
+                        (webhook_id, action, now, now)
+                    )
+                    results.append(cursor.lastrowid)
+                else:
+                    journal_ids, status, tx_hash, nonce, sender = args
+                    self.conn.executemany(
+                        "UPDATE alert_journal SET status = ?, tx_hash = COALESCE(?, tx_hash), nonce = COALESCE(?, nonce), "
+                        "sender = COALESCE(?, sender), updated_at = ? WHERE id = ?",
+                        [(status, tx_hash, nonce, sender, now, journal_id) for journal_id in journal_ids]
+                    )
+                    results.append(None)
+        self.commits += 1
+        return results
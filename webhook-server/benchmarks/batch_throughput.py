@@ -0,0 +1,72 @@
+"""Single vs batched alert submission throughput.
+
+Submits the same number of alerts as individual submitAlert transactions and as
+submitAlerts batches of 10, 50 and 100, and reports alerts per second, transactions
+and gas per alert for each.
+
+    anvil &
+    (cd ../contracts && forge script script/SetupAnvilEnvironment.s.sol --broadcast --rpc-url http://localhost:8545 \\
+        --private-key 0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80)
+    CONTRACT_ADDRESS=0x... TEE_SECRET=bench uv run python benchmarks/batch_throughput.py --alerts 200
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain_utils import BlockchainManager
+from contract_config import Action
+
+ANVIL_DEV_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+
+async def submit_batch(manager: BlockchainManager, webhook_ids: list[str], actions: list[int]):
+    if len(webhook_ids) == 1:
+        transaction, tx_hash = await manager.broadcast_alert(webhook_ids[0], actions[0])
+    else:
+        transaction, tx_hash = await manager.broadcast_alerts(webhook_ids, actions)
+    receipt, _ = await manager.wait_for_receipt(transaction, tx_hash)
+    if receipt.status != 1:
+        raise RuntimeError(f"batch reverted: {tx_hash.hex()}")
+    return receipt.gasUsed
+
+
+async def run(manager: BlockchainManager, alerts: int, batch_size: int) -> dict:
+    webhook_ids = [str(uuid.uuid4()) for _ in range(alerts)]
+    actions = [Action.LONG if i % 2 == 0 else Action.SHORT for i in range(alerts)]
+    chunks = [(webhook_ids[i:i + batch_size], actions[i:i + batch_size]) for i in range(0, alerts, batch_size)]
+
+    start = time.perf_counter()
+    gas = await asyncio.gather(*(submit_batch(manager, ids, acts) for ids, acts in chunks))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "batch_size": batch_size,
+        "transactions": len(chunks),
+        "alerts_per_s": round(alerts / elapsed, 1),
+        "gas_per_alert": sum(gas) // alerts,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alerts", type=int, default=200)
+    parser.add_argument("--batch-sizes", default="1,10,50,100")
+    parser.add_argument("--private-key", default=os.getenv("PRIVATE_KEY", ANVIL_DEV_KEY))
+    args = parser.parse_args()
+
+    manager = BlockchainManager(args.private_key)
+    await manager.connect()
+    try:
+        for batch_size in (int(size) for size in args.batch_sizes.split(",")):
+            print(await run(manager, args.alerts, batch_size))
+    finally:
+        await manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+"""Trigger-to-callback latency, measured with a local stub subscriber.
+
+Runs a stub callback endpoint on --listen, sends --alerts live TradingView-format webhooks
+(one per webhook ID) to a running server and waits for each alert to come back as a
+callback. The stub checks every request's signature and timestamp like the orderbook
+server does, and the script prints callback requests, alerts per request, signature
+failures, duplicates and the p50/p99 latency from sending the webhook to receiving its
+callback. Start the server with the stub as its subscriber and a node that mines promptly:
+
+    anvil --block-time 1 &
+    ALERT_CALLBACK_URLS=http://localhost:18600/ ALERT_CALLBACK_SECRET=stub uv run python main.py &
+    uv run python benchmarks/callback_latency.py --url http://10.77.0.1:3001 --secret stub --alerts 100
+
+The IP check only trusts X-Forwarded-For from 10.x/172.x peers (see overload.py).
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from collections import Counter
+
+import aiohttp
+from aiohttp import web
+
+TRADINGVIEW_IP = "52.89.214.238"
+MAX_CLOCK_SKEW = 300
+
+
+def percentile_ms(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))] * 1000
+
+
+async def start_stub(port: int, secret: str, received: dict, stats: Counter, done: asyncio.Event, expected: int):
+    async def callback(request: web.Request) -> web.Response:
+        body = await request.read()
+        timestamp = request.headers.get("X-Yeti-Timestamp", "")
+        expected_signature = "sha256=" + hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+        if (not hmac.compare_digest(expected_signature, request.headers.get("X-Yeti-Signature", ""))
+                or not timestamp.isdigit() or abs(time.time() - int(timestamp)) > MAX_CLOCK_SKEW):
+            stats["bad_signature"] += 1
+            return web.json_response({"error": "Invalid signature"}, status=401)
+
+        stats["requests"] += 1
+        now = time.perf_counter()
+        for alert in json.loads(body)["alerts"]:
+            key = (alert["webhook_id"], alert["nonce"])
+            if key in received:
+                stats["duplicates"] += 1
+                continue
+            received[key] = (now, alert)
+        if len(received) >= expected:
+            done.set()
+        return web.json_response({"success": True})
+
+    app = web.Application()
+    app.router.add_post("/", callback)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "0.0.0.0", port).start()
+    return runner
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:3001")
+    parser.add_argument("--listen", type=int, default=18600)
+    parser.add_argument("--secret", required=True, help="the server's ALERT_CALLBACK_SECRET")
+    parser.add_argument("--alerts", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=20, help="webhooks per second")
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    received: dict = {}
+    stats = Counter()
+    done = asyncio.Event()
+    runner = await start_stub(args.listen, args.secret, received, stats, done, args.alerts)
+
+    sent_at = {}
+    async with aiohttp.ClientSession() as session:
+        async with session.post(f"{args.url}/create-webhooks", params={"count": args.alerts}) as response:
+            webhooks = (await response.json())["webhooks"]
+        for webhook in webhooks:
+            headers = {"X-Forwarded-For": TRADINGVIEW_IP, "Idempotency-Key": str(uuid.uuid4())}
+            sent_at[webhook["webhook_id"]] = time.perf_counter()
+            async with session.post(f"{args.url}/webhook/{webhook['webhook_id']}", headers=headers,
+                                    data=webhook["buy_message"]) as response:
+                stats[f"webhook_{response.status}"] += 1
+            await asyncio.sleep(1 / args.rate)
+        try:
+            await asyncio.wait_for(done.wait(), args.timeout)
+        except asyncio.TimeoutError:
+            pass
+    await runner.cleanup()
+
+    latencies = [arrived - sent_at[alert["webhook_id"]] for arrived, alert in received.values() if alert["webhook_id"] in sent_at]
+    complete = sum(
+        1 for _, alert in received.values()
+        if alert["nonce"] is not None and alert["block_number"] is not None and alert["tx_hash"] and alert["alert_id"]
+    )
+    print(f"{len(received)}/{args.alerts} alerts called back in {stats['requests']} requests "
+          f"({len(received) / max(1, stats['requests']):.1f} alerts/request), {complete} with nonce, block and tx hash")
+    print(f"  {dict(stats)}")
+    print(f"  webhook -> callback p50/p99 {percentile_ms(latencies, 50):.0f}/{percentile_ms(latencies, 99):.0f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+"""Last-write-wins coalescing of alerts for one webhook ID.
+
+Runs against a node that does not mine on its own: sends a first alert, waits for it
+to be broadcast, sends --updates more alerts for the same webhook ID alternating
+between long and short while the first is still pending, then mines one block. Prints
+each alert's final status, how many transactions the block holds and the action left
+on chain, which should be the last one sent.
+
+    anvil --no-mining &
+    (cd ../contracts && forge script script/SetupAnvilEnvironment.s.sol --broadcast --rpc-url http://localhost:8545 \\
+        --private-key 0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80)
+    cast rpc evm_mine
+    uv run python benchmarks/coalescing.py --contract 0x... --updates 3
+"""
+import argparse
+import asyncio
+import os
+import sys
+import uuid
+
+ANVIL_DEV_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rpc", default="http://localhost:8545")
+    parser.add_argument("--contract", default=os.getenv("CONTRACT_ADDRESS"))
+    parser.add_argument("--updates", type=int, default=3)
+    parser.add_argument("--private-key", default=os.getenv("PRIVATE_KEY", ANVIL_DEV_KEY))
+    args = parser.parse_args()
+
+    # contract_config reads the environment on import
+    os.environ["RPC_URL"] = args.rpc
+    os.environ.setdefault("TEE_SECRET", "bench")
+    os.environ["COALESCE_ALERTS"] = "true"
+    if args.contract:
+        os.environ["CONTRACT_ADDRESS"] = args.contract
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from blockchain_utils import BlockchainManager
+    from submission_tracker import SubmissionStatus, SubmissionTracker
+
+    manager = BlockchainManager(args.private_key)
+    await manager.connect()
+    tracker = SubmissionTracker(manager)
+    await tracker.start()
+    try:
+        webhook_id = str(uuid.uuid4())
+        actions = ["buy", "sell"]
+        submissions = [await tracker.enqueue(webhook_id, {"action": "buy"})]
+        await asyncio.wait_for(submissions[0].broadcast_event.wait(), timeout=10)
+
+        for update in range(1, args.updates + 1):
+            submission = await tracker.enqueue(webhook_id, {"action": actions[update % 2]})
+            submissions.append(submission)
+            await asyncio.wait_for(submission.broadcast_event.wait(), timeout=10)
+
+        await manager.w3.provider.make_request("evm_mine", [])
+        await asyncio.wait_for(submissions[-1].done_event.wait(), timeout=30)
+
+        for index, submission in enumerate(submissions):
+            print(f"alert {index}: {submission.action_name:5} {submission.status:10} {submission.tx_hash}")
+        block = await manager.w3.eth.get_block('latest')
+        alert = await manager.get_alert_from_chain(webhook_id)
+        mined = sum(submission.status == SubmissionStatus.MINED for submission in submissions)
+        print(f"{len(submissions)} alerts, {mined} mined, {len(block['transactions'])} transactions in block "
+              f"{block['number']}, on-chain action {alert.get('action_name')} "
+              f"(last sent {submissions[-1].action_name})")
+    finally:
+        await tracker.stop()
+        await manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,159 @@
+"""Time from process start to the first accepted webhook, after a deploy and after crashes.
+
+Starts the tappd stand-in and a server process, creates a webhook once it answers, then
+SIGKILLs and restarts the server --restarts times on the same journal and index, as after a
+crash. From the moment each process is started it polls every --poll-interval seconds and
+records when it first answers HTTP at all, when GET /ready first passes and when a
+TradingView webhook is first accepted (2xx); webhooks sent before that are counted by
+status. Reports each start with the startup profile from /ready, and the medians of the
+restarts.
+
+    anvil --block-time 1 &
+    uv run python benchmarks/cold_start.py --contract 0x... --url http://10.77.0.1:3001
+
+The IP check only trusts X-Forwarded-For from 10.x/172.x peers (see overload.py).
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Optional
+
+import aiohttp
+
+from scenarios import TRADINGVIEW_IP, add_server_arguments, crash, start_server
+from tappd_stub import TAPPD_PORT, start_tappd_stub
+
+
+async def status_of(session: aiohttp.ClientSession, method: str, url: str, **kwargs) -> tuple[Optional[int], Optional[dict]]:
+    try:
+        async with session.request(method, url, **kwargs) as response:
+            body = await response.json(content_type=None) if response.content_type == "application/json" else None
+            return response.status, body
+    except aiohttp.ClientError:
+        return None, None
+
+
+async def first_webhook(session: aiohttp.ClientSession, url: str, server: subprocess.Popen, timeout: float) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with status {server.returncode}")
+        status, body = await status_of(session, "POST", f"{url}/create-webhook")
+        if status == 200:
+            return body
+        await asyncio.sleep(0.1)
+    raise RuntimeError("Server did not create a webhook in time")
+
+
+async def measure_start(session: aiohttp.ClientSession, args, server: subprocess.Popen, started: float,
+                        webhook: dict, message: str) -> dict:
+    """Poll a starting server until it accepts the webhook"""
+    listening = ready = accepted = None
+    profile = None
+    rejected: Counter = Counter()
+    deadline = started + args.timeout
+    while accepted is None:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with status {server.returncode}")
+        if time.monotonic() > deadline:
+            raise RuntimeError("Server did not accept a webhook in time")
+        (ready_status, ready_body), (webhook_status, _) = await asyncio.gather(
+            status_of(session, "GET", f"{args.url}/ready"),
+            status_of(session, "POST", f"{args.url}/webhook/{webhook['webhook_id']}",
+                      headers={"X-Forwarded-For": TRADINGVIEW_IP}, data=webhook[message])
+        )
+        now = time.monotonic() - started
+        if listening is None and (ready_status or webhook_status):
+            listening = now
+        if ready is None and ready_status == 200:
+            ready, profile = now, ready_body.get("startup")
+        if webhook_status is not None and webhook_status < 300:
+            accepted = now
+        else:
+            rejected[str(webhook_status or "no connection")] += 1
+            await asyncio.sleep(args.poll_interval)
+    return {
+        "listening_seconds": round(listening, 3),
+        # None for a server without GET /ready
+        "ready_seconds": round(ready, 3) if ready is not None else None,
+        "first_accepted_seconds": round(accepted, 3),
+        "rejected_before": dict(rejected),
+        "startup_profile": profile
+    }
+
+
+def stop(server: subprocess.Popen):
+    if server.poll() is None:
+        server.send_signal(signal.SIGINT)
+    try:
+        server.wait(15)
+    except subprocess.TimeoutExpired:
+        crash(server)
+
+
+async def run(args) -> dict:
+    tappd = await start_tappd_stub(TAPPD_PORT, args.master_key)
+    with tempfile.TemporaryDirectory(prefix="yeti-cold-") as workdir:
+        server = None
+
+        def start() -> tuple[subprocess.Popen, float]:
+            started = time.monotonic()
+            return start_server(args.rpc, f"http://localhost:{TAPPD_PORT}", args.contract, workdir,
+                                {"PORT": args.url.rsplit(":", 1)[1].split("/")[0]}), started
+
+        try:
+            async with aiohttp.ClientSession() as session:
+                server, started = start()
+                webhook = await first_webhook(session, args.url, server, args.timeout)
+                deploy = {"first_create_webhook_seconds": round(time.monotonic() - started, 3)}
+                crash(server)
+
+                starts = []
+                for index in range(args.restarts):
+                    server, started = start()
+                    message = "buy_message" if index % 2 == 0 else "sell_message"
+                    starts.append(await measure_start(session, args, server, started, webhook, message))
+                    if index < args.restarts - 1:
+                        crash(server)
+
+                def median(key: str) -> Optional[float]:
+                    values = [start[key] for start in starts if start[key] is not None]
+                    return round(statistics.median(values), 3) if values else None
+
+                return {
+                    "deploy": deploy,
+                    "restarts": starts,
+                    "median_listening_seconds": median("listening_seconds"),
+                    "median_ready_seconds": median("ready_seconds"),
+                    "median_first_accepted_seconds": median("first_accepted_seconds")
+                }
+        except Exception:
+            with open(os.path.join(workdir, "server.log")) as log:
+                print(log.read()[-4000:], file=sys.stderr)
+            raise
+        finally:
+            if server is not None:
+                stop(server)
+            await tappd.cleanup()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_server_arguments(parser)
+    parser.add_argument("--restarts", type=int, default=5)
+    parser.add_argument("--poll-interval", type=float, default=0.01)
+    parser.add_argument("--timeout", type=float, default=60, help="seconds a start may take")
+    args = parser.parse_args()
+    print(json.dumps(await run(args), indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""Authenticate-and-enqueue throughput of POST /webhook/{webhook_id}.
+
+Keeps --concurrency live TradingView-format webhooks (ACTION_SECRET body, unique
+Idempotency-Key) in flight for --duration seconds and reports requests per second, latency
+and requests per CPU-second of the server process, read from process_cpu_seconds_total on
+/metrics. Requests per CPU-second is the per-core figure: it does not depend on the load
+generator sharing the machine. Run it once with WEBHOOK_FAST_LANE=true and once with false
+to compare the raw ASGI lane against the FastAPI route.
+
+Admission limits would reject most of this traffic, so start the server with them off, and
+keep the node from mining so broadcasts and receipts stay out of the measurement: alerts for
+the same webhook ID then coalesce in the queue. The IP check only trusts X-Forwarded-For
+from 10.x/172.x peers, so reach the server through such an address (see overload.py).
+
+    anvil --no-mining &
+    ADMISSION_GLOBAL_RATE=0 ADMISSION_WEBHOOK_RATE=0 uv run python main.py &
+    uv run python benchmarks/ingest_throughput.py --url http://10.77.0.1:3001 --duration 10
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from collections import Counter
+
+import aiohttp
+
+TRADINGVIEW_IP = "52.89.214.238"
+
+
+def percentile_ms(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))] * 1000
+
+
+async def create_webhooks(session: aiohttp.ClientSession, url: str, count: int) -> list[dict]:
+    async with session.post(f"{url}/create-webhooks", params={"count": count}) as response:
+        return (await response.json())["webhooks"]
+
+
+async def server_cpu_seconds(session: aiohttp.ClientSession, url: str) -> float:
+    async with session.get(f"{url}/metrics") as response:
+        for line in (await response.text()).splitlines():
+            if line.startswith("process_cpu_seconds_total "):
+                return float(line.split()[1])
+    raise RuntimeError("process_cpu_seconds_total not exported (only available on Linux)")
+
+
+async def worker(session: aiohttp.ClientSession, url: str, webhooks: list[dict], deadline: float,
+                 statuses: Counter, latencies: list[float]):
+    while time.perf_counter() < deadline:
+        webhook = random.choice(webhooks)
+        headers = {"X-Forwarded-For": TRADINGVIEW_IP, "Idempotency-Key": str(uuid.uuid4())}
+        body = webhook[random.choice(["buy_message", "sell_message"])]
+        start = time.perf_counter()
+        try:
+            async with session.post(f"{url}/webhook/{webhook['webhook_id']}", headers=headers, data=body) as response:
+                await response.read()
+                statuses[response.status] += 1
+        except aiohttp.ClientError:
+            statuses["error"] += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:3001")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--webhooks", type=int, default=10)
+    args = parser.parse_args()
+
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        webhooks = await create_webhooks(session, args.url, args.webhooks)
+        statuses: Counter = Counter()
+        latencies: list[float] = []
+        cpu_before = await server_cpu_seconds(session, args.url)
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            worker(session, args.url, webhooks, start + args.duration, statuses, latencies)
+            for _ in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+        cpu = await server_cpu_seconds(session, args.url) - cpu_before
+
+    total = sum(count for status, count in statuses.items() if status != "error")
+    print(f"statuses={dict(statuses)}")
+    print(f"{total / elapsed:.0f} requests/s, server CPU {cpu:.1f}s over {elapsed:.1f}s "
+          f"-> {total / cpu:.0f} requests per CPU-second")
+    print(f"latency p50/p99 {percentile_ms(latencies, 50):.1f}/{percentile_ms(latencies, 99):.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+"""Durable alert journal ingest: fsync cost per alert with and without group commit.
+
+Appends alerts from many concurrent writers, as a burst of webhooks would, to a fresh
+journal in a temporary directory (point --dir at the disk the server uses), once with
+one commit per alert and once with group commit, and reports alerts per second,
+commits (fsyncs) per alert and append latency.
+
+    uv run python benchmarks/journal_fsync.py --alerts 5000 --concurrency 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("TEE_SECRET", "bench")
+
+from alert_journal import AlertJournal
+
+
+async def run(directory: str, alerts: int, concurrency: int, max_group: int) -> dict:
+    journal = AlertJournal(os.path.join(directory, f"journal-{max_group}.db"), max_group=max_group)
+    journal.start()
+    latencies = []
+    remaining = iter(range(alerts))
+
+    async def writer():
+        for _ in remaining:
+            start = time.perf_counter()
+            await journal.append(str(uuid.uuid4()), 1)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(writer() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    commits = journal.commits
+    await journal.close()
+
+    latencies.sort()
+    return {
+        "group_commit": max_group > 1,
+        "alerts_per_s": round(alerts / elapsed),
+        "commits_per_alert": round(commits / alerts, 3),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alerts", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--dir", default=None, help="directory for the journal files (default: a temp dir)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        print(await run(directory, args.alerts, args.concurrency, max_group=1))
+        print(await run(directory, args.alerts, args.concurrency, max_group=1000))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
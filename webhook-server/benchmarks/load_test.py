@@ -0,0 +1,105 @@
+"""Concurrent webhook load benchmark.
+
+Fires a burst of test-mode webhooks at a running server while polling /health,
+and reports p50/p99 latency for both. A blocking RPC call on the event loop
+shows up as /health latency tracking the slowest alert.
+
+Requires a running server backed by a local anvil node, e.g.:
+
+    anvil &
+    (cd ../contracts && forge script script/SetupAnvilEnvironment.s.sol --broadcast --rpc-url http://localhost:8545)
+    uv run python main.py &
+    uv run python benchmarks/load_test.py --alerts 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+import aiohttp
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summarize(name: str, samples: list[float], errors: int) -> dict:
+    return {
+        "name": name,
+        "count": len(samples),
+        "errors": errors,
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 2) if samples else 0.0,
+    }
+
+
+async def timed_request(session: aiohttp.ClientSession, method: str, url: str, headers: dict = None) -> tuple[float, bool]:
+    start = time.perf_counter()
+    try:
+        async with session.request(method, url, headers=headers) as response:
+            await response.read()
+            ok = response.status < 400
+    except aiohttp.ClientError:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+async def fire_alerts(session: aiohttp.ClientSession, base_url: str, webhook_id: str, count: int) -> tuple[list[float], int]:
+    actions = ["buy", "sell"]
+    # A unique idempotency key per request keeps the server from answering repeats as duplicates
+    tasks = [
+        timed_request(session, "GET", f"{base_url}/webhook/{webhook_id}/testing/{actions[i % 2]}",
+                      headers={"Idempotency-Key": str(uuid.uuid4())})
+        for i in range(count)
+    ]
+    results = await asyncio.gather(*tasks)
+    return [elapsed for elapsed, ok in results if ok], sum(1 for _, ok in results if not ok)
+
+
+async def poll_health(session: aiohttp.ClientSession, base_url: str, stop: asyncio.Event, interval: float) -> tuple[list[float], int]:
+    samples, errors = [], 0
+    while not stop.is_set():
+        elapsed, ok = await timed_request(session, "GET", f"{base_url}/health")
+        if ok:
+            samples.append(elapsed)
+        else:
+            errors += 1
+        await asyncio.sleep(interval)
+    return samples, errors
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:3001")
+    parser.add_argument("--alerts", type=int, default=100, help="number of concurrent alerts to fire")
+    parser.add_argument("--health-interval", type=float, default=0.05)
+    args = parser.parse_args()
+
+    connector = aiohttp.TCPConnector(limit=0)
+    timeout = aiohttp.ClientTimeout(total=120)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        async with session.post(f"{args.url}/create-webhook") as response:
+            webhook_id = (await response.json())["webhook_id"]
+
+        stop = asyncio.Event()
+        health_task = asyncio.create_task(poll_health(session, args.url, stop, args.health_interval))
+
+        start = time.perf_counter()
+        alert_samples, alert_errors = await fire_alerts(session, args.url, webhook_id, args.alerts)
+        wall_time = time.perf_counter() - start
+
+        stop.set()
+        health_samples, health_errors = await health_task
+
+    print(f"{args.alerts} alerts in {wall_time:.2f}s ({args.alerts / wall_time:.1f} alerts/s)")
+    for summary in (summarize("webhook", alert_samples, alert_errors), summarize("health", health_samples, health_errors)):
+        print(summary)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
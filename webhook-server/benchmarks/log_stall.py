@@ -0,0 +1,156 @@
+"""Event-loop stall caused by logging to a slow sink, per logging mode.
+
+Simulates webhook handling in-process: --rate requests per second for --duration seconds,
+each logging two info records the way receive_webhook does (plus a warning for one in
+--warning-every), inside a log context. The log stream sleeps --sink-delay-ms per write, as
+stdout does when the container log pipeline applies backpressure. A monitor task sleeps
+1 ms at a time and records how late it wakes up. For each mode it reports the loop lag
+p50/p99/max and total lag, the requests handled per second, how long writing out what was
+still queued took after the run, and the info and warning records emitted and written.
+Records are never waited for: when the queue is full they are dropped, and the writer logs
+how many (those summary lines count as warnings written).
+
+    uv run python benchmarks/log_stall.py --sink-delay-ms 2
+"""
+import argparse
+import asyncio
+import io
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# contract_config reads the environment on import
+os.environ.setdefault("TEE_SECRET", "bench")
+os.environ.setdefault("CONTRACT_ADDRESS", "0x5FbDB2315678afecb367f032d93F642f64180aa3")
+
+from contract_config import LOG_QUEUE_SIZE
+from structured_logging import configure_logging, log_context, stop_logging
+
+from scenarios import percentile_ms
+
+# name: (LOG_MODE, LOG_FORMAT, sampling)
+MODES = {
+    "sync_text": ("sync", "text", False),
+    "async_text": ("async", "text", False),
+    "async_json": ("async", "json", False),
+    "async_json_sampled": ("async", "json", True)
+}
+MONITOR_INTERVAL = 0.001
+
+logger = logging.getLogger("webhook_server")
+
+
+class SlowSink(io.TextIOBase):
+    """A stream that takes delay seconds per write and counts the lines written by level"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.info = 0
+        self.warnings = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        time.sleep(self.delay)
+        with self.lock:
+            self.warnings += text.count("WARNING")
+            self.info += text.count("INFO")
+        return len(text)
+
+
+async def monitor(lags: list[float], stop: asyncio.Event):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + MONITOR_INTERVAL
+        await asyncio.sleep(MONITOR_INTERVAL)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def handle(index: int, warning_every: int, counts: dict):
+    webhook_id = f"6ad30cb9-f25d-94aa-0ff3-{index:012x}"
+    with log_context(request_id=f"{index:016x}", webhook_id=webhook_id):
+        logger.info("Received webhook: %s", webhook_id)
+        counts["info"] += 1
+        if warning_every and index % warning_every == 0:
+            logger.warning("Unauthorized IP: %s", "203.0.113.7")
+            counts["warnings"] += 1
+            return
+        logger.info("Processing webhook %s with action '%s' from %s", webhook_id, "buy", "52.89.214.238")
+        counts["info"] += 1
+        await asyncio.sleep(0)
+
+
+async def run_mode(name: str, args) -> dict:
+    mode, log_format, sampled = MODES[name]
+    sink = SlowSink(args.sink_delay_ms / 1000)
+    configure_logging(mode, log_format, sink, info_rate=args.info_rate if sampled else 0,
+                                 sample_every=args.sample_every, queue_size=args.queue_size)
+    # Only the records of this benchmark reach the sink
+    logging.getLogger().handlers[0].addFilter(lambda record: record.name == logger.name)
+
+    counts = {"info": 0, "warnings": 0}
+    lags: list[float] = []
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(monitor(lags, stop))
+    tasks = []
+    start = time.perf_counter()
+    for index in range(int(args.rate * args.duration)):
+        await asyncio.sleep(max(0.0, start + index / args.rate - time.perf_counter()))
+        tasks.append(asyncio.create_task(handle(index, args.warning_every, counts)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await watcher
+
+    drain_start = time.perf_counter()
+    stop_logging()
+    drained = time.perf_counter() - drain_start
+    return {
+        "loop_lag_p50_ms": round(percentile_ms(lags, 50), 3),
+        "loop_lag_p99_ms": round(percentile_ms(lags, 99), 3),
+        "loop_lag_max_ms": round(max(lags, default=0.0) * 1000, 3),
+        "loop_lag_total_ms": round(sum(lags) * 1000, 1),
+        "requests_per_second": round(len(tasks) / elapsed, 1),
+        "drain_seconds": round(drained, 2),
+        "info_emitted": counts["info"],
+        "info_written": sink.info,
+        "warnings_emitted": counts["warnings"],
+        "warnings_written": sink.warnings
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--rate", type=float, default=500, help="simulated webhooks per second")
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--sink-delay-ms", type=float, default=2, help="time the log stream takes per write")
+    parser.add_argument("--warning-every", type=int, default=100, help="one request in N logs a warning")
+    parser.add_argument("--info-rate", type=int, default=100, help="sampled mode: info records per second kept in full")
+    parser.add_argument("--sample-every", type=int, default=10)
+    parser.add_argument("--queue-size", type=int, default=LOG_QUEUE_SIZE)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.modes.split(","):
+        results[name] = await run_mode(name, args)
+        if not args.json:
+            result = results[name]
+            print(f"{name:20} lag p50/p99/max {result['loop_lag_p50_ms']}/{result['loop_lag_p99_ms']}/"
+                  f"{result['loop_lag_max_ms']} ms, total {result['loop_lag_total_ms']} ms, "
+                  f"{result['requests_per_second']} req/s, drain {result['drain_seconds']} s")
+            print(f"{'':20} info {result['info_written']}/{result['info_emitted']} written, "
+                  f"warnings {result['warnings_written']}/{result['warnings_emitted']}")
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
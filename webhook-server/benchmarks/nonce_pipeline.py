@@ -0,0 +1,72 @@
+"""Pipelined submission benchmark: many alerts from one key in a single block.
+
+Submits a burst of alerts through BlockchainManager against anvil with auto-mining
+off, mines one block once every transaction is in the mempool, and reports how many
+alerts landed per block and how many failed with nonce errors.
+
+    anvil --no-mining &
+    (cd ../contracts && forge script script/SetupAnvilEnvironment.s.sol --broadcast --rpc-url http://localhost:8545 \\
+        --private-key 0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80)
+    CONTRACT_ADDRESS=0x... TEE_SECRET=bench uv run python benchmarks/nonce_pipeline.py --alerts 50
+
+The default key is anvil's first dev account, which owns the oracle after the setup script.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain_utils import BlockchainManager
+
+ANVIL_DEV_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+
+async def wait_for_mempool(manager: BlockchainManager, target: int, timeout: float = 30):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if await manager.w3.eth.get_transaction_count(manager.account.address, 'pending') >= target:
+            return
+        await asyncio.sleep(0.05)
+    raise TimeoutError(f"mempool did not reach nonce {target}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alerts", type=int, default=50)
+    parser.add_argument("--private-key", default=os.getenv("PRIVATE_KEY", ANVIL_DEV_KEY))
+    args = parser.parse_args()
+
+    manager = BlockchainManager(args.private_key)
+    await manager.connect()
+    try:
+        start_nonce = await manager.w3.eth.get_transaction_count(manager.account.address, 'pending')
+        actions = ["buy", "sell"]
+        start = time.perf_counter()
+        tasks = [
+            asyncio.create_task(manager.submit_alert_on_chain(str(uuid.uuid4()), {"action": actions[i % 2]}))
+            for i in range(args.alerts)
+        ]
+
+        await wait_for_mempool(manager, start_nonce + args.alerts)
+        broadcast_time = time.perf_counter() - start
+        await manager.w3.provider.make_request("evm_mine", [])
+        results = await asyncio.gather(*tasks)
+    finally:
+        await manager.close()
+
+    succeeded = [r for r in results if r["success"]]
+    failed = [r for r in results if not r["success"]]
+    nonce_errors = [r for r in failed if "nonce" in r["error"].lower()]
+    blocks = {r["block_number"] for r in succeeded}
+
+    print(f"broadcast {args.alerts} alerts in {broadcast_time:.2f}s")
+    print(f"succeeded={len(succeeded)} failed={len(failed)} nonce_errors={len(nonce_errors)}")
+    print(f"blocks={sorted(blocks)} alerts_per_block={len(succeeded) / max(len(blocks), 1):.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
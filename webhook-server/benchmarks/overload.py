@@ -0,0 +1,139 @@
+"""Open-loop overload test for admission control.
+
+Sends webhooks at a fixed rate regardless of how fast the server answers, first at
+--rate and then at --overload times that rate, spread over --webhooks webhook IDs,
+while polling /health. For each phase it prints the responses by status code, the
+accepted alerts per second, p50/p99 latency of accepted and rejected requests, client
+timeouts, /health latency and the submission backlog left at the end. With admission
+control the excess should be answered quickly with 429/503 while accepted alerts and
+/health keep their latency.
+
+A --live-fraction of the traffic is sent as real TradingView webhooks (POST with
+ACTION_SECRET body). The server only trusts X-Forwarded-For from 10.x/172.x peers, so
+for those the server has to be reached through such an address, e.g. inside docker
+compose or after `ip addr add 10.77.0.1/32 dev lo` with --url http://10.77.0.1:3001.
+
+    uv run python main.py &
+    uv run python benchmarks/overload.py --rate 100 --overload 10 --duration 10
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from collections import Counter
+
+import aiohttp
+
+TRADINGVIEW_IP = "52.89.214.238"
+
+
+def percentile_ms(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))] * 1000
+
+
+async def create_webhooks(session: aiohttp.ClientSession, url: str, count: int) -> list[dict]:
+    async with session.post(f"{url}/create-webhooks", params={"count": count}) as response:
+        return (await response.json())["webhooks"]
+
+
+async def send(session: aiohttp.ClientSession, url: str, webhook: dict, live: bool, results: list):
+    action = random.choice(["buy", "sell"])
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+    start = time.perf_counter()
+    try:
+        if live:
+            headers["X-Forwarded-For"] = TRADINGVIEW_IP
+            request = session.post(f"{url}/webhook/{webhook['webhook_id']}", headers=headers,
+                                   data=webhook[f"{action}_message"])
+        else:
+            request = session.get(f"{url}/webhook/{webhook['webhook_id']}/testing/{action}", headers=headers)
+        async with request as response:
+            await response.read()
+            status = response.status
+    except asyncio.TimeoutError:
+        status = "timeout"
+    except aiohttp.ClientError:
+        status = "error"
+    results.append(("live" if live else "testing", status, time.perf_counter() - start))
+
+
+async def poll_health(session: aiohttp.ClientSession, url: str, stop: asyncio.Event, samples: list[float]):
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            async with session.get(f"{url}/health") as response:
+                await response.read()
+            samples.append(time.perf_counter() - start)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+        await asyncio.sleep(0.05)
+
+
+async def phase(session: aiohttp.ClientSession, args, webhooks: list[dict], rate: float) -> dict:
+    results, health = [], []
+    stop = asyncio.Event()
+    health_task = asyncio.create_task(poll_health(session, args.url, stop, health))
+    tasks = []
+    start = time.perf_counter()
+    sent = 0
+    while time.perf_counter() - start < args.duration:
+        # Open loop: keep to the schedule whether or not earlier requests were answered
+        due = int((time.perf_counter() - start) * rate)
+        for _ in range(due - sent):
+            live = random.random() < args.live_fraction
+            tasks.append(asyncio.create_task(send(session, args.url, random.choice(webhooks), live, results)))
+        sent = max(sent, due)
+        await asyncio.sleep(0.005)
+    await asyncio.gather(*tasks)
+    stop.set()
+    await health_task
+    async with session.get(f"{args.url}/status") as response:
+        backlog = (await response.json()).get("admission", {}).get("backlog")
+    return {"results": results, "health": health, "sent": len(tasks), "backlog": backlog}
+
+
+def report(name: str, rate: float, duration: float, outcome: dict):
+    results = outcome["results"]
+    print(f"{name}: {outcome['sent']} webhooks at {rate:.0f}/s, {outcome['backlog']} alerts left waiting for broadcast")
+    for lane in ("live", "testing"):
+        lane_results = [result for result in results if result[0] == lane]
+        if not lane_results:
+            continue
+        statuses = Counter(status for _, status, _ in lane_results)
+        accepted = [elapsed for _, status, elapsed in lane_results if status in (200, 202)]
+        rejected = [elapsed for _, status, elapsed in lane_results if status in (429, 503)]
+        print(f"  {lane:7} statuses={dict(statuses)} accepted/s={len(accepted) / duration:.1f} "
+              f"accepted p50/p99={percentile_ms(accepted, 50):.1f}/{percentile_ms(accepted, 99):.1f} ms "
+              f"rejected p50/p99={percentile_ms(rejected, 50):.1f}/{percentile_ms(rejected, 99):.1f} ms")
+    health = outcome["health"]
+    if health:
+        print(f"  health  p50/p99={percentile_ms(health, 50):.1f}/{percentile_ms(health, 99):.1f} ms "
+              f"mean={statistics.fmean(health) * 1000:.1f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:3001")
+    parser.add_argument("--rate", type=float, default=100, help="baseline webhooks per second")
+    parser.add_argument("--overload", type=float, default=10, help="overload multiple of the baseline rate")
+    parser.add_argument("--duration", type=float, default=10, help="seconds per phase")
+    parser.add_argument("--webhooks", type=int, default=50)
+    parser.add_argument("--live-fraction", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=10)
+    args = parser.parse_args()
+
+    connector = aiohttp.TCPConnector(limit=0)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        webhooks = await create_webhooks(session, args.url, args.webhooks)
+        for name, rate in (("baseline", args.rate), (f"{args.overload:g}x overload", args.rate * args.overload)):
+            report(name, rate, args.duration, await phase(session, args, webhooks, rate))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
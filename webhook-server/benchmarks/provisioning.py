@@ -0,0 +1,109 @@
+"""Webhook ID provisioning: throughput and uniqueness under concurrency.
+
+Generates --count webhook IDs in each of --threads threads at once from a fixed master
+secret, then checks that no ID or secret repeats, that every ID verifies together with its
+secret and that IDs in the legacy timestamp-only layout still verify. With --url it also
+fires --concurrency concurrent POST /create-webhooks calls (--batch IDs each) at a running
+server and checks the returned IDs for duplicates. Exits non-zero on any collision or
+verification failure.
+
+    uv run python benchmarks/provisioning.py --threads 8 --count 20000
+    uv run python benchmarks/provisioning.py --url http://localhost:3001 --concurrency 16 --batch 1000
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("TEE_SECRET", "bench")
+
+from webhook_server import generate_webhooks_with_secret, verify_webhook_id_and_secret
+
+MASTER_SECRET = hashlib.sha256(b"yeti-provisioning-benchmark").digest()
+
+
+def legacy_webhook(secret: bytes, timestamp: int) -> tuple[str, str]:
+    """An ID in the original layout: 4-byte timestamp and 12 bytes of its HMAC"""
+    message = timestamp.to_bytes(4, 'big')
+    full_signature = hmac.new(secret, message, hashlib.sha256).digest()
+    return str(uuid.UUID(bytes=message + full_signature[:12])), full_signature[12:].hex()
+
+
+def check_unique(webhooks: list[tuple[str, str]]) -> int:
+    """Number of repeated IDs or secrets"""
+    ids = {webhook_id for webhook_id, _ in webhooks}
+    secrets = {secret for _, secret in webhooks}
+    return 2 * len(webhooks) - len(ids) - len(secrets)
+
+
+def local(threads: int, count: int) -> bool:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        batches = list(pool.map(lambda _: generate_webhooks_with_secret(MASTER_SECRET, count), range(threads)))
+    generated = time.perf_counter() - start
+    webhooks = [webhook for batch in batches for webhook in batch]
+
+    start = time.perf_counter()
+    invalid = sum(
+        not verify_webhook_id_and_secret(webhook_id, secret.encode(), MASTER_SECRET)
+        for webhook_id, secret in webhooks
+    )
+    verified = time.perf_counter() - start
+
+    now = int(time.time())
+    legacy = [legacy_webhook(MASTER_SECRET, now - offset) for offset in range(1000)]
+    legacy_invalid = sum(
+        not verify_webhook_id_and_secret(webhook_id, secret.encode(), MASTER_SECRET)
+        for webhook_id, secret in legacy
+    )
+    duplicates = check_unique(webhooks)
+
+    print(f"local: {len(webhooks)} IDs from {threads} threads, {len(webhooks) / generated:.0f} IDs/s generated, "
+          f"{len(webhooks) / verified:.0f} IDs/s verified")
+    print(f"  duplicates={duplicates} invalid={invalid} legacy_invalid={legacy_invalid}/{len(legacy)}")
+    return duplicates == 0 and invalid == 0 and legacy_invalid == 0
+
+
+async def remote(url: str, concurrency: int, batch: int) -> bool:
+    async with aiohttp.ClientSession() as session:
+        async def create() -> list[dict]:
+            async with session.post(f"{url}/create-webhooks", params={"count": batch}) as response:
+                response.raise_for_status()
+                return (await response.json())["webhooks"]
+
+        start = time.perf_counter()
+        batches = await asyncio.gather(*(create() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    webhooks = [(webhook["webhook_id"], webhook["secret"]) for created in batches for webhook in created]
+    duplicates = check_unique(webhooks)
+    print(f"server: {len(webhooks)} IDs from {concurrency} concurrent calls, {len(webhooks) / elapsed:.0f} IDs/s, "
+          f"duplicates={duplicates}")
+    return duplicates == 0 and len(webhooks) == concurrency * batch
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--count", type=int, default=20000, help="IDs generated per thread")
+    parser.add_argument("--url", help="also provision through a running server")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch", type=int, default=1000, help="IDs per /create-webhooks call")
+    args = parser.parse_args()
+
+    ok = local(args.threads, args.count)
+    if args.url:
+        ok = await remote(args.url, args.concurrency, args.batch) and ok
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
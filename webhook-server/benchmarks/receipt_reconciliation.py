@@ -0,0 +1,65 @@
+"""RPC calls spent confirming many in-flight transactions at once.
+
+Broadcasts --alerts alerts through BlockchainManager, then waits for all their receipts
+concurrently behind the counting proxy of rpc_calls.py and prints the calls made while
+waiting, per alert and per block mined meanwhile. Receipts are reconciled per block, so
+the per-block figure should stay flat as --alerts grows while the per-alert figure drops.
+Needs a node that mines on an interval, so receipts are actually waited for.
+
+    anvil --block-time 2 &
+    uv run python benchmarks/receipt_reconciliation.py --contract 0x... --alerts 200
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from collections import Counter
+
+from rpc_calls import ANVIL_DEV_KEY, PROXY_PORT, start_counting_proxy
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rpc", default="http://localhost:8545")
+    parser.add_argument("--contract", default=os.getenv("CONTRACT_ADDRESS"))
+    parser.add_argument("--alerts", type=int, default=200)
+    parser.add_argument("--private-key", default=os.getenv("PRIVATE_KEY", ANVIL_DEV_KEY))
+    args = parser.parse_args()
+
+    counts = Counter()
+    runner = await start_counting_proxy(args.rpc, counts)
+
+    # contract_config reads the environment on import
+    os.environ["RPC_URL"] = f"http://localhost:{PROXY_PORT}"
+    os.environ.setdefault("TEE_SECRET", "bench")
+    if args.contract:
+        os.environ["CONTRACT_ADDRESS"] = args.contract
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from blockchain_utils import BlockchainManager
+
+    manager = BlockchainManager(args.private_key)
+    await manager.connect()
+    try:
+        sent = [await manager.broadcast_alert(str(uuid.uuid4()), 1) for _ in range(args.alerts)]
+        first_block = await manager.w3.eth.block_number
+        counts.clear()
+        start = time.perf_counter()
+        receipts = await asyncio.gather(*(manager.wait_for_receipt(transaction, tx_hash) for transaction, tx_hash in sent))
+        elapsed = time.perf_counter() - start
+        calls = Counter(counts)
+        blocks = max(1, max(receipt["blockNumber"] for receipt, _ in receipts) - first_block)
+    finally:
+        await manager.close()
+        await runner.cleanup()
+
+    methods = ", ".join(f"{method}={count}" for method, count in calls.most_common())
+    total = sum(calls.values())
+    print(f"{args.alerts} alerts confirmed in {elapsed:.1f}s over {blocks} blocks: {total} calls "
+          f"({total / args.alerts:.2f}/alert, {total / blocks:.1f}/block)")
+    print(f"  {methods}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
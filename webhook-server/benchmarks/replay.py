@@ -0,0 +1,192 @@
+"""Replay a traffic capture against a local server, sped up, for capacity planning.
+
+Reads a capture written by a server running with CAPTURE_PATH set, starts a server the way
+scenarios.py does (tappd stand-in, counting RPC proxy, fresh databases) and, for each
+--speeds factor, replays the arrivals open-loop with their original spacing divided by
+the factor. Every captured webhook ID is mapped to a webhook created on the replay server
+and sent its captured action; repeated deliveries carry the same Idempotency-Key, so
+duplicates are suppressed as they were live. After each pass it waits until every alert is
+mined and prints the offered and achieved rate, webhook response latency, queueing delay
+(accepted to taken off the queue), inclusion latency (accepted to mined), gas per alert and
+RPC calls per alert. The delay and gas figures come from the server's /metrics histograms
+(webhook_stage_seconds{stage="queue_wait"|"inclusion"}, webhook_alert_gas_used), so the
+percentiles are interpolated within buckets. The saturation point is the speed at which
+queueing delay starts to grow with the rate instead of staying flat.
+
+    CAPTURE_PATH=capture.jsonl uv run python main.py        # in production, for a while
+    anvil --block-time 2 &
+    uv run python benchmarks/replay.py capture.jsonl --speeds 1,10,100 --contract 0x... --url http://10.77.0.1:3001
+
+The IP check only trusts X-Forwarded-For from 10.x/172.x peers (see overload.py).
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from typing import Optional
+
+import aiohttp
+from prometheus_client.parser import text_string_to_metric_families
+
+from scenarios import TRADINGVIEW_IP, add_server_arguments, local_server, percentile_ms, wait_settled
+
+CREATE_CHUNK = 1000
+
+
+def load_capture(path: str, limit: Optional[int]) -> list[dict]:
+    with open(path) as capture:
+        arrivals = [json.loads(line) for line in capture if line.strip()]
+    arrivals.sort(key=lambda arrival: arrival["ts"])
+    return arrivals[:limit] if limit else arrivals
+
+
+async def histograms(session: aiohttp.ClientSession, url: str) -> dict:
+    """Cumulative bucket counts, sum and count per histogram series on /metrics"""
+    async with session.get(f"{url}/metrics") as response:
+        text = await response.text()
+    series: dict = {}
+    for family in text_string_to_metric_families(text):
+        if family.type != "histogram":
+            continue
+        for sample in family.samples:
+            labels = dict(sample.labels)
+            le = labels.pop("le", None)
+            entry = series.setdefault((family.name, labels.get("stage")), {"buckets": {}, "sum": 0.0, "count": 0.0})
+            if sample.name.endswith("_bucket"):
+                entry["buckets"][float(le)] = sample.value
+            elif sample.name.endswith("_sum"):
+                entry["sum"] = sample.value
+            elif sample.name.endswith("_count"):
+                entry["count"] = sample.value
+    return series
+
+
+def delta(before: dict, after: dict, key: tuple) -> dict:
+    empty = {"buckets": {}, "sum": 0.0, "count": 0.0}
+    old, new = before.get(key, empty), after.get(key, empty)
+    return {
+        "buckets": {le: count - old["buckets"].get(le, 0.0) for le, count in new["buckets"].items()},
+        "sum": new["sum"] - old["sum"],
+        "count": new["count"] - old["count"]
+    }
+
+
+def bucket_percentile(histogram: dict, pct: float) -> float:
+    """Percentile interpolated linearly within its bucket; the top finite bound if beyond it"""
+    if not histogram["count"]:
+        return 0.0
+    rank = pct / 100 * histogram["count"]
+    lower, below = 0.0, 0.0
+    bounds = sorted(histogram["buckets"].items())
+    for upper, cumulative in bounds:
+        if cumulative >= rank:
+            if upper == float("inf"):
+                return lower
+            inside = cumulative - below
+            return lower + (upper - lower) * ((rank - below) / inside if inside else 1.0)
+        lower, below = upper, cumulative
+    return lower
+
+
+async def create_webhooks(session: aiohttp.ClientSession, url: str, count: int) -> list[dict]:
+    webhooks = []
+    while len(webhooks) < count:
+        async with session.post(f"{url}/create-webhooks", params={"count": min(CREATE_CHUNK, count - len(webhooks))}) as response:
+            webhooks.extend((await response.json())["webhooks"])
+    return webhooks
+
+
+async def send(session: aiohttp.ClientSession, url: str, webhook: dict, arrival: dict,
+               statuses: Counter, latencies: list[float]):
+    headers = {"X-Forwarded-For": TRADINGVIEW_IP, "Idempotency-Key": arrival["key"]}
+    start = time.perf_counter()
+    try:
+        async with session.post(f"{url}/webhook/{webhook['webhook_id']}", headers=headers,
+                                data=f"{arrival['action']}_{webhook['secret']}") as response:
+            await response.read()
+            statuses[response.status] += 1
+    except aiohttp.ClientError:
+        statuses["error"] += 1
+        return
+    latencies.append(time.perf_counter() - start)
+
+
+async def replay(session: aiohttp.ClientSession, args, arrivals: list[dict], speed: float, counts: Counter) -> dict:
+    captured_ids = list(dict.fromkeys(arrival["webhook_id"] for arrival in arrivals))
+    webhooks = dict(zip(captured_ids, await create_webhooks(session, args.url, len(captured_ids))))
+
+    before = await histograms(session, args.url)
+    statuses: Counter = Counter()
+    latencies: list[float] = []
+    tasks = []
+    counts.clear()
+    first = arrivals[0]["ts"]
+    start = time.perf_counter()
+    for arrival in arrivals:
+        # Open loop: arrivals keep their (scaled) schedule however slow the server gets
+        await asyncio.sleep(max(0.0, start + (arrival["ts"] - first) / speed - time.perf_counter()))
+        tasks.append(asyncio.create_task(send(session, args.url, webhooks[arrival["webhook_id"]], arrival, statuses, latencies)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    settled = await wait_settled(session, args.url, args.settle_timeout)
+    calls = sum(counts.values())
+    after = await histograms(session, args.url)
+
+    queue_wait = delta(before, after, ("webhook_stage_seconds", "queue_wait"))
+    inclusion = delta(before, after, ("webhook_stage_seconds", "inclusion"))
+    gas = delta(before, after, ("webhook_alert_gas_used", None))
+    span = max(arrivals[-1]["ts"] - first, 1e-9) / speed
+    return {
+        "speed": speed,
+        "arrivals": len(arrivals),
+        "webhooks": len(captured_ids),
+        "offered_per_second": round(len(arrivals) / span, 1),
+        "achieved_per_second": round(len(arrivals) / elapsed, 1),
+        "response_p50_ms": round(percentile_ms(latencies, 50), 2),
+        "response_p99_ms": round(percentile_ms(latencies, 99), 2),
+        "queue_wait_p50_ms": round(bucket_percentile(queue_wait, 50) * 1000, 1),
+        "queue_wait_p99_ms": round(bucket_percentile(queue_wait, 99) * 1000, 1),
+        "inclusion_p50_ms": round(bucket_percentile(inclusion, 50) * 1000, 1),
+        "inclusion_p99_ms": round(bucket_percentile(inclusion, 99) * 1000, 1),
+        "alerts_mined": int(inclusion["count"]),
+        "gas_per_alert": round(gas["sum"] / gas["count"]) if gas["count"] else None,
+        "rpc_calls_per_alert": round(calls / max(1, inclusion["count"]), 2),
+        "settled": settled,
+        "statuses": {str(status): count for status, count in statuses.items()}
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("capture", help="JSON lines written by the server with CAPTURE_PATH")
+    parser.add_argument("--speeds", default="1,10,100", help="comma-separated speed-up factors")
+    parser.add_argument("--limit", type=int, help="replay only the first N arrivals")
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    arrivals = load_capture(args.capture, args.limit)
+    if not arrivals:
+        raise SystemExit(f"No arrivals in {args.capture}")
+
+    counts: Counter = Counter()
+    results = []
+    async with local_server(args, counts, args.connections) as session:
+        for speed in (float(factor) for factor in args.speeds.split(",")):
+            result = await replay(session, args, arrivals, speed, counts)
+            results.append(result)
+            if not args.json:
+                print(f"{speed:g}x: {result['offered_per_second']}/s offered, {result['achieved_per_second']}/s sent, "
+                      f"{result['alerts_mined']} mined{'' if result['settled'] else ' (not settled)'} {result['statuses']}")
+                print(f"  response p50/p99 {result['response_p50_ms']}/{result['response_p99_ms']} ms, "
+                      f"queue wait {result['queue_wait_p50_ms']}/{result['queue_wait_p99_ms']} ms, "
+                      f"inclusion {result['inclusion_p50_ms']}/{result['inclusion_p99_ms']} ms")
+                print(f"  gas/alert {result['gas_per_alert']}, RPC calls/alert {result['rpc_calls_per_alert']}")
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""RPC calls per alert, by method.
+
+Puts a counting proxy in front of the node, submits alerts through BlockchainManager
+and prints how many calls of each JSON-RPC method one alert cost, separately for
+building and broadcasting the transaction and for the whole submission including
+receipt polling.
+
+    anvil &
+    (cd ../contracts && forge script script/SetupAnvilEnvironment.s.sol --broadcast --rpc-url http://localhost:8545 \\
+        --private-key 0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80)
+    uv run python benchmarks/rpc_calls.py --contract 0x... --alerts 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import uuid
+from collections import Counter
+
+import aiohttp
+from aiohttp import web
+
+ANVIL_DEV_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+PROXY_PORT = 18545
+
+
+async def start_counting_proxy(target: str, counts: Counter) -> web.AppRunner:
+    session = aiohttp.ClientSession()
+
+    async def forward(request: web.Request) -> web.Response:
+        body = await request.read()
+        payload = json.loads(body)
+        for call in payload if isinstance(payload, list) else [payload]:
+            counts[call["method"]] += 1
+        async with session.post(target, data=body, headers={"Content-Type": "application/json"}) as response:
+            return web.Response(body=await response.read(), status=response.status, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_post("/", forward)
+    app.on_cleanup.append(lambda _: session.close())
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "localhost", PROXY_PORT).start()
+    return runner
+
+
+def per_alert(counts: Counter, alerts: int) -> str:
+    methods = ", ".join(f"{method}={count / alerts:.2f}" for method, count in counts.most_common())
+    return f"{sum(counts.values()) / alerts:.2f} calls/alert ({methods})"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rpc", default="http://localhost:8545")
+    parser.add_argument("--contract", default=os.getenv("CONTRACT_ADDRESS"))
+    parser.add_argument("--alerts", type=int, default=50)
+    parser.add_argument("--private-key", default=os.getenv("PRIVATE_KEY", ANVIL_DEV_KEY))
+    args = parser.parse_args()
+
+    counts = Counter()
+    runner = await start_counting_proxy(args.rpc, counts)
+
+    # contract_config reads the environment on import
+    os.environ["RPC_URL"] = f"http://localhost:{PROXY_PORT}"
+    os.environ.setdefault("TEE_SECRET", "bench")
+    if args.contract:
+        os.environ["CONTRACT_ADDRESS"] = args.contract
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from blockchain_utils import BlockchainManager
+
+    manager = BlockchainManager(args.private_key)
+    await manager.connect()
+    try:
+        # Background refreshes (fee oracle) are part of the steady-state cost, startup is not
+        counts.clear()
+        for _ in range(args.alerts):
+            await manager.broadcast_alert(str(uuid.uuid4()), 1)
+        print(f"build + broadcast: {per_alert(counts, args.alerts)}")
+
+        counts.clear()
+        for _ in range(args.alerts):
+            await manager.submit_alert_on_chain(str(uuid.uuid4()), {"action": "buy"})
+        print(f"full submission:   {per_alert(counts, args.alerts)}")
+    finally:
+        await manager.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
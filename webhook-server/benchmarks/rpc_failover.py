@@ -0,0 +1,96 @@
+"""RPC pool failover benchmark: keep submitting alerts while endpoints slow down or die.
+
+Puts a proxy that adds --delay-ms of latency in front of the first endpoint, then
+submits alerts in waves through BlockchainManager and prints per-wave success counts
+and per-endpoint latency, head block and breaker state. Kill one of the anvil
+instances mid-run to watch reads and broadcasts fail over.
+
+    anvil --port 8545 & anvil --port 8546 &
+    for port in 8545 8546; do
+        (cd ../contracts && forge script script/SetupAnvilEnvironment.s.sol --broadcast --rpc-url http://localhost:$port \\
+            --private-key 0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80)
+    done
+    uv run python benchmarks/rpc_failover.py --rpc http://localhost:8545 --rpc http://localhost:8546 \\
+        --contract 0x... --delay-ms 300 --waves 20
+
+The anvil instances are independent chains with the same deployment, so every one of
+them mines each broadcast transaction.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+import aiohttp
+from aiohttp import web
+
+ANVIL_DEV_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+PROXY_PORT = 18545
+
+
+async def start_delay_proxy(target: str, delay_ms: int) -> web.AppRunner:
+    session = aiohttp.ClientSession()
+
+    async def forward(request: web.Request) -> web.Response:
+        await asyncio.sleep(delay_ms / 1000)
+        async with session.post(target, data=await request.read(), headers={"Content-Type": "application/json"}) as response:
+            return web.Response(body=await response.read(), status=response.status, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_post("/", forward)
+    app.on_cleanup.append(lambda _: session.close())
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "localhost", PROXY_PORT).start()
+    return runner
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rpc", action="append", required=True, help="RPC endpoint, repeat for each node")
+    parser.add_argument("--contract", default=os.getenv("CONTRACT_ADDRESS"))
+    parser.add_argument("--delay-ms", type=int, default=300, help="latency added to the first endpoint")
+    parser.add_argument("--waves", type=int, default=20)
+    parser.add_argument("--alerts-per-wave", type=int, default=10)
+    parser.add_argument("--private-key", default=os.getenv("PRIVATE_KEY", ANVIL_DEV_KEY))
+    args = parser.parse_args()
+
+    runner = await start_delay_proxy(args.rpc[0], args.delay_ms) if args.delay_ms else None
+    urls = [f"http://localhost:{PROXY_PORT}" if runner else args.rpc[0]] + args.rpc[1:]
+
+    # contract_config reads the environment on import
+    os.environ["RPC_URL"] = ",".join(urls)
+    os.environ.setdefault("RPC_PROBE_INTERVAL", "1")
+    os.environ.setdefault("TEE_SECRET", "bench")
+    if args.contract:
+        os.environ["CONTRACT_ADDRESS"] = args.contract
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from blockchain_utils import BlockchainManager
+
+    manager = BlockchainManager(args.private_key)
+    await manager.connect()
+    try:
+        for wave in range(args.waves):
+            start = time.perf_counter()
+            results = await asyncio.gather(*(
+                manager.submit_alert_on_chain(str(uuid.uuid4()), {"action": "buy"})
+                for _ in range(args.alerts_per_wave)
+            ))
+            elapsed = time.perf_counter() - start
+            succeeded = sum(1 for result in results if result["success"])
+            endpoints = " ".join(
+                f"{e['url']}[{'up' if e['healthy'] else 'down'} {e['latency_ms']}ms #{e['block_number']} err={e['errors']}]"
+                for e in manager.provider.stats()
+            )
+            print(f"wave {wave}: {succeeded}/{len(results)} mined in {elapsed:.2f}s  {endpoints}")
+            await asyncio.sleep(1)
+    finally:
+        await manager.close()
+        if runner:
+            await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,200 @@
+"""Ingest workers in front of a leader/standby signer pair, with the leader killed mid-load.
+
+Starts the tappd stand-in, two signer processes (SERVER_ROLE=signer, HTTP on --signer-ports)
+sharing one journal and signer lock, and one ingest process (SERVER_ROLE=ingest) with
+--ingest-workers workers on the port of --url, all on this machine. It sends buy/sell
+webhooks open-loop at --rate per second for --duration seconds through the ingest workers
+and SIGKILLs the active signer --kill-after seconds in. Then it waits until the new leader
+has mined everything and checks every webhook's on-chain action against the last alert
+the ingest workers accepted for it.
+
+Reports the failover time (kill until the standby serves ingest workers), the longest gap
+between accepted webhooks, response statuses and latency, and the webhooks whose on-chain
+action is not the last accepted one (expected 0).
+
+    anvil --block-time 1 &
+    uv run python benchmarks/scale_out.py --contract 0x... --url http://10.77.0.1:3001
+
+The IP check only trusts X-Forwarded-For from 10.x/172.x peers (see overload.py).
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Optional
+
+import aiohttp
+
+from scenarios import TRADINGVIEW_IP, add_server_arguments, crash, percentile_ms, start_server, wait_settled
+from tappd_stub import TAPPD_PORT, start_tappd_stub
+
+# Oracle actions of the messages sent (contract_config.ACTION_MAPPING)
+ACTIONS = {"buy_message": 2, "sell_message": 1}
+
+
+async def get_json(session: aiohttp.ClientSession, url: str) -> Optional[dict]:
+    try:
+        async with session.get(url) as response:
+            return await response.json() if response.status == 200 else None
+    except aiohttp.ClientError:
+        return None
+
+
+async def wait_for(condition, timeout: float, what: str, processes: list[subprocess.Popen]):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for process in processes:
+            if process.poll() is not None:
+                raise RuntimeError(f"A server process exited with status {process.returncode} while waiting for {what}")
+        if await condition():
+            return
+        await asyncio.sleep(0.1)
+    raise RuntimeError(f"Timed out waiting for {what}")
+
+
+async def serving(session: aiohttp.ClientSession, signer_url: str) -> bool:
+    status = await get_json(session, f"{signer_url}/status")
+    return bool(status and status.get("signer") and status["signer"]["endpoint"])
+
+
+async def send(session: aiohttp.ClientSession, url: str, webhook: dict, message: str, index: int,
+               accepted: dict, statuses: Counter, latencies: list[float], accept_times: list[float]):
+    start = time.perf_counter()
+    try:
+        async with session.post(f"{url}/webhook/{webhook['webhook_id']}", headers={"X-Forwarded-For": TRADINGVIEW_IP},
+                                data=webhook[message]) as response:
+            await response.read()
+            statuses[response.status] += 1
+            if response.status < 300:
+                previous = accepted.get(webhook["webhook_id"])
+                if previous is None or previous[0] < index:
+                    accepted[webhook["webhook_id"]] = (index, ACTIONS[message])
+                accept_times.append(time.perf_counter())
+    except aiohttp.ClientError:
+        statuses["error"] += 1
+        return
+    latencies.append(time.perf_counter() - start)
+
+
+async def run(args) -> dict:
+    tappd = await start_tappd_stub(TAPPD_PORT, args.master_key)
+    with tempfile.TemporaryDirectory(prefix="yeti-scale-") as workdir:
+        socket = f"unix:{os.path.join(workdir, 'signer.sock')}"
+        shared = {"SIGNER_ADDRESSES": socket, "SIGNER_LISTEN": socket, "SIGNER_LOCK_POLL_INTERVAL": str(args.lock_poll)}
+        ports = [int(port) for port in args.signer_ports.split(",")]
+        signer_urls = [f"http://localhost:{port}" for port in ports]
+
+        def start(role: str, port: int, log_name: str, **env) -> subprocess.Popen:
+            return start_server(args.rpc, f"http://localhost:{TAPPD_PORT}", args.contract, workdir,
+                                {**shared, "SERVER_ROLE": role, "PORT": str(port), **env}, log_name)
+
+        processes = []
+        try:
+            async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=1000)) as session:
+                leader = start("signer", ports[0], "signer-0.log")
+                processes.append(leader)
+                await wait_for(lambda: serving(session, signer_urls[0]), 60, "the first signer", processes)
+                standby = start("signer", ports[1], "signer-1.log")
+                processes.append(standby)
+                await wait_for(lambda: get_json(session, f"{signer_urls[1]}/status"), 60, "the standby signer", processes)
+                ingest_port = int(args.url.rsplit(":", 1)[1].split("/")[0])
+                processes.append(start("ingest", ingest_port, "ingest.log", INGEST_WORKERS=str(args.ingest_workers)))
+
+                async def ingest_ready() -> bool:
+                    health = await get_json(session, f"{args.url}/health")
+                    return bool(health and health["status"] == "pass")
+                await wait_for(ingest_ready, 60, "the ingest workers", processes)
+
+                async with session.post(f"{args.url}/create-webhooks", params={"count": args.webhooks}) as response:
+                    webhooks = (await response.json())["webhooks"]
+
+                accepted: dict = {}
+                statuses: Counter = Counter()
+                latencies: list[float] = []
+                accept_times: list[float] = []
+                tasks = []
+                failover: dict = {}
+
+                async def kill_leader():
+                    await asyncio.sleep(args.kill_after)
+                    crash(leader)
+                    failover["killed_at"] = time.perf_counter()
+                    await wait_for(lambda: serving(session, signer_urls[1]), 60, "the standby to take over", [standby])
+                    failover["serving_at"] = time.perf_counter()
+
+                killer = asyncio.create_task(kill_leader())
+                start_time = time.perf_counter()
+                for index in range(int(args.rate * args.duration)):
+                    await asyncio.sleep(max(0.0, start_time + index / args.rate - time.perf_counter()))
+                    webhook = webhooks[index % len(webhooks)]
+                    message = "buy_message" if (index // len(webhooks)) % 2 == 0 else "sell_message"
+                    tasks.append(asyncio.create_task(send(session, args.url, webhook, message, index,
+                                                          accepted, statuses, latencies, accept_times)))
+                await asyncio.gather(*tasks)
+                elapsed = time.perf_counter() - start_time
+                await killer
+                settled = await wait_settled(session, signer_urls[1], args.settle_timeout)
+
+                mismatched = 0
+                for webhook_id, (_, action) in accepted.items():
+                    alert = await get_json(session, f"{args.url}/alert/{webhook_id}")
+                    if not alert or alert.get("action") != action:
+                        mismatched += 1
+
+                accept_times.sort()
+                gaps = [later - earlier for earlier, later in zip(accept_times, accept_times[1:])]
+                requests = sum(statuses.values())
+                return {
+                    "ingest_workers": args.ingest_workers,
+                    "requests": requests,
+                    "requests_per_second": round(requests / elapsed, 1),
+                    "p50_ms": round(percentile_ms(latencies, 50), 2),
+                    "p99_ms": round(percentile_ms(latencies, 99), 2),
+                    "failover_seconds": round(failover["serving_at"] - failover["killed_at"], 2),
+                    "longest_gap_seconds": round(max(gaps, default=0.0), 2),
+                    "webhooks_checked": len(accepted),
+                    "mismatched_webhooks": mismatched,
+                    "settled": settled,
+                    "statuses": {str(status): count for status, count in statuses.items()}
+                }
+        except Exception:
+            for log_name in ("signer-0.log", "signer-1.log", "ingest.log"):
+                path = os.path.join(workdir, log_name)
+                if os.path.exists(path):
+                    with open(path) as log:
+                        print(f"--- {log_name}\n{log.read()[-3000:]}", file=sys.stderr)
+            raise
+        finally:
+            for process in processes:
+                if process.poll() is None:
+                    process.send_signal(signal.SIGINT)
+            for process in processes:
+                try:
+                    process.wait(15)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+            await tappd.cleanup()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_server_arguments(parser)
+    parser.add_argument("--ingest-workers", type=int, default=2)
+    parser.add_argument("--signer-ports", default="3101,3102", help="HTTP ports of the two signers")
+    parser.add_argument("--webhooks", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=50, help="webhooks per second")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--kill-after", type=float, default=3, help="seconds into the load to kill the leader")
+    parser.add_argument("--lock-poll", type=float, default=0.2, help="standby signer lock poll interval")
+    args = parser.parse_args()
+    print(json.dumps(await run(args), indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
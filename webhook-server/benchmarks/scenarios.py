@@ -0,0 +1,258 @@
+"""End-to-end load scenarios against a local node.
+
+Starts the tappd stand-in (tappd_stub.py), the counting RPC proxy of rpc_calls.py in front
+of --rpc and a server process with fresh journal and index databases, then sends live
+TradingView-format webhooks in three scenarios:
+
+- steady: --steady-rate webhooks per second for --steady-duration seconds, spread over
+  --webhooks webhook IDs
+- candle_close: one webhook for each of --burst webhook IDs, all at once, as when many
+  alerts fire on the same candle close
+- duplicate_storm: --duplicates identical deliveries for each of --webhooks IDs at once,
+  as TradingView retries do
+
+After each scenario it waits until every alert is mined, then reports requests per second,
+p50/p99 webhook latency and RPC calls per distinct alert (background polling included).
+Needs a node with the contracts deployed; the server's master key is anvil's first dev
+account, served by the stand-in. The IP check only trusts X-Forwarded-For from 10.x/172.x
+peers, so --url must reach the server through such an address (see overload.py).
+
+    anvil --block-time 1 &
+    (cd ../contracts && forge script script/SetupAnvilEnvironment.s.sol --broadcast --rpc-url http://localhost:8545 \\
+        --private-key 0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80)
+    uv run python benchmarks/scenarios.py --contract 0x... --url http://10.77.0.1:3001
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import aiohttp
+
+from rpc_calls import PROXY_PORT, start_counting_proxy
+from tappd_stub import ANVIL_DEV_KEY, TAPPD_PORT, start_tappd_stub
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRADINGVIEW_IP = "52.89.214.238"
+
+
+def percentile_ms(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))] * 1000
+
+
+def start_server(rpc_url: str, tappd_url: str, contract: str, workdir: str, extra_env: Optional[dict] = None,
+                 log_name: str = "server.log") -> subprocess.Popen:
+    env = {
+        **os.environ,
+        **(extra_env or {}),
+        "RPC_URL": rpc_url,
+        "DSTACK_SIMULATOR_ENDPOINT": tappd_url,
+        "TEE_SECRET": os.getenv("TEE_SECRET", "bench"),
+        "JOURNAL_DB_PATH": os.path.join(workdir, "journal.db"),
+        "INDEXER_DB_PATH": os.path.join(workdir, "alerts.db")
+    }
+    if contract:
+        env["CONTRACT_ADDRESS"] = contract
+    log = open(os.path.join(workdir, log_name), "wb")
+    # In a session of its own, so crash() reaches the signing workers too
+    return subprocess.Popen([sys.executable, "main.py"], cwd=SERVER_DIR, env=env, stdout=log, stderr=subprocess.STDOUT,
+                            start_new_session=True)
+
+
+def crash(server: subprocess.Popen):
+    """SIGKILL a server started by start_server and every process it started, as when its container dies"""
+    try:
+        os.killpg(server.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    server.wait()
+
+
+async def wait_ready(session: aiohttp.ClientSession, url: str, server: subprocess.Popen, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with status {server.returncode}")
+        try:
+            async with session.get(f"{url}/status") as response:
+                if response.status == 200 and (await response.json())["blockchain"].get("connected"):
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError("Server did not become ready")
+
+
+async def wait_settled(session: aiohttp.ClientSession, url: str, timeout: float) -> bool:
+    """Wait until no alert is queued, in flight or waiting for its receipt"""
+    deadline = time.monotonic() + timeout
+    idle_polls = 0
+    while time.monotonic() < deadline:
+        async with session.get(f"{url}/status") as response:
+            status = await response.json()
+        busy = (status["admission"]["backlog"]
+                + sum(submitter["in_flight"] for submitter in status["blockchain"]["submitters"])
+                + status["blockchain"]["block_follower"]["watched_transactions"])
+        # Two idle polls in a row, so an alert between dispatch and broadcast is not missed
+        idle_polls = idle_polls + 1 if busy == 0 else 0
+        if idle_polls == 2:
+            return True
+        await asyncio.sleep(0.2)
+    return False
+
+
+async def send(session: aiohttp.ClientSession, url: str, webhook: dict, body: str, idempotency_key: Optional[str],
+               statuses: Counter, latencies: list[float]):
+    headers = {"X-Forwarded-For": TRADINGVIEW_IP}
+    if idempotency_key:
+        headers["Idempotency-Key"] = idempotency_key
+    start = time.perf_counter()
+    try:
+        async with session.post(f"{url}/webhook/{webhook['webhook_id']}", headers=headers, data=body) as response:
+            await response.read()
+            statuses[response.status] += 1
+    except aiohttp.ClientError:
+        statuses["error"] += 1
+        return
+    latencies.append(time.perf_counter() - start)
+
+
+async def steady(session, url, webhooks, args, statuses, latencies) -> int:
+    tasks = []
+    start = time.perf_counter()
+    for index in range(int(args.steady_rate * args.steady_duration)):
+        # Open loop: requests go out on schedule however long earlier ones take
+        await asyncio.sleep(max(0.0, start + index / args.steady_rate - time.perf_counter()))
+        webhook = webhooks[index % len(webhooks)]
+        body = webhook["buy_message" if (index // len(webhooks)) % 2 == 0 else "sell_message"]
+        tasks.append(asyncio.create_task(send(session, url, webhook, body, str(uuid.uuid4()), statuses, latencies)))
+    await asyncio.gather(*tasks)
+    return len(tasks)
+
+
+async def candle_close(session, url, webhooks, args, statuses, latencies) -> int:
+    await asyncio.gather(*(
+        send(session, url, webhook, webhook["buy_message"], None, statuses, latencies) for webhook in webhooks
+    ))
+    return len(webhooks)
+
+
+async def duplicate_storm(session, url, webhooks, args, statuses, latencies) -> int:
+    # Retries carry no Idempotency-Key, so the server recognises them by their body
+    await asyncio.gather(*(
+        send(session, url, webhook, webhook["sell_message"], None, statuses, latencies)
+        for _ in range(args.duplicates) for webhook in webhooks
+    ))
+    return len(webhooks)
+
+
+SCENARIOS = {"steady": steady, "candle_close": candle_close, "duplicate_storm": duplicate_storm}
+
+
+async def run_scenario(name: str, session: aiohttp.ClientSession, args, counts: Counter) -> dict:
+    count = args.burst if name == "candle_close" else args.webhooks
+    async with session.post(f"{args.url}/create-webhooks", params={"count": count}) as response:
+        webhooks = (await response.json())["webhooks"]
+
+    statuses: Counter = Counter()
+    latencies: list[float] = []
+    counts.clear()
+    start = time.perf_counter()
+    alerts = await SCENARIOS[name](session, args.url, webhooks, args, statuses, latencies)
+    elapsed = time.perf_counter() - start
+    settled = await wait_settled(session, args.url, args.settle_timeout)
+    calls = sum(counts.values())
+
+    final = Counter()
+    for webhook in webhooks:
+        async with session.get(f"{args.url}/alert/{webhook['webhook_id']}/submission") as response:
+            final[(await response.json()).get("status", "unknown") if response.status == 200 else "missing"] += 1
+
+    requests = sum(statuses.values())
+    return {
+        "requests": requests,
+        "alerts": alerts,
+        "requests_per_second": round(requests / elapsed, 1),
+        "p50_ms": round(percentile_ms(latencies, 50), 2),
+        "p99_ms": round(percentile_ms(latencies, 99), 2),
+        "rpc_calls_per_alert": round(calls / alerts, 2),
+        "settled": settled,
+        "statuses": {str(status): count for status, count in statuses.items()},
+        "final_statuses": dict(final)
+    }
+
+
+@asynccontextmanager
+async def local_server(args, counts: Counter, connections: int, extra_env: Optional[dict] = None):
+    """A server process behind the tappd stand-in and the counting proxy, and a session to it"""
+    proxy = await start_counting_proxy(args.rpc, counts)
+    tappd = await start_tappd_stub(TAPPD_PORT, args.master_key)
+    with tempfile.TemporaryDirectory(prefix="yeti-bench-") as workdir:
+        server = start_server(f"http://localhost:{PROXY_PORT}", f"http://localhost:{TAPPD_PORT}", args.contract, workdir,
+                              extra_env)
+        try:
+            async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=connections)) as session:
+                await wait_ready(session, args.url, server)
+                yield session
+        except Exception:
+            with open(os.path.join(workdir, "server.log")) as log:
+                print(log.read()[-4000:], file=sys.stderr)
+            raise
+        finally:
+            server.send_signal(signal.SIGINT)
+            try:
+                server.wait(15)
+            except subprocess.TimeoutExpired:
+                server.kill()
+            await tappd.cleanup()
+            await proxy.cleanup()
+
+
+async def run(args) -> dict:
+    counts: Counter = Counter()
+    results = {}
+    async with local_server(args, counts, max(args.burst, args.webhooks * args.duplicates)) as session:
+        for name in args.scenarios.split(","):
+            results[f"e2e.{name}"] = await run_scenario(name, session, args, counts)
+    return results
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--rpc", default="http://localhost:8545")
+    parser.add_argument("--contract", default=os.getenv("CONTRACT_ADDRESS"))
+    parser.add_argument("--master-key", default=os.getenv("PRIVATE_KEY", ANVIL_DEV_KEY))
+    parser.add_argument("--url", default="http://localhost:3001", help="where the started server is reached")
+    parser.add_argument("--settle-timeout", type=float, default=120)
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    add_server_arguments(parser)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--webhooks", type=int, default=50)
+    parser.add_argument("--steady-rate", type=float, default=20, help="webhooks per second")
+    parser.add_argument("--steady-duration", type=float, default=10)
+    parser.add_argument("--burst", type=int, default=200)
+    parser.add_argument("--duplicates", type=int, default=10)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    args = parser.parse_args()
+    print(json.dumps(await run(args), indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+"""Alerts per block with 1, 2, 4... submitter shards.
+
+Nodes only keep a bounded number of pending transactions per sender (geth's
+txpool.accountslots defaults to 16), so one account can get at most that many alerts
+into each block. This submits a burst of alerts through BlockchainManager with that
+cap applied per account (--account-slots) against a node producing blocks on a timer,
+once per shard count, and reports alerts per block and per second. Shard keys are
+derived from a fixed seed; the first run grants them SUBMITTER_ROLE and funds them
+from --private-key, which must own the oracle.
+
+    anvil --block-time 1 &
+    (cd ../contracts && forge script script/SetupAnvilEnvironment.s.sol --broadcast --rpc-url http://localhost:8545 \\
+        --private-key 0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80)
+    CONTRACT_ADDRESS=0x... TEE_SECRET=bench uv run python benchmarks/shard_throughput.py --shards 1,2,4 --alerts 400
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+from eth_utils import keccak
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain_utils import BlockchainManager
+
+ANVIL_DEV_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+
+async def run(private_key: str, shard_keys: list[str], alerts: int, account_slots: int) -> dict:
+    manager = BlockchainManager(private_key, shard_keys)
+    await manager.connect()
+    try:
+        slots = {submitter.index: asyncio.Semaphore(account_slots) for submitter in manager.active_submitters}
+
+        async def submit(index: int) -> dict:
+            webhook_id = str(uuid.uuid4())
+            async with slots[manager.submitter_for(webhook_id).index]:
+                return await manager.submit_alert_on_chain(webhook_id, {"action": ("buy", "sell")[index % 2]})
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(submit(index) for index in range(alerts)))
+        elapsed = time.perf_counter() - start
+        active = len(manager.active_submitters)
+    finally:
+        await manager.close()
+
+    succeeded = [result for result in results if result["success"]]
+    blocks = {result["block_number"] for result in succeeded}
+    return {
+        "active": active,
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "blocks": len(blocks),
+        "alerts_per_block": len(succeeded) / max(len(blocks), 1),
+        "alerts_per_second": len(succeeded) / elapsed
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shards", default="1,2,4", help="comma-separated shard counts to compare")
+    parser.add_argument("--alerts", type=int, default=400)
+    parser.add_argument("--account-slots", type=int, default=16, help="pending transactions allowed per account")
+    parser.add_argument("--private-key", default=os.getenv("PRIVATE_KEY", ANVIL_DEV_KEY))
+    args = parser.parse_args()
+
+    for shards in [int(count) for count in args.shards.split(",")]:
+        shard_keys = ["0x" + keccak(text=f"yeti-benchmark-shard-{index}").hex() for index in range(1, shards)]
+        result = await run(args.private_key, shard_keys, args.alerts, args.account_slots)
+        print(f"shards={shards} active={result['active']} succeeded={result['succeeded']} failed={result['failed']} "
+              f"blocks={result['blocks']} alerts_per_block={result['alerts_per_block']:.1f} "
+              f"alerts_per_second={result['alerts_per_second']:.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""Transaction signing throughput and event-loop lag.
+
+Signs a burst of prepared submitAlert transactions concurrently, as a burst of alerts
+would, with the signer in each mode: "inline" (on the event loop, as before the signer
+existed), "thread" and "process". Reports signatures per second and how late a 1 ms
+timer on the same loop fires while the burst is being signed (event-loop lag). Needs
+no node.
+
+    uv run python benchmarks/signing.py --alerts 1000 --workers 2
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+
+from eth_abi import encode
+from eth_account import Account
+from eth_utils import keccak
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("TEE_SECRET", "bench")
+
+from transaction_signer import TransactionSigner, native_backend
+
+ANVIL_DEV_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+SUBMIT_ALERT = keccak(text="submitAlert(bytes16,uint8)")[:4]
+
+
+def prepared_transactions(address: str, count: int) -> list[dict]:
+    return [
+        {
+            'from': address,
+            'to': "0x5FbDB2315678afecb367f032d93F642f64180aa3",
+            'data': "0x" + (SUBMIT_ALERT + encode(["bytes16", "uint8"], [uuid.uuid4().bytes, 2])).hex(),
+            'value': 0,
+            'gas': 80000,
+            'maxFeePerGas': 3 * 10**9,
+            'maxPriorityFeePerGas': 10**9,
+            'chainId': 31337,
+            'nonce': nonce
+        }
+        for nonce in range(count)
+    ]
+
+
+async def measure_lag(lags: list[float], stop: asyncio.Event, interval: float = 0.001):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def run(mode: str, workers: int, alerts: int) -> dict:
+    account = Account.from_key(ANVIL_DEV_KEY)
+    signer = TransactionSigner({account.address: ANVIL_DEV_KEY}, mode=mode, workers=workers)
+    await signer.start()
+    transactions = prepared_transactions(account.address, alerts)
+    lags: list[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(measure_lag(lags, stop))
+    await asyncio.sleep(0.01)
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(signer.sign(transaction) for transaction in transactions))
+        elapsed = time.perf_counter() - start
+    finally:
+        stop.set()
+        await probe
+        await signer.close()
+
+    lags_ms = sorted(lag * 1000 for lag in lags)
+    return {
+        "signatures_per_second": alerts / elapsed,
+        "lag_p50_ms": statistics.median(lags_ms),
+        "lag_p99_ms": lags_ms[int(len(lags_ms) * 0.99)],
+        "lag_max_ms": lags_ms[-1]
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alerts", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--modes", default="inline,thread,process")
+    args = parser.parse_args()
+
+    print(f"secp256k1 backend: {'coincurve' if native_backend() else 'pure Python'}")
+    for mode in args.modes.split(","):
+        result = await run(mode, args.workers, args.alerts)
+        print(f"{mode:8} {result['signatures_per_second']:8.0f} signatures/s  loop lag p50 {result['lag_p50_ms']:.2f} ms, "
+              f"p99 {result['lag_p99_ms']:.2f} ms, max {result['lag_max_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
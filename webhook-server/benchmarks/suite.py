@@ -0,0 +1,132 @@
+"""Benchmark suite: microbenchmarks and end-to-end scenarios compared against a baseline.
+
+Runs micro.py in-process and, with --layers including e2e, the load scenarios of
+scenarios.py against a local node, writes the results to --output as JSON and compares
+them with --baseline. Latency and RPC calls per alert regress when they grow by more than
+--tolerance, calls and requests per second when they drop by more than it; any regression
+makes the exit status 1. --save-baseline stores the run as the new baseline instead.
+Baselines are only comparable on the machine and node setup they were recorded with.
+
+    uv run python benchmarks/suite.py                      # micro only, compare
+    uv run python benchmarks/suite.py --layers micro,e2e --contract 0x... --url http://10.77.0.1:3001
+    uv run python benchmarks/suite.py --save-baseline      # record a new baseline
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import micro
+import scenarios
+from transaction_signer import native_backend
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# Metrics compared against the baseline: +1 if higher is better, -1 if lower is better
+DIRECTIONS = {
+    "ops_per_second": 1,
+    "requests_per_second": 1,
+    "p50_us": -1,
+    "p99_us": -1,
+    "p50_ms": -1,
+    "p99_ms": -1,
+    "rpc_calls_per_alert": -1
+}
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=scenarios.SERVER_DIR).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "secp256k1": "coincurve" if native_backend() else "pure Python"
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[dict]:
+    rows = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            previous = baseline.get(name, {}).get(metric)
+            direction = DIRECTIONS.get(metric)
+            if direction is None or not previous:
+                continue
+            change = (value - previous) / previous
+            rows.append({
+                "benchmark": name,
+                "metric": metric,
+                "baseline": previous,
+                "current": value,
+                "change": round(change, 4),
+                "regression": change * direction < -tolerance
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--layers", default="micro", help="comma-separated: micro, e2e")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative change before a regression")
+    parser.add_argument("--round-ms", type=float, default=50, help="micro: minimum duration of a round")
+    parser.add_argument("--repeat", type=int, default=20, help="micro: rounds per function")
+    scenarios.add_arguments(parser)
+    args = parser.parse_args()
+
+    layers = args.layers.split(",")
+    results = {}
+    if "micro" in layers:
+        results.update(micro.run(args.round_ms, args.repeat))
+    if "e2e" in layers:
+        results.update(asyncio.run(scenarios.run(args)))
+    report = {"environment": environment(), "results": results}
+
+    if args.save_baseline:
+        # Keep the other layer's entries when only one layer was re-run
+        previous = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                previous = json.load(file)["results"]
+        report["results"] = {**previous, **results}
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        report["baseline"] = baseline["environment"]
+        report["comparison"] = compare(results, baseline["results"], args.tolerance)
+    else:
+        report["comparison"] = []
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+        file.write("\n")
+
+    for name, metrics in results.items():
+        summary = ", ".join(f"{metric}={value}" for metric, value in metrics.items() if metric in DIRECTIONS)
+        print(f"{name:40} {summary}")
+    regressions = [row for row in report["comparison"] if row["regression"]]
+    for row in regressions:
+        print(f"REGRESSION {row['benchmark']} {row['metric']}: {row['baseline']} -> {row['current']} "
+              f"({row['change']:+.1%})")
+    print(f"{len(report['comparison'])} metrics compared, {len(regressions)} regressions; results in {args.output}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
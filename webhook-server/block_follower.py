@@ -0,0 +1,226 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Callable, Optional
+from hexbytes import HexBytes
+from web3 import AsyncWeb3
+from web3.exceptions import TransactionNotFound, Web3RPCError
+from contract_config import RECEIPT_POLL_INTERVAL, RECEIPT_REORG_DEPTH
+
+logger = logging.getLogger(__name__)
+
+class FollowedBlock:
+    """A block on the followed chain and the watched transactions resolved from it"""
+
+    def __init__(self, block):
+        self.number: int = block['number']
+        self.hash = HexBytes(block['hash'])
+        self.tx_hashes = set(block['transactions'])
+        self.mined: set[HexBytes] = set()
+
+class ReceiptWatch:
+    def __init__(self, tx_hashes: list[HexBytes]):
+        # Kept by reference, so versions added to the list later are watched too
+        self.tx_hashes = tx_hashes
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def resolve(self, receipt, tx_hash: HexBytes):
+        if not self.future.done():
+            self.future.set_result((receipt, tx_hash))
+
+class BlockFollower:
+    """Resolves receipts for every in-flight transaction from one pass over each new block.
+
+    The latest block is polled every RECEIPT_POLL_INTERVAL seconds and blocks skipped since
+    the last poll are fetched by number, so each block is read once. Only blocks holding a
+    watched transaction cost a second call: their receipts are fetched with
+    eth_getBlockReceipts, or with one batched eth_getTransactionReceipt request on nodes
+    without it. Confirmation RPC calls therefore grow with blocks, not with transactions.
+
+    The last RECEIPT_REORG_DEPTH blocks are remembered by hash. A new block that does not
+    extend them is walked back to where the chains meet, and reorg listeners are called
+    with the transactions that had been mined in the dropped blocks.
+    """
+
+    def __init__(self, w3: AsyncWeb3):
+        self.w3 = w3
+        self._blocks: OrderedDict[int, FollowedBlock] = OrderedDict()
+        self._watches: list[ReceiptWatch] = []
+        # Followed blocks to look through again for transactions watched after they were mined
+        self._rescan: set[int] = set()
+        self._reorg_listeners: list[Callable[[list[HexBytes]], None]] = []
+        self._block_receipts = True
+        self._task: Optional[asyncio.Task] = None
+        self.reorgs = 0
+
+    @property
+    def head(self) -> Optional[int]:
+        return next(reversed(self._blocks)) if self._blocks else None
+
+    async def start(self):
+        await self._poll()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for watch in self._watches:
+            watch.future.cancel()
+        self._watches = []
+
+    def add_reorg_listener(self, listener: Callable[[list[HexBytes]], None]):
+        """Register a callback invoked with the transactions a reorg removed from the chain"""
+        self._reorg_listeners.append(listener)
+
+    def stats(self) -> dict:
+        return {
+            "head": self.head,
+            "watched_transactions": len(self._watches),
+            "reorgs": self.reorgs,
+            "block_receipts": self._block_receipts
+        }
+
+    async def wait(self, tx_hashes: list[HexBytes], timeout: float) -> Optional[tuple[dict, HexBytes]]:
+        """Receipt of whichever of tx_hashes is mined first, or None after timeout seconds"""
+        watch = ReceiptWatch(tx_hashes)
+        self._watches.append(watch)
+        # Mined in a block followed before the watch existed: picked up on the next poll
+        self._rescan.update(block.number for block in self._blocks.values() if not block.tx_hashes.isdisjoint(tx_hashes))
+        try:
+            return await asyncio.wait_for(watch.future, timeout)
+        except asyncio.TimeoutError:
+            # Last look in case the follower fell behind or lost its node
+            return await self._lookup(tx_hashes)
+        finally:
+            self._watches.remove(watch)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(RECEIPT_POLL_INTERVAL)
+            try:
+                await self._poll()
+            except Exception as e:
+                logger.warning(f"Block follower failed to advance from {self.head}: {e}")
+
+    async def _poll(self):
+        await self._follow()
+        for number in sorted(self._rescan):
+            block = self._blocks.get(number)
+            if block is not None:
+                await self._resolve(block)
+            self._rescan.discard(number)
+
+    async def _follow(self):
+        latest = await self.w3.eth.get_block('latest')
+        known = self._blocks.get(latest['number'])
+        if known is not None and known.hash == latest['hash']:
+            return
+        if self._blocks and latest['number'] < next(iter(self._blocks)):
+            # An endpoint that is behind; the pool moves on from it
+            return
+        if not self._blocks or latest['number'] - self.head > RECEIPT_REORG_DEPTH:
+            await self._restart(latest)
+            return
+
+        # Walk back from the new head until it joins a followed block, fetching the blocks
+        # skipped since the last poll; followed blocks above the join were reorged out
+        chain = [latest]
+        oldest = next(iter(self._blocks))
+        while True:
+            parent = self._blocks.get(chain[-1]['number'] - 1)
+            if parent is not None and parent.hash == chain[-1]['parentHash']:
+                break
+            if chain[-1]['number'] - 1 < oldest:
+                # Which followed blocks survived is unknown, so report all of them as dropped
+                logger.warning(f"Reorg deeper than {RECEIPT_REORG_DEPTH} blocks at block {latest['number']}")
+                self._drop_above(oldest - 1)
+                await self._restart(latest)
+                return
+            chain.append(await self.w3.eth.get_block(chain[-1]['number'] - 1))
+
+        self._drop_above(chain[-1]['number'] - 1)
+        for block in reversed(chain):
+            await self._add(block)
+
+    async def _restart(self, latest):
+        """Start over from latest when the followed blocks no longer lead up to it"""
+        self._blocks.clear()
+        for watch in list(self._watches):
+            mined = await self._lookup(watch.tx_hashes)
+            if mined is not None:
+                watch.resolve(*mined)
+        await self._add(latest)
+
+    async def _add(self, block):
+        followed = FollowedBlock(block)
+        await self._resolve(followed)
+        self._blocks[followed.number] = followed
+        while len(self._blocks) > RECEIPT_REORG_DEPTH:
+            self._blocks.popitem(last=False)
+
+    async def _resolve(self, block: FollowedBlock):
+        """Fetch the receipts of the watched transactions in block and hand them out"""
+        watched = [tx_hash for watch in self._watches for tx_hash in watch.tx_hashes if tx_hash in block.tx_hashes]
+        if not watched:
+            return
+        receipts = await self._receipts(block, watched)
+        for watch in self._watches:
+            for tx_hash in watch.tx_hashes:
+                if tx_hash in receipts:
+                    watch.resolve(receipts[tx_hash], tx_hash)
+                    block.mined.add(tx_hash)
+                    break
+
+    def _drop_above(self, number: int):
+        if not self._blocks or self.head <= number:
+            return
+        dropped = []
+        while self._blocks and self.head > number:
+            _, block = self._blocks.popitem()
+            dropped.extend(block.mined)
+        self.reorgs += 1
+        logger.warning(f"Reorg above block {number} dropped {len(dropped)} mined transactions")
+        if not dropped:
+            return
+        for listener in self._reorg_listeners:
+            try:
+                listener(dropped)
+            except Exception as e:
+                logger.error(f"Reorg listener failed: {e}")
+
+    async def _receipts(self, block: FollowedBlock, tx_hashes: list[HexBytes]) -> dict:
+        if self._block_receipts:
+            try:
+                receipts = await self.w3.eth.get_block_receipts(block.hash)
+                return {HexBytes(receipt['transactionHash']): receipt for receipt in receipts}
+            except Web3RPCError as e:
+                if not _unsupported(e):
+                    raise
+                logger.info(f"eth_getBlockReceipts not supported, batching eth_getTransactionReceipt instead: {e}")
+                self._block_receipts = False
+        async with self.w3.batch_requests() as batch:
+            for tx_hash in tx_hashes:
+                batch.add(self.w3.eth.get_transaction_receipt(tx_hash))
+            receipts = await batch.async_execute()
+        return {HexBytes(receipt['transactionHash']): receipt for receipt in receipts if receipt}
+
+    async def _lookup(self, tx_hashes: list[HexBytes]) -> Optional[tuple[dict, HexBytes]]:
+        for tx_hash in list(tx_hashes):
+            try:
+                receipt = await self.w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                continue
+            block = self._blocks.get(receipt['blockNumber'])
+            if block is not None and block.hash == receipt['blockHash']:
+                block.mined.add(tx_hash)
+            return receipt, tx_hash
+        return None
+
+def _unsupported(error: Web3RPCError) -> bool:
+    rpc_error = (error.rpc_response or {}).get('error') or {}
+    message = str(rpc_error.get('message', error)).lower()
+    return rpc_error.get('code') == -32601 or any(
+        phrase in message for phrase in ("method not found", "does not exist", "not supported", "unsupported")
+    )
@@ -1,92 +1,210 @@
 import uuid
+import asyncio
 import logging
-from web3 import Web3
-from eth_account import Account
+from typing import Optional
+import aiohttp
+from web3 import AsyncWeb3
+from web3.logs import DISCARD
+from hexbytes import HexBytes
 from contract_config import (
     WEBHOOK_ORACLE_ABI, 
     CONTRACT_ADDRESS, 
-    RPC_URL,
+    RPC_URLS,
+    RPC_POOL_SIZE,
+    STUCK_TX_TIMEOUT,
+    MAX_FEE_REPLACEMENTS,
     Action,
     ACTION_MAPPING
 )
+from block_follower import BlockFollower
+from fee_oracle import FeeOracle
+from metrics import stage, startup_profile
+from nonce_manager import is_already_known, is_nonce_error
+from rpc_pool import RpcPool
+from submitter_shards import ShardFunder, ShardRing, Submitter
+from transaction_signer import TransactionSigner
 
 logger = logging.getLogger(__name__)
 
+def action_from_payload(payload: dict) -> int:
+    """Oracle action of an alert payload; needs no connection, so ingest workers use it too"""
+    action_str = (
+        payload.get("action", "") or 
+        payload.get("side", "") or 
+        payload.get("signal", "") or
+        payload.get("order", "")
+    ).lower()
+    return ACTION_MAPPING.get(action_str, Action.NONE)
+
+class PendingTransaction:
+    """A broadcast transaction and every version of it sent since with the same nonce"""
+
+    def __init__(self, transaction: dict, tx_hash: HexBytes):
+        self.transaction = transaction
+        self.tx_hashes = [tx_hash]
+        # Serializes fee bumps and content replacements for this nonce
+        self.lock = asyncio.Lock()
+
+    @property
+    def nonce(self) -> int:
+        return self.transaction['nonce']
+
+    def add_version(self, transaction: dict, tx_hash: HexBytes):
+        self.transaction = transaction
+        self.tx_hashes.append(tx_hash)
+
 class BlockchainManager:
-    def __init__(self, private_key: str = None):
+    def __init__(self, private_key: str = None, shard_keys: Optional[list[str]] = None):
         if not CONTRACT_ADDRESS or CONTRACT_ADDRESS == "0x0000000000000000000000000000000000000000":
             raise ValueError("CONTRACT_ADDRESS not set")
         
-        self.w3 = Web3(Web3.HTTPProvider(RPC_URL))
-        if not self.w3.is_connected():
-            raise ConnectionError(f"Failed to connect to blockchain at {RPC_URL}")
-        
-        self.private_key = private_key
-        self.account = None
-        if private_key:
-            self.account = Account.from_key(private_key)
-            logger.info(f"Account initialized: {self.account.address}")
+        self.provider = RpcPool(RPC_URLS)
+        self.w3 = AsyncWeb3(self.provider)
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.chain_id: Optional[int] = None
         
         self.contract = self.w3.eth.contract(
             address=CONTRACT_ADDRESS,
             abi=WEBHOOK_ORACLE_ABI
         )
+        self.block_follower = BlockFollower(self.w3)
+        
+        self.private_key = None
+        self.account = None
+        self.nonce_manager = None
+        self.submitters: list[Submitter] = []
+        self._submitters_by_address: dict[str, Submitter] = {}
+        self._ring: Optional[ShardRing] = None
+        self.shard_funder = None
+        self.signer = None
+        self.fee_oracle = None
+        if private_key:
+            self.add_submitters(private_key, shard_keys)
+    
+    def add_submitters(self, private_key: str, shard_keys: Optional[list[str]] = None):
+        """Set up the submitting accounts before connect(); the RPC connection can be opened
+        while their keys are still being derived"""
+        self.private_key = private_key
+        # Shard 0 is the master key; extra shard keys spread alerts over more accounts
+        self.submitters = [
+            Submitter(self.w3, key, index) for index, key in enumerate([private_key, *(shard_keys or [])])
+        ]
+        self.account = self.submitters[0].account
+        self.nonce_manager = self.submitters[0].nonce_manager
+        logger.info(f"Account initialized: {self.account.address}")
+        self._submitters_by_address = {submitter.address: submitter for submitter in self.submitters}
+        self.shard_funder = ShardFunder(self) if len(self.submitters) > 1 else None
+        self.signer = TransactionSigner({submitter.address: submitter.private_key for submitter in self.submitters})
+        self.fee_oracle = FeeOracle(self.w3, self.contract, self.account.address)
+    
+    async def open(self):
+        """Open the pooled HTTP session shared by all RPC calls, verify an endpoint answers and
+        open a connection to every other endpoint too"""
+        if self.session is not None:
+            return
+        connector = aiohttp.TCPConnector(limit=RPC_POOL_SIZE, keepalive_timeout=30)
+        self.session = aiohttp.ClientSession(connector=connector)
+        await self.provider.cache_async_session(self.session)
+        
+        with startup_profile.phase("rpc"):
+            if not await self.w3.is_connected():
+                await self.close()
+                raise ConnectionError(f"Failed to connect to blockchain at {', '.join(RPC_URLS)}")
+            self.provider.start()
+            self.chain_id, _ = await asyncio.gather(self.w3.eth.chain_id, self.provider.warm_up())
+    
+    async def connect(self):
+        """Open the RPC connections and start the signer pool and background services"""
+        await self.open()
+        # Worker processes start while the fee oracle and block follower make their first calls;
+        # all three finish before a failure is raised, so close() finds nothing half started
+        results = await asyncio.gather(
+            *([startup_profile.timed("signer_pool", self.signer.start())] if self.signer else []),
+            *([startup_profile.timed("fee_oracle", self.fee_oracle.start())] if self.fee_oracle else []),
+            startup_profile.timed("block_follower", self.block_follower.start()),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        # Shard setup sends admin transactions, which need the fee oracle
+        if self.shard_funder:
+            await startup_profile.timed("shard_funder", self.shard_funder.start())
+        if self.submitters:
+            self._ring = ShardRing(self.active_submitters)
     
-    def get_account_balance(self) -> dict:
+    async def close(self):
+        if self.signer:
+            await self.signer.close()
+        if self.shard_funder:
+            await self.shard_funder.stop()
+        if self.fee_oracle:
+            await self.fee_oracle.stop()
+        await self.block_follower.stop()
+        await self.provider.stop()
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+    
+    async def get_account_balance(self) -> dict:
         try:
             if not self.account:
                 return {"error": "Account not initialized"}
             
-            balance_wei = self.w3.eth.get_balance(self.account.address)
+            balance_wei = await self.w3.eth.get_balance(self.account.address)
             balance_eth = self.w3.from_wei(balance_wei, 'ether')
             
             return {
                 "address": self.account.address,
                 "balance_eth": str(balance_eth),
-                "connected": self.w3.is_connected(),
-                "chain_id": self.w3.eth.chain_id,
-                "latest_block": self.w3.eth.block_number
+                "connected": await self.w3.is_connected(),
+                "chain_id": self.chain_id,
+                "latest_block": await self.w3.eth.block_number,
+                "rpc_endpoints": self.provider.stats(),
+                "block_follower": self.block_follower.stats(),
+                "submitters": [submitter.to_dict() for submitter in self.submitters]
             }
         except Exception as e:
             return {"error": str(e)}
 
+    @property
+    def active_submitters(self) -> list[Submitter]:
+        return [submitter for submitter in self.submitters if submitter.active]
+
+    def submitter_for(self, webhook_id: str) -> Submitter:
+        """The shard account that sends every alert for this webhook ID"""
+        if self._ring is None:
+            return self.submitters[0]
+        return self._ring.get(webhook_id)
+
+    def _submitter_of(self, transaction: dict) -> Submitter:
+        return self._submitters_by_address[transaction['from']]
+
+    def submitter_at(self, address: str) -> Optional[Submitter]:
+        return self._submitters_by_address.get(address)
+
     def uuid_to_bytes16(self, uuid_str: str) -> bytes:
         return uuid.UUID(uuid_str).bytes
 
     def action_from_payload(self, payload: dict) -> int:
-        action_str = (
-            payload.get("action", "") or 
-            payload.get("side", "") or 
-            payload.get("signal", "") or
-            payload.get("order", "")
-        ).lower()
-        return ACTION_MAPPING.get(action_str, Action.NONE)
+        return action_from_payload(payload)
 
     async def submit_alert_on_chain(self, webhook_id: str, payload: dict) -> dict:
         if not self.account or not self.private_key:
             return {"success": False, "error": "Account not initialized", "alert_id": webhook_id}
         
         try:
-            alert_id_bytes = self.uuid_to_bytes16(webhook_id)
             action = self.action_from_payload(payload)
             
-            logger.info(f"Submitting alert: {self._action_to_name(action)} for {webhook_id}")
-            
-            transaction = self.contract.functions.submitAlert(
-                alert_id_bytes, action
-            ).build_transaction({
-                'from': self.account.address,
-                'nonce': self.w3.eth.get_transaction_count(self.account.address),
-            })
+            logger.info("Submitting alert: %s for %s", self._action_to_name(action), webhook_id)
             
-            signed_txn = self.w3.eth.account.sign_transaction(transaction, self.private_key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=60)
+            transaction, tx_hash = await self.broadcast_alert(webhook_id, action)
+            receipt, tx_hash = await self.wait_for_receipt(transaction, tx_hash)
             
             if receipt.status != 1:
                 raise Exception(f"Transaction failed: {tx_hash.hex()}")
             
-            logger.info(f"Alert submitted: {tx_hash.hex()}")
+            logger.info("Alert submitted: %s", tx_hash.hex())
             
             return {
                 "success": True,
@@ -106,24 +224,180 @@ class BlockchainManager:
                 "alert_id": webhook_id
             }
 
+    async def broadcast_alert(self, webhook_id: str, action: int) -> tuple[dict, HexBytes]:
+        """Sign and broadcast a submitAlert transaction without waiting for it to be mined"""
+        contract_function = self.contract.functions.submitAlert(self.uuid_to_bytes16(webhook_id), action)
+        return await self._send_transaction(contract_function, self.submitter_for(webhook_id))
+
+    async def broadcast_alerts(self, webhook_ids: list[str], actions: list[int]) -> tuple[dict, HexBytes]:
+        """Sign and broadcast one submitAlerts transaction carrying several alerts of the same shard"""
+        alert_ids = [self.uuid_to_bytes16(webhook_id) for webhook_id in webhook_ids]
+        contract_function = self.contract.functions.submitAlerts(alert_ids, actions)
+        return await self._send_transaction(contract_function, self.submitter_for(webhook_ids[0]),
+                                            alert_count=len(alert_ids))
+
+    async def replace_alerts(self, pending: PendingTransaction, webhook_ids: list[str], actions: list[int]) -> HexBytes:
+        """Replace a broadcast, unmined transaction with one carrying different alerts.
+
+        The replacement reuses the nonce with fees bumped past the previous version (and
+        at least the current fees), so whichever version is mined the nonce is spent once.
+        """
+        alert_count = None
+        if len(webhook_ids) == 1:
+            contract_function = self.contract.functions.submitAlert(self.uuid_to_bytes16(webhook_ids[0]), actions[0])
+        else:
+            alert_ids = [self.uuid_to_bytes16(webhook_id) for webhook_id in webhook_ids]
+            contract_function = self.contract.functions.submitAlerts(alert_ids, actions)
+            alert_count = len(alert_ids)
+        
+        async with pending.lock:
+            params = await self._transaction_params(self._submitter_of(pending.transaction), alert_count)
+            bumped = self._bump_fees(pending.transaction)
+            for field in ('gasPrice', 'maxFeePerGas', 'maxPriorityFeePerGas'):
+                if field in params:
+                    params[field] = max(params[field], bumped.get(field, 0))
+            transaction = await contract_function.build_transaction(dict(params, nonce=pending.nonce))
+            tx_hash = await self._sign_and_send(transaction)
+            pending.add_version(transaction, tx_hash)
+        return tx_hash
+
+    async def _transaction_params(self, submitter: Submitter, alert_count: Optional[int] = None) -> dict:
+        """Chain ID, fees and gas limit from the connection and fee oracle caches, without RPC calls"""
+        params = {
+            'from': submitter.address,
+            'chainId': self.chain_id,
+            **await self.fee_oracle.fee_fields()
+        }
+        gas = await self.fee_oracle.gas_limit(alert_count)
+        if gas is not None:
+            params['gas'] = gas
+        return params
+
+    async def _send_transaction(self, contract_function, submitter: Submitter, alert_count: Optional[int] = None,
+                                max_attempts: int = 3) -> tuple[dict, HexBytes]:
+        """Sign and broadcast with a nonce allocated locally for the submitter, resyncing on nonce errors"""
+        params = await self._transaction_params(submitter, alert_count)
+        nonce_manager = submitter.nonce_manager
+        
+        last_error = None
+        for _ in range(max_attempts):
+            with stage("nonce_fetch"):
+                nonce = await nonce_manager.allocate()
+            try:
+                transaction = await contract_function.build_transaction(dict(params, nonce=nonce))
+                tx_hash = await self._sign_and_send(transaction)
+                return transaction, tx_hash
+            except Exception as e:
+                if not is_nonce_error(e):
+                    await nonce_manager.release(nonce)
+                    raise
+                logger.warning(f"Nonce {nonce} rejected ({e}), resyncing")
+                nonce_manager.confirm(nonce)
+                await nonce_manager.resync()
+                last_error = e
+        raise last_error
+
+    async def send_admin_transaction(self, transaction: dict) -> dict:
+        """Send a one-off transaction (role grant, shard top-up) from the master account and wait for its receipt"""
+        submitter = self.submitters[0]
+        transaction = {
+            'from': submitter.address,
+            'chainId': self.chain_id,
+            **await self.fee_oracle.fee_fields(),
+            **transaction
+        }
+        transaction['gas'] = await self.w3.eth.estimate_gas(transaction)
+        transaction['nonce'] = await submitter.nonce_manager.allocate()
+        try:
+            tx_hash = await self._sign_and_send(transaction)
+        except Exception:
+            await submitter.nonce_manager.release(transaction['nonce'])
+            raise
+        receipt, _ = await self.wait_for_receipt(transaction, tx_hash)
+        return receipt
+
+    async def _sign_and_send(self, transaction: dict) -> HexBytes:
+        with stage("sign"):
+            raw_transaction, tx_hash = await self.signer.sign(transaction)
+        with stage("broadcast"):
+            try:
+                return await self.w3.eth.send_raw_transaction(raw_transaction)
+            except Exception as e:
+                # The node has this very transaction (e.g. an endpoint that timed out took it and
+                # gossiped it): it is broadcast, and sending it again at a new nonce would submit it twice
+                if not is_already_known(e):
+                    raise
+                logger.info("Transaction %s already known to the node", tx_hash.hex())
+                return tx_hash
+
+    async def wait_for_receipt(self, transaction: dict, tx_hash: HexBytes,
+                               pending: Optional[PendingTransaction] = None) -> tuple[dict, HexBytes]:
+        """Wait for any broadcast version of the transaction to be mined.
+
+        Receipts come from the block follower. If nothing is mined within STUCK_TX_TIMEOUT the
+        latest version is re-signed with the same nonce and bumped fees, up to
+        MAX_FEE_REPLACEMENTS times. Pass a PendingTransaction to also pick up versions sent
+        by replace_alerts while waiting.
+        """
+        pending = pending or PendingTransaction(transaction, tx_hash)
+        nonce = pending.nonce
+        nonce_manager = self._submitter_of(pending.transaction).nonce_manager
+        with stage("receipt_wait"):
+            try:
+                for replacement in range(MAX_FEE_REPLACEMENTS + 1):
+                    mined = await self.block_follower.wait(pending.tx_hashes, STUCK_TX_TIMEOUT)
+                    if mined is not None:
+                        return mined
+                    if replacement == MAX_FEE_REPLACEMENTS:
+                        break
+                    
+                    # A stuck transaction may be waiting behind a gap left by a lost one
+                    await nonce_manager.resync()
+                    async with pending.lock:
+                        transaction = self._bump_fees(pending.transaction)
+                        logger.warning(f"Transaction {pending.tx_hashes[-1].hex()} stuck at nonce {nonce}, replacing with higher fees")
+                        try:
+                            pending.add_version(transaction, await self._sign_and_send(transaction))
+                        except Exception as e:
+                            # "nonce too low" here means one of the earlier versions was just mined
+                            if not is_nonce_error(e):
+                                raise
+                raise TimeoutError(f"Transaction {tx_hash.hex()} not mined after {MAX_FEE_REPLACEMENTS} fee replacements")
+            finally:
+                nonce_manager.confirm(nonce)
+
+    @staticmethod
+    def _bump_fees(transaction: dict, bump_percent: int = 20) -> dict:
+        # Nodes require at least a 10% bump to accept a replacement for the same nonce
+        bumped = dict(transaction)
+        for field in ('gasPrice', 'maxFeePerGas', 'maxPriorityFeePerGas'):
+            if field in bumped:
+                bumped[field] = bumped[field] * (100 + bump_percent) // 100
+        return bumped
+
+    def alert_nonces(self, receipt) -> dict[str, int]:
+        """Nonce of each alert in the receipt's AlertSubmitted events, by webhook ID"""
+        events = self.contract.events.AlertSubmitted().process_receipt(receipt, errors=DISCARD)
+        return {str(uuid.UUID(bytes=event['args']['alertId'])): event['args']['nonce'] for event in events}
+
     def _action_to_name(self, action: int) -> str:
         return {Action.NONE: "NONE", Action.SHORT: "SHORT", Action.LONG: "LONG"}.get(action, "UNKNOWN")
 
     async def get_alert_from_chain(self, webhook_id: str) -> dict:
         """Retrieve alert data from smart contract"""
-        logger.info(f"Retrieving alert from blockchain for webhook_id: {webhook_id}")
+        logger.info("Retrieving alert from blockchain for webhook_id: %s", webhook_id)
         
         try:
             alert_id_bytes = self.uuid_to_bytes16(webhook_id)
             
             # Call contract view function
-            result = self.contract.functions.getAlert(alert_id_bytes).call()
+            result = await self.contract.functions.getAlert(alert_id_bytes).call()
             
             # Parse result tuple (alertId, timestamp, action, nonce)
             _, timestamp, action, nonce = result
             
             exists = timestamp > 0
-            logger.info(f"Alert retrieved: exists={exists}, timestamp={timestamp}, action={self._action_to_name(action)}")
+            logger.info("Alert retrieved: exists=%s, timestamp=%s, action=%s", exists, timestamp, self._action_to_name(action))
             
             return {
                 "success": True,
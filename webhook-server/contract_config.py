@@ -10,6 +10,16 @@ WEBHOOK_ORACLE_ABI = [
         "outputs": [],
         "stateMutability": "nonpayable"
     },
+    {
+        "type": "function",
+        "name": "submitAlerts",
+        "inputs": [
+            {"name": "_alertIds", "type": "bytes16[]"},
+            {"name": "_actions", "type": "uint8[]"}
+        ],
+        "outputs": [],
+        "stateMutability": "nonpayable"
+    },
     {
         "type": "function", 
         "name": "getAlert",
@@ -28,23 +38,239 @@ WEBHOOK_ORACLE_ABI = [
         ],
         "stateMutability": "view"
     },
+    {
+        "type": "function",
+        "name": "addAuthorizedSubmitter",
+        "inputs": [{"name": "_submitter", "type": "address"}],
+        "outputs": [],
+        "stateMutability": "nonpayable"
+    },
+    {
+        "type": "function",
+        "name": "hasAnyRole",
+        "inputs": [
+            {"name": "user", "type": "address"},
+            {"name": "roles", "type": "uint256"}
+        ],
+        "outputs": [{"name": "", "type": "bool"}],
+        "stateMutability": "view"
+    },
+    {
+        "type": "function",
+        "name": "owner",
+        "inputs": [],
+        "outputs": [{"name": "result", "type": "address"}],
+        "stateMutability": "view"
+    },
+    {
+        "type": "function",
+        "name": "SUBMITTER_ROLE",
+        "inputs": [],
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view"
+    },
     {
         "type": "event",
         "name": "AlertSubmitted",
         "inputs": [
             {"name": "alertId", "type": "bytes16", "indexed": True},
             {"name": "action", "type": "uint8", "indexed": False},
-            {"name": "timestamp", "type": "uint32", "indexed": False}
+            {"name": "timestamp", "type": "uint32", "indexed": False},
+            {"name": "nonce", "type": "uint32", "indexed": False}
         ],
         "anonymous": False
     }
 ]
 
 CONTRACT_ADDRESS = os.getenv("CONTRACT_ADDRESS", "0x0000000000000000000000000000000000000000")
+# One or more comma-separated RPC endpoints. Reads go to the fastest healthy endpoint,
+# signed transactions are broadcast to all healthy endpoints in parallel.
 RPC_URL = os.getenv("RPC_URL", "http://localhost:8545")
+RPC_URLS = [url.strip() for url in RPC_URL.split(",") if url.strip()]
+# Max concurrent keep-alive connections to the RPC node shared by all in-flight alerts
+RPC_POOL_SIZE = int(os.getenv("RPC_POOL_SIZE", "100"))
+# Seconds before a request to one endpoint is abandoned and retried on the next
+RPC_REQUEST_TIMEOUT = float(os.getenv("RPC_REQUEST_TIMEOUT", "5"))
+# How often every endpoint is probed for latency and head block
+RPC_PROBE_INTERVAL = float(os.getenv("RPC_PROBE_INTERVAL", "5"))
+# Endpoints further behind the best known head are skipped for reads
+RPC_MAX_BLOCK_LAG = int(os.getenv("RPC_MAX_BLOCK_LAG", "3"))
+# Circuit breaker: consecutive failures before an endpoint is taken out of rotation, and
+# the initial/maximum time it stays out (doubling each time it trips again)
+RPC_BREAKER_THRESHOLD = int(os.getenv("RPC_BREAKER_THRESHOLD", "3"))
+RPC_BREAKER_BACKOFF = float(os.getenv("RPC_BREAKER_BACKOFF", "1"))
+RPC_BREAKER_MAX_BACKOFF = float(os.getenv("RPC_BREAKER_MAX_BACKOFF", "60"))
+# Seconds before an unmined transaction is replaced with higher fees, and how often to do so
+STUCK_TX_TIMEOUT = float(os.getenv("STUCK_TX_TIMEOUT", "20"))
+MAX_FEE_REPLACEMENTS = int(os.getenv("MAX_FEE_REPLACEMENTS", "2"))
+# Receipts are reconciled per block: the head is polled every RECEIPT_POLL_INTERVAL
+# seconds and the receipts of each new block holding a broadcast alert are fetched once.
+# Alerts stay watched for reorgs for RECEIPT_REORG_DEPTH blocks after being mined.
+RECEIPT_POLL_INTERVAL = float(os.getenv("RECEIPT_POLL_INTERVAL", "0.5"))
+RECEIPT_REORG_DEPTH = int(os.getenv("RECEIPT_REORG_DEPTH", "12"))
+# Transaction parameters are prepared off the hot path: fees are refreshed when the head
+# block changes (polled every FEE_REFRESH_INTERVAL seconds) and gas limits are estimated
+# once with GAS_LIMIT_MARGIN headroom, or fixed with SUBMIT_ALERT_GAS_LIMIT. Set
+# GAS_RECALIBRATE_INTERVAL (seconds) to re-estimate periodically.
+FEE_REFRESH_INTERVAL = float(os.getenv("FEE_REFRESH_INTERVAL", "1"))
+SUBMIT_ALERT_GAS_LIMIT = int(os.getenv("SUBMIT_ALERT_GAS_LIMIT")) if os.getenv("SUBMIT_ALERT_GAS_LIMIT") else None
+GAS_LIMIT_MARGIN = float(os.getenv("GAS_LIMIT_MARGIN", "1.25"))
+GAS_RECALIBRATE_INTERVAL = float(os.getenv("GAS_RECALIBRATE_INTERVAL", "0"))
+
+# Submitter sharding: alerts are spread over SUBMITTER_SHARDS accounts (the master key plus
+# keys derived from /yeti/submitter/{n}) by consistent hashing of the webhook ID, each with
+# its own nonce stream. Extra shards are granted SUBMITTER_ROLE by the master account when it
+# owns the oracle, topped up with SHARD_TOPUP_ETH whenever their balance drops below
+# SHARD_MIN_BALANCE_ETH (checked every SHARD_FUNDING_INTERVAL seconds).
+SUBMITTER_SHARDS = int(os.getenv("SUBMITTER_SHARDS", "1"))
+SHARD_MIN_BALANCE_ETH = float(os.getenv("SHARD_MIN_BALANCE_ETH", "0.05"))
+SHARD_TOPUP_ETH = float(os.getenv("SHARD_TOPUP_ETH", "0.2"))
+SHARD_FUNDING_INTERVAL = float(os.getenv("SHARD_FUNDING_INTERVAL", "300"))
+
+# Where transactions are signed: "process" (a pool of SIGNER_WORKERS processes), "thread"
+# (only parallel with a native secp256k1 backend such as coincurve, which releases the GIL),
+# "inline" (on the event loop), or "auto" for thread with coincurve and process without it
+SIGNER_MODE = os.getenv("SIGNER_MODE", "auto")
+SIGNER_WORKERS = int(os.getenv("SIGNER_WORKERS", "2"))
+
+# When webhooks are answered: "queued" once authenticated, "broadcast" once the
+# transaction is sent, or "sync" after the receipt (blocks the request until mined)
+ACCEPT_MODE = os.getenv("ACCEPT_MODE", "queued")
+SUBMISSION_WORKERS = int(os.getenv("SUBMISSION_WORKERS", "8"))
+SUBMISSION_MAX_RETRIES = int(os.getenv("SUBMISSION_MAX_RETRIES", "3"))
+MAX_TRACKED_SUBMISSIONS = int(os.getenv("MAX_TRACKED_SUBMISSIONS", "10000"))
+BROADCAST_WAIT_TIMEOUT = float(os.getenv("BROADCAST_WAIT_TIMEOUT", "10"))
+
+# Admission control, checked before a webhook is parsed or authenticated. Token buckets
+# (sustained rate per second and burst; a rate of 0 disables) globally and per webhook ID
+# answer 429. More than ADMISSION_MAX_INFLIGHT webhooks in progress, or more than
+# SUBMISSION_QUEUE_LIMIT alerts waiting to be broadcast, answer 503. Test-mode webhooks
+# only get ADMISSION_TESTING_SHARE of the global rate and of both limits, and are
+# submitted after live alerts.
+ADMISSION_GLOBAL_RATE = float(os.getenv("ADMISSION_GLOBAL_RATE", "500"))
+ADMISSION_GLOBAL_BURST = float(os.getenv("ADMISSION_GLOBAL_BURST", "1000"))
+ADMISSION_WEBHOOK_RATE = float(os.getenv("ADMISSION_WEBHOOK_RATE", "5"))
+ADMISSION_WEBHOOK_BURST = float(os.getenv("ADMISSION_WEBHOOK_BURST", "20"))
+ADMISSION_MAX_INFLIGHT = int(os.getenv("ADMISSION_MAX_INFLIGHT", "1000"))
+ADMISSION_TESTING_SHARE = float(os.getenv("ADMISSION_TESTING_SHARE", "0.25"))
+ADMISSION_MAX_BUCKETS = int(os.getenv("ADMISSION_MAX_BUCKETS", "10000"))
+SUBMISSION_QUEUE_LIMIT = int(os.getenv("SUBMISSION_QUEUE_LIMIT", "5000"))
+
+# POST /webhook/{webhook_id} is answered by a raw ASGI handler in front of FastAPI; set
+# false to route it through FastAPI instead. Bodies over WEBHOOK_MAX_BODY_BYTES get 413.
+WEBHOOK_FAST_LANE = os.getenv("WEBHOOK_FAST_LANE", "true").lower() == "true"
+WEBHOOK_MAX_BODY_BYTES = int(os.getenv("WEBHOOK_MAX_BODY_BYTES", "4096"))
+# Most webhook IDs POST /create-webhooks creates in one call
+WEBHOOK_BULK_MAX = int(os.getenv("WEBHOOK_BULK_MAX", "1000"))
+
+# Micro-batching of queued alerts into one submitAlerts transaction. A batch is sent once it
+# holds BATCH_MAX_SIZE alerts or BATCH_WINDOW_MS after its first alert. The default of 1
+# keeps one submitAlert per alert for oracles deployed before submitAlerts existed.
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "1"))
+BATCH_WINDOW_MS = int(os.getenv("BATCH_WINDOW_MS", "250"))
+
+# Last-write-wins coalescing per webhook ID: a newer alert supersedes a queued one and
+# replaces a broadcast, unmined one at the same nonce (at most COALESCE_MAX_REPLACEMENTS
+# times per transaction, each paying bumped fees)
+COALESCE_ALERTS = os.getenv("COALESCE_ALERTS", "true").lower() == "true"
+COALESCE_MAX_REPLACEMENTS = int(os.getenv("COALESCE_MAX_REPLACEMENTS", "3"))
+
+# Read-through cache for GET /alert/{webhook_id}
+ALERT_CACHE_MAX_ENTRIES = int(os.getenv("ALERT_CACHE_MAX_ENTRIES", "10000"))
+ALERT_CACHE_TTL = float(os.getenv("ALERT_CACHE_TTL", "30"))
+
+# Repeated deliveries with the same webhook ID, action and idempotency key (Idempotency-Key
+# header, or a hash of the body) within DEDUP_WINDOW seconds are answered with the original
+# submission; 0 disables. DEDUP_SKIP_UNCHANGED also skips alerts whose action equals the
+# pending or on-chain one.
+DEDUP_WINDOW = float(os.getenv("DEDUP_WINDOW", "60"))
+DEDUP_MAX_ENTRIES = int(os.getenv("DEDUP_MAX_ENTRIES", "10000"))
+DEDUP_SKIP_UNCHANGED = os.getenv("DEDUP_SKIP_UNCHANGED", "false").lower() == "true"
+
+# Durable journal of accepted alerts, replayed on startup. Up to JOURNAL_MAX_GROUP queued
+# writes share one commit (and fsync); finished entries are pruned after JOURNAL_RETENTION seconds.
+JOURNAL_DB_PATH = os.getenv("JOURNAL_DB_PATH", "journal.db")
+JOURNAL_MAX_GROUP = int(os.getenv("JOURNAL_MAX_GROUP", "1000"))
+JOURNAL_RETENTION = float(os.getenv("JOURNAL_RETENTION", str(7 * 24 * 3600)))
+
+# AlertSubmitted indexer: SQLite store, first block to backfill from when no cursor is
+# stored (defaults to the current head), eth_getLogs range per request and reorg depth
+INDEXER_DB_PATH = os.getenv("INDEXER_DB_PATH", "alerts.db")
+INDEXER_START_BLOCK = int(os.getenv("INDEXER_START_BLOCK")) if os.getenv("INDEXER_START_BLOCK") else None
+INDEXER_CHUNK_SIZE = int(os.getenv("INDEXER_CHUNK_SIZE", "2000"))
+INDEXER_REORG_DEPTH = int(os.getenv("INDEXER_REORG_DEPTH", "12"))
+# How often new blocks are polled for AlertSubmitted logs
+ALERT_LOG_POLL_INTERVAL = float(os.getenv("ALERT_LOG_POLL_INTERVAL", "2"))
+
+# Mined alerts are pushed to each of ALERT_CALLBACK_URLS (comma-separated, e.g. the orderbook
+# server's /api/alerts/callback), signed with ALERT_CALLBACK_SECRET. Alerts mined within
+# ALERT_CALLBACK_WINDOW_MS of each other share a request of at most ALERT_CALLBACK_BATCH_SIZE;
+# failed requests are retried ALERT_CALLBACK_MAX_RETRIES times with exponential backoff, and
+# at most ALERT_CALLBACK_MAX_PENDING alerts are held per subscriber meanwhile.
+ALERT_CALLBACK_URLS = [url.strip() for url in os.getenv("ALERT_CALLBACK_URLS", "").split(",") if url.strip()]
+ALERT_CALLBACK_SECRET = os.getenv("ALERT_CALLBACK_SECRET")
+if ALERT_CALLBACK_URLS and not ALERT_CALLBACK_SECRET:
+    raise ValueError("ALERT_CALLBACK_SECRET is required with ALERT_CALLBACK_URLS")
+ALERT_CALLBACK_WINDOW_MS = int(os.getenv("ALERT_CALLBACK_WINDOW_MS", "50"))
+ALERT_CALLBACK_BATCH_SIZE = int(os.getenv("ALERT_CALLBACK_BATCH_SIZE", "100"))
+ALERT_CALLBACK_MAX_RETRIES = int(os.getenv("ALERT_CALLBACK_MAX_RETRIES", "5"))
+ALERT_CALLBACK_TIMEOUT = float(os.getenv("ALERT_CALLBACK_TIMEOUT", "5"))
+ALERT_CALLBACK_MAX_PENDING = int(os.getenv("ALERT_CALLBACK_MAX_PENDING", "10000"))
+
+# Opt-in capture of authenticated webhook arrivals (time, webhook ID, action, digest of the
+# idempotency key; no secrets) as JSON lines appended to CAPTURE_PATH, for
+# benchmarks/replay.py. Arrivals are buffered in memory and written every
+# CAPTURE_FLUSH_INTERVAL seconds; beyond CAPTURE_MAX_BUFFER unwritten arrivals new ones are dropped.
+CAPTURE_PATH = os.getenv("CAPTURE_PATH", "")
+CAPTURE_FLUSH_INTERVAL = float(os.getenv("CAPTURE_FLUSH_INTERVAL", "1"))
+CAPTURE_MAX_BUFFER = int(os.getenv("CAPTURE_MAX_BUFFER", "100000"))
+
+# Deployment split. SERVER_ROLE "all" runs everything in one process. "ingest" processes
+# (INGEST_WORKERS of them behind one PORT) check IPs and HMACs and suppress duplicates, then
+# hand alerts to the active signer at SIGNER_ADDRESSES (comma-separated unix:/path or
+# tcp:host:port, tried in order), waiting up to SIGNER_REQUEST_TIMEOUT seconds for one.
+# A request sent waits up to SIGNER_REPLY_TIMEOUT seconds for the answer (by default long
+# enough for ACCEPT_MODE "sync" to see the receipt), then fails with 503.
+# "signer" processes compete for SIGNER_LOCK_PATH; the holder owns the keys, nonces and
+# journal and listens on SIGNER_LISTEN, the others stand by to take over.
+SERVER_ROLE = os.getenv("SERVER_ROLE", "all")
+if SERVER_ROLE not in ("all", "ingest", "signer"):
+    raise ValueError(f"SERVER_ROLE must be all, ingest or signer, not {SERVER_ROLE}")
+PORT = int(os.getenv("PORT", "3001"))
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "1"))
+SIGNER_ADDRESSES = [address.strip() for address in os.getenv("SIGNER_ADDRESSES", "unix:signer.sock").split(",") if address.strip()]
+SIGNER_LISTEN = os.getenv("SIGNER_LISTEN", SIGNER_ADDRESSES[0])
+SIGNER_LOCK_PATH = os.getenv("SIGNER_LOCK_PATH", f"{JOURNAL_DB_PATH}.lock")
+SIGNER_LOCK_POLL_INTERVAL = float(os.getenv("SIGNER_LOCK_POLL_INTERVAL", "0.5"))
+SIGNER_REQUEST_TIMEOUT = float(os.getenv("SIGNER_REQUEST_TIMEOUT", "10"))
+SIGNER_REPLY_TIMEOUT = float(os.getenv("SIGNER_REPLY_TIMEOUT", "120" if ACCEPT_MODE == "sync" else "30"))
+
 TEE_SECRET = os.getenv("TEE_SECRET")
 if not TEE_SECRET:
     raise ValueError("TEE_SECRET is not set")
+# Seconds a TEE liveness probe result is reused by /health and /status
+TEE_LIVENESS_TTL = float(os.getenv("TEE_LIVENESS_TTL", "30"))
+# Seconds between background refreshes of the account balance and nonce gap gauges on /metrics
+METRICS_REFRESH_INTERVAL = float(os.getenv("METRICS_REFRESH_INTERVAL", "15"))
+
+# Logging. LOG_MODE "async" hands records unformatted to a writer thread through a queue of
+# LOG_QUEUE_SIZE (records are dropped and counted when it is full, never waited for, and a
+# summary of the drops is written every LOG_DROP_SUMMARY_INTERVAL seconds); "sync" writes on
+# the calling thread. LOG_FORMAT "json" writes one object per line with the request and
+# webhook IDs, "text" the classic format. Beyond LOG_INFO_RATE info records per second (0
+# disables sampling) only one in LOG_SAMPLE_EVERY is kept; warnings and errors always are.
+LOG_MODE = os.getenv("LOG_MODE", "async")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_INFO_RATE = int(os.getenv("LOG_INFO_RATE", "1000"))
+LOG_SAMPLE_EVERY = int(os.getenv("LOG_SAMPLE_EVERY", "10"))
+LOG_DROP_SUMMARY_INTERVAL = float(os.getenv("LOG_DROP_SUMMARY_INTERVAL", "10"))
+
+# Startup. The server listens at once and initializes in the background, answering 503 to
+# webhooks and GET /ready until it is done. A failed initialization is retried after
+# STARTUP_RETRY_DELAY seconds, doubling up to STARTUP_RETRY_MAX_DELAY, instead of exiting.
+STARTUP_RETRY_DELAY = float(os.getenv("STARTUP_RETRY_DELAY", "1"))
+STARTUP_RETRY_MAX_DELAY = float(os.getenv("STARTUP_RETRY_MAX_DELAY", "30"))
 
 class Action:
     NONE = 0
@@ -0,0 +1,78 @@
+import json
+from typing import Any
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+from contract_config import WEBHOOK_MAX_BODY_BYTES
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+WEBHOOK_PREFIX = "/webhook/"
+
+def encode_json(content: Any) -> bytes:
+    """Compact JSON, encoded by orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
+
+async def read_body(receive: Receive, limit: int = WEBHOOK_MAX_BODY_BYTES) -> bytes:
+    """Request body straight from the ASGI receive channel, refusing more than limit bytes"""
+    body = b""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise HTTPException(status_code=400, detail="Client disconnected")
+        body += message.get("body", b"")
+        if len(body) > limit:
+            raise HTTPException(status_code=413, detail="Webhook body too large")
+        if not message.get("more_body", False):
+            return body
+
+class WebhookFastLane:
+    """Answers POST /webhook/{webhook_id} in front of FastAPI.
+
+    TradingView alerts are the hot path, and most of what the FastAPI route spent on each
+    was framework work: routing, building a Request, resolving parameters and encoding the
+    response through jsonable_encoder. Here the headers are scanned once and the request
+    goes through the same IP check, admission control, body parsing, HMAC verification and
+    submission as the route (WebhookServer.receive_webhook), so both answer alike. Every
+    other request is passed on to the app.
+    """
+
+    def __init__(self, app: ASGIApp, server):
+        self.app = app
+        self.server = server
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].startswith(WEBHOOK_PREFIX):
+            await self.app(scope, receive, send)
+            return
+        webhook_id = scope["path"][len(WEBHOOK_PREFIX):]
+        if not webhook_id or "/" in webhook_id:
+            await self.app(scope, receive, send)
+            return
+
+        forwarded_for = idempotency_key = None
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for" and forwarded_for is None:
+                forwarded_for = value.decode("latin-1")
+            elif name == b"idempotency-key" and idempotency_key is None:
+                idempotency_key = value.decode("latin-1")
+        client = scope.get("client")
+
+        try:
+            result = await self.server.receive_webhook(
+                webhook_id, client[0] if client else "", forwarded_for, idempotency_key, receive
+            )
+        except HTTPException as e:
+            result = FastJSONResponse({"detail": e.detail}, status_code=e.status_code, headers=e.headers)
+        if not isinstance(result, Response):
+            result = FastJSONResponse(result)
+        await result(scope, receive, send)
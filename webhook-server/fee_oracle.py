@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import uuid
+from typing import Optional
+from web3 import AsyncWeb3
+from web3.contract import AsyncContract
+from contract_config import (
+    FEE_REFRESH_INTERVAL,
+    SUBMIT_ALERT_GAS_LIMIT,
+    GAS_LIMIT_MARGIN,
+    GAS_RECALIBRATE_INTERVAL
+)
+
+logger = logging.getLogger(__name__)
+
+class FeeOracle:
+    """Keeps fee fields and gas limits ready so building a transaction needs no RPC calls.
+
+    The latest block is polled every FEE_REFRESH_INTERVAL seconds and EIP-1559 fees
+    (2 x base fee + priority fee, or the legacy gas price) are refreshed whenever it
+    changes. Gas limits are estimated once at startup (submitAlert) or on first use
+    (submitAlerts, as base + per-alert cost from a one- and two-alert estimate), padded
+    by GAS_LIMIT_MARGIN, and optionally re-estimated every GAS_RECALIBRATE_INTERVAL.
+    """
+
+    def __init__(self, w3: AsyncWeb3, contract: AsyncContract, address: str):
+        self.w3 = w3
+        self.contract = contract
+        self.address = address
+        self.block_number: Optional[int] = None
+        self._fees: Optional[dict] = None
+        self._single_gas: Optional[int] = SUBMIT_ALERT_GAS_LIMIT
+        self._batch_gas: Optional[tuple[int, int]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        await self.refresh_fees()
+        if SUBMIT_ALERT_GAS_LIMIT is None:
+            try:
+                await self.calibrate_single()
+            except Exception as e:
+                logger.warning(f"submitAlert gas calibration failed, falling back to per-transaction estimates: {e}")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def fee_fields(self) -> dict:
+        if self._fees is None:
+            await self.refresh_fees()
+        return dict(self._fees)
+
+    async def gas_limit(self, alert_count: Optional[int] = None) -> Optional[int]:
+        """Gas limit for submitAlert, or for submitAlerts with alert_count alerts; None lets web3 estimate"""
+        if alert_count is None:
+            return self._single_gas
+        if self._batch_gas is None:
+            try:
+                await self.calibrate_batch()
+            except Exception as e:
+                logger.warning(f"submitAlerts gas calibration failed: {e}")
+                return None
+        base, per_alert = self._batch_gas
+        return base + per_alert * alert_count
+
+    async def refresh_fees(self):
+        block = await self.w3.eth.get_block('latest')
+        if block['number'] == self.block_number and self._fees is not None:
+            return
+        if block.get('baseFeePerGas') is not None:
+            priority_fee = await self.w3.eth.max_priority_fee
+            self._fees = {
+                'maxFeePerGas': 2 * block['baseFeePerGas'] + priority_fee,
+                'maxPriorityFeePerGas': priority_fee
+            }
+        else:
+            self._fees = {'gasPrice': await self.w3.eth.gas_price}
+        self.block_number = block['number']
+
+    async def calibrate_single(self):
+        estimate = await self.contract.functions.submitAlert(self._dummy_alert_id(), 1).estimate_gas({'from': self.address})
+        self._single_gas = int(estimate * GAS_LIMIT_MARGIN)
+        logger.info(f"submitAlert gas limit calibrated to {self._single_gas}")
+
+    async def calibrate_batch(self):
+        one, two = [
+            await self.contract.functions.submitAlerts(
+                [self._dummy_alert_id() for _ in range(count)], [1] * count
+            ).estimate_gas({'from': self.address})
+            for count in (1, 2)
+        ]
+        per_alert = two - one
+        self._batch_gas = (int((one - per_alert) * GAS_LIMIT_MARGIN), int(per_alert * GAS_LIMIT_MARGIN))
+        logger.info(f"submitAlerts gas limit calibrated to {self._batch_gas[0]} + {self._batch_gas[1]} per alert")
+
+    @staticmethod
+    def _dummy_alert_id() -> bytes:
+        # A fresh ID writes new storage slots, the most expensive case
+        return uuid.uuid4().bytes
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        next_calibration = loop.time() + GAS_RECALIBRATE_INTERVAL
+        while True:
+            await asyncio.sleep(FEE_REFRESH_INTERVAL)
+            try:
+                await self.refresh_fees()
+                if GAS_RECALIBRATE_INTERVAL > 0 and loop.time() >= next_calibration:
+                    next_calibration = loop.time() + GAS_RECALIBRATE_INTERVAL
+                    if SUBMIT_ALERT_GAS_LIMIT is None:
+                        await self.calibrate_single()
+                    if self._batch_gas is not None:
+                        await self.calibrate_batch()
+            except Exception as e:
+                logger.warning(f"Fee refresh failed: {e}")
@@ -0,0 +1,61 @@
+import asyncio
+import fcntl
+import logging
+import os
+from typing import Optional
+from contract_config import SIGNER_LOCK_PATH, SIGNER_LOCK_POLL_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+class LeaderLock:
+    """Leader election between signer processes through an exclusive flock on a shared file.
+
+    A local stand-in for a lock service: only one process holds the lock, the kernel releases
+    it the moment the holder exits or crashes, and a standby polling every poll_interval
+    seconds takes it over. It elects on one host (or a filesystem with working flock); a
+    holder that hangs without exiting keeps the lock, which a lease-based service would not.
+    """
+
+    def __init__(self, path: str = SIGNER_LOCK_PATH, poll_interval: float = SIGNER_LOCK_POLL_INTERVAL):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    async def acquire(self):
+        """Wait until this process holds the lock"""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        waiting = False
+        try:
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if not waiting:
+                        logger.info(f"Signer lock {self.path} is held by {self._holder(fd)}, standing by")
+                        waiting = True
+                    await asyncio.sleep(self.poll_interval)
+        except BaseException:
+            os.close(fd)
+            raise
+        # Record the holder for operators; the lock itself is the flock, not the contents
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, f"{os.getpid()}\n".encode(), 0)
+        self._fd = fd
+        logger.info(f"Acquired signer lock {self.path}")
+
+    def release(self):
+        if self._fd is None:
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+    @staticmethod
+    def _holder(fd: int) -> str:
+        pid = os.pread(fd, 32, 0).decode(errors="replace").strip()
+        return f"pid {pid}" if pid else "another process"
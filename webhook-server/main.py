@@ -1,19 +1,32 @@
-import logging
-import sys
-import uvicorn
-from webhook_server import create_app
+import time
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+STARTED_AT = time.monotonic()
 
-# Create the FastAPI application
-app = create_app()
+from contract_config import INGEST_WORKERS, PORT, SERVER_ROLE
+
+def create_app():
+    """Build the FastAPI application, once in every serving process.
+
+    Nothing heavy is imported at module level: signing pool workers run this file again
+    (as __mp_main__) when they start, and must not build a second app each.
+    """
+    from metrics import startup_profile
+    from structured_logging import configure_logging
+    from webhook_server import create_app
+
+    startup_profile.started_at = STARTED_AT
+    startup_profile.record("import", time.monotonic() - STARTED_AT)
+    # Configure logging; uvicorn's own loggers (including the access log) go through the same handler
+    configure_logging()
+    return create_app()
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=3001)
+    import uvicorn
+
+    if INGEST_WORKERS > 1:
+        # Only stateless ingest processes can share a port; each worker imports the app itself
+        if SERVER_ROLE != "ingest":
+            raise SystemExit("INGEST_WORKERS > 1 requires SERVER_ROLE=ingest")
+        uvicorn.run("main:create_app", factory=True, host="0.0.0.0", port=PORT, workers=INGEST_WORKERS, log_config=None)
+    else:
+        uvicorn.run(create_app(), host="0.0.0.0", port=PORT, log_config=None)
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Optional
+from prometheus_client import Counter, Gauge, Histogram
+from contract_config import METRICS_REFRESH_INTERVAL
+
+try:
+    from opentelemetry import trace
+    tracer = trace.get_tracer("webhook-server")
+except ImportError:
+    tracer = None
+
+logger = logging.getLogger(__name__)
+
+STAGE_SECONDS = Histogram(
+    "webhook_stage_seconds",
+    "Time spent in each stage of the webhook pipeline",
+    ["stage"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+ALERTS = Counter("webhook_alerts_total", "Authenticated alerts accepted for submission", ["action"])
+FAILURES = Counter("webhook_failures_total", "Rejected webhooks and failed submissions", ["stage", "reason"])
+INFLIGHT_TRANSACTIONS = Gauge("webhook_inflight_transactions", "Broadcast transactions waiting for a receipt")
+PENDING_NONCE_GAP = Gauge(
+    "webhook_pending_nonce_gap",
+    "Nonces allocated locally but not yet in the node's pending transaction count"
+)
+DUPLICATES = Counter(
+    "webhook_duplicates_total",
+    "Deliveries answered without a new transaction (duplicate or unchanged action)",
+    ["reason"]
+)
+STARTUP_SECONDS = Gauge(
+    "webhook_startup_phase_seconds",
+    "Duration of each phase of the last startup; ready is the total until GET /ready passed",
+    ["phase"]
+)
+DEDUP_SAVED_GAS = Counter("webhook_dedup_saved_gas_total", "Gas not spent because of duplicate suppression")
+DEDUP_SAVED_RPC_CALLS = Counter("webhook_dedup_saved_rpc_calls_total", "RPC calls not made because of duplicate suppression")
+COALESCED = Counter(
+    "webhook_coalesced_total",
+    "Alerts superseded by a newer alert for the same webhook ID, while queued or by replacement",
+    ["how"]
+)
+REORGED = Counter("webhook_reorged_alerts_total", "Mined alerts whose block was dropped by a chain reorganization")
+CALLBACKS = Counter(
+    "webhook_alert_callbacks_total",
+    "Mined alerts pushed to callback subscribers, by outcome (delivered, retried, dropped)",
+    ["outcome"]
+)
+ALERT_GAS = Histogram(
+    "webhook_alert_gas_used",
+    "Gas used per mined alert (a batch transaction's gas divided over its alerts)",
+    buckets=(20000, 30000, 40000, 50000, 60000, 80000, 100000, 150000, 250000)
+)
+ACCOUNT_BALANCE = Gauge("webhook_account_balance_eth", "Balance of the account submitting alerts")
+SHARD_BALANCE = Gauge("webhook_shard_balance_eth", "Balance of each extra submitter shard account", ["shard"])
+LOG_RECORDS_DROPPED = Counter(
+    "webhook_log_records_dropped_total",
+    "Log records not written: info sampled out under load or dropped because the log queue was full (queue_full), warnings and errors dropped because it was full (warning_dropped)",
+    ["reason"]
+)
+
+@contextmanager
+def stage(name: str):
+    """Time a pipeline stage into webhook_stage_seconds, inside an OpenTelemetry span when available"""
+    span = tracer.start_as_current_span(f"webhook.{name}") if tracer else nullcontext()
+    start = time.perf_counter()
+    with span:
+        try:
+            yield
+        finally:
+            STAGE_SECONDS.labels(name).observe(time.perf_counter() - start)
+
+def record_failure(stage_name: str, reason: str):
+    FAILURES.labels(stage_name, reason).inc()
+
+class StartupProfile:
+    """Seconds each startup phase took, for webhook_startup_phase_seconds and GET /ready.
+
+    Phases run concurrently where they can (key derivation alongside the RPC connection,
+    the signer pool alongside the fee oracle), so they add up to more than "ready", the
+    time from the start of the import until the server was ready.
+    """
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.phases: dict[str, float] = {}
+
+    def record(self, phase: str, seconds: float):
+        self.phases[phase] = round(seconds, 3)
+        STARTUP_SECONDS.labels(phase).set(seconds)
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(name, time.monotonic() - start)
+
+    async def timed(self, name: str, awaitable):
+        """Await one of several steps run together, timing it as a phase of its own"""
+        with self.phase(name):
+            return await awaitable
+
+    def ready(self):
+        self.record("ready", time.monotonic() - self.started_at)
+
+startup_profile = StartupProfile()
+
+class MetricsCollector:
+    """Refreshes the account gauges in the background so scrapes never hit the RPC node"""
+
+    def __init__(self, blockchain_manager):
+        self.blockchain_manager = blockchain_manager
+        self._task: Optional[asyncio.Task] = None
+        submitters = blockchain_manager.submitters
+        if submitters:
+            INFLIGHT_TRANSACTIONS.set_function(lambda: sum(submitter.nonce_manager.in_flight for submitter in submitters))
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Metrics refresh failed: {e}")
+            await asyncio.sleep(METRICS_REFRESH_INTERVAL)
+
+    async def refresh(self):
+        balance = await self.blockchain_manager.get_account_balance()
+        if "balance_eth" in balance:
+            ACCOUNT_BALANCE.set(float(balance["balance_eth"]))
+
+        gap = 0
+        for submitter in self.blockchain_manager.submitters:
+            nonce_manager = submitter.nonce_manager
+            if nonce_manager.next_nonce is not None:
+                pending = await self.blockchain_manager.w3.eth.get_transaction_count(submitter.address, 'pending')
+                gap += max(nonce_manager.next_nonce - pending, 0)
+        PENDING_NONCE_GAP.set(gap)
@@ -0,0 +1,117 @@
+import asyncio
+import heapq
+import logging
+from typing import Optional, Union
+from web3 import AsyncWeb3
+
+logger = logging.getLogger(__name__)
+
+NONCE_ERROR_MESSAGES = (
+    "nonce too low",
+    "nonce too high",
+    "replacement transaction underpriced",
+    "invalid nonce",
+)
+
+# The node already holds this exact signed transaction, so the broadcast in fact succeeded
+ALREADY_KNOWN_MESSAGES = (
+    "already known",
+    "known transaction",
+)
+
+def is_nonce_error(error: Exception) -> bool:
+    """Whether a broadcast failed because our local nonce view diverged from the node"""
+    message = str(error).lower()
+    return any(text in message for text in NONCE_ERROR_MESSAGES)
+
+def is_already_known(error: Union[Exception, dict, str]) -> bool:
+    """Whether a broadcast (an exception or a JSON-RPC error object) was refused only because
+    the node already has the transaction"""
+    message = str(error).lower()
+    return any(text in message for text in ALREADY_KNOWN_MESSAGES)
+
+class NonceManager:
+    """Hands out sequential nonces for one account without a node round-trip per transaction.
+
+    The first allocation seeds the counter from the `pending` transaction count; after that
+    nonces come from memory so many signed transactions can be in flight at once. Nonces of
+    transactions that never reached the node are released and handed out again first so the
+    sequence stays gap-free.
+    """
+
+    def __init__(self, w3: AsyncWeb3, address: str):
+        self.w3 = w3
+        self.address = address
+        self._lock = asyncio.Lock()
+        self._next_nonce: Optional[int] = None
+        self._released: list[int] = []
+        self._in_flight: set[int] = set()
+
+    async def allocate(self) -> int:
+        async with self._lock:
+            if self._next_nonce is None:
+                self._next_nonce = await self._pending_count()
+            if self._released:
+                nonce = heapq.heappop(self._released)
+            else:
+                nonce = self._next_nonce
+                self._next_nonce += 1
+            self._in_flight.add(nonce)
+            return nonce
+
+    async def release(self, nonce: int):
+        """Return a nonce whose transaction was never accepted by the node"""
+        # Under the lock, so a resync in progress cannot overwrite the counter or the released heap
+        async with self._lock:
+            self._in_flight.discard(nonce)
+            if nonce == self._next_nonce - 1:
+                self._next_nonce -= 1
+            elif nonce not in self._released:
+                heapq.heappush(self._released, nonce)
+
+    async def claim(self, nonce: int):
+        """Take over a nonce a previous process broadcast with, so it is not handed out again"""
+        async with self._lock:
+            if self._next_nonce is None:
+                self._next_nonce = await self._pending_count()
+            if nonce >= self._next_nonce:
+                for gap in range(self._next_nonce, nonce):
+                    heapq.heappush(self._released, gap)
+                self._next_nonce = nonce + 1
+            elif nonce in self._released:
+                self._released.remove(nonce)
+                heapq.heapify(self._released)
+            self._in_flight.add(nonce)
+
+    def confirm(self, nonce: int):
+        """Mark a nonce as consumed on chain"""
+        self._in_flight.discard(nonce)
+
+    async def resync(self):
+        """Reconcile with the node after a nonce error or a stuck transaction.
+
+        The counter only moves forward so transactions already in flight are never
+        re-used. Nonces between the node's pending count and our counter that nobody is
+        waiting on are gaps blocking everything after them; they are queued for reuse.
+        """
+        async with self._lock:
+            pending = await self._pending_count()
+            previous = self._next_nonce
+            if self._next_nonce is None or pending > self._next_nonce:
+                self._next_nonce = pending
+
+            gaps = {n for n in range(pending, self._next_nonce) if n not in self._in_flight}
+            self._released = sorted(gaps | {n for n in self._released if n >= pending})
+            if previous != self._next_nonce or self._released:
+                logger.warning(f"Nonce resynced for {self.address}: next {previous} -> {self._next_nonce}, gaps {self._released}")
+
+    async def _pending_count(self) -> int:
+        return await self.w3.eth.get_transaction_count(self.address, 'pending')
+
+    @property
+    def next_nonce(self) -> Optional[int]:
+        return self._next_nonce
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
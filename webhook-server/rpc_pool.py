@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import time
+from typing import Any, List, Optional, Tuple, Union
+from aiohttp import ClientSession
+from web3 import AsyncWeb3
+from web3.providers.async_base import AsyncJSONBaseProvider
+from web3.exceptions import ProviderConnectionError
+from web3.types import RPCEndpoint, RPCResponse
+from nonce_manager import is_already_known
+from contract_config import (
+    RPC_REQUEST_TIMEOUT,
+    RPC_PROBE_INTERVAL,
+    RPC_MAX_BLOCK_LAG,
+    RPC_BREAKER_THRESHOLD,
+    RPC_BREAKER_BACKOFF,
+    RPC_BREAKER_MAX_BACKOFF
+)
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest sample in the moving latency average
+LATENCY_ALPHA = 0.3
+
+class RpcEndpoint:
+    """One RPC node with its latency average, head block and circuit breaker state"""
+
+    def __init__(self, url: str):
+        self.url = url
+        # Failover is handled by the pool, so the provider should fail fast instead of retrying
+        self.provider = AsyncWeb3.AsyncHTTPProvider(url, exception_retry_configuration=None)
+        self.latency: Optional[float] = None
+        self.block_number: Optional[int] = None
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.open_until = 0.0
+
+    def is_open(self) -> bool:
+        return time.monotonic() < self.open_until
+
+    def record_success(self, latency: float):
+        self.requests += 1
+        self.latency = latency if self.latency is None else LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * self.latency
+        self.consecutive_failures = 0
+        self.trips = 0
+
+    def record_failure(self, error: Exception):
+        self.requests += 1
+        self.errors += 1
+        self.consecutive_failures += 1
+        # Once the backoff has run out, the next failure (the half-open trial) re-trips with double
+        # the backoff; concurrent requests failing while the breaker is still open do not extend it
+        if self.consecutive_failures >= RPC_BREAKER_THRESHOLD and not self.is_open():
+            backoff = min(RPC_BREAKER_BACKOFF * 2 ** self.trips, RPC_BREAKER_MAX_BACKOFF)
+            self.trips += 1
+            self.open_until = time.monotonic() + backoff
+            logger.warning(f"RPC endpoint {self.url} out of rotation for {backoff:.0f}s: {error}")
+
+    def stats(self) -> dict:
+        return {
+            "url": self.url,
+            "healthy": not self.is_open(),
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "block_number": self.block_number,
+            "requests": self.requests,
+            "errors": self.errors
+        }
+
+class RpcPool(AsyncJSONBaseProvider):
+    """web3 provider spreading requests over several RPC endpoints.
+
+    Reads go to the healthy endpoint with the lowest moving-average latency and fail
+    over to the next one on connection errors or timeouts. eth_sendRawTransaction is
+    sent to every healthy endpoint in parallel and the first acceptance is returned.
+    JSON-RPC batches go to a single endpoint, with the same failover as reads.
+    A background probe keeps latency and head block numbers current; endpoints that
+    fail RPC_BREAKER_THRESHOLD times in a row are skipped with exponential backoff.
+    """
+
+    def __init__(self, urls: list[str]):
+        if not urls:
+            raise ValueError("At least one RPC URL is required")
+        super().__init__()
+        self.endpoints = [RpcEndpoint(url) for url in urls]
+        self._probe_task: Optional[asyncio.Task] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def __str__(self) -> str:
+        return f"RPC pool {', '.join(endpoint.url for endpoint in self.endpoints)}"
+
+    async def cache_async_session(self, session: ClientSession):
+        for endpoint in self.endpoints:
+            await endpoint.provider.cache_async_session(session)
+
+    async def warm_up(self):
+        """Open a connection to every endpoint and take its head block before the first alert,
+        whose broadcast goes to all of them"""
+        if len(self.endpoints) > 1:
+            await asyncio.gather(*(self._probe(endpoint) for endpoint in self.endpoints))
+
+    def start(self):
+        if len(self.endpoints) > 1:
+            self._probe_task = asyncio.create_task(self._probe_loop())
+
+    async def stop(self):
+        tasks = list(self._tasks)
+        if self._probe_task:
+            tasks.append(self._probe_task)
+            self._probe_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> list[dict]:
+        return [endpoint.stats() for endpoint in self.endpoints]
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        if method == "eth_sendRawTransaction" and len(self.endpoints) > 1:
+            return await self._broadcast(method, params)
+
+        last_error = None
+        for endpoint in self._ranked():
+            try:
+                return await self._request(endpoint, method, params)
+            except Exception as e:
+                last_error = e
+                logger.debug(f"{method} failed on {endpoint.url}: {e}")
+        raise ProviderConnectionError(f"All RPC endpoints failed for {method}: {last_error}")
+
+    async def make_batch_request(self, requests: List[Tuple[RPCEndpoint, Any]]) -> Union[List[RPCResponse], RPCResponse]:
+        """Send a JSON-RPC batch to one endpoint, failing over like make_request"""
+        last_error = None
+        for endpoint in self._ranked():
+            start = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(endpoint.provider.make_batch_request(requests), RPC_REQUEST_TIMEOUT)
+            except Exception as e:
+                endpoint.record_failure(e)
+                last_error = e
+                logger.debug(f"Batch of {len(requests)} requests failed on {endpoint.url}: {e}")
+                continue
+            endpoint.record_success(time.perf_counter() - start)
+            return response
+        raise ProviderConnectionError(f"All RPC endpoints failed for a batch of {len(requests)} requests: {last_error}")
+
+    def _ranked(self) -> list[RpcEndpoint]:
+        """Endpoints in the order reads should try them: in rotation and caught up first, fastest first"""
+        heads = [endpoint.block_number for endpoint in self.endpoints if endpoint.block_number is not None]
+        best_head = max(heads) if heads else None
+
+        def rank(endpoint: RpcEndpoint):
+            lagging = (
+                best_head is not None and endpoint.block_number is not None
+                and best_head - endpoint.block_number > RPC_MAX_BLOCK_LAG
+            )
+            # Endpoints out of rotation are still tried last rather than failing outright
+            return (endpoint.is_open(), lagging, endpoint.latency or 0.0)
+
+        return sorted(self.endpoints, key=rank)
+
+    async def _request(self, endpoint: RpcEndpoint, method: RPCEndpoint, params: Any) -> RPCResponse:
+        start = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(endpoint.provider.make_request(method, params), RPC_REQUEST_TIMEOUT)
+        except Exception as e:
+            endpoint.record_failure(e)
+            raise
+        endpoint.record_success(time.perf_counter() - start)
+        return response
+
+    async def _broadcast(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        """Send to every endpoint in rotation and return the first response without an error or
+        saying the transaction is already known, which is as good as accepted"""
+        endpoints = [endpoint for endpoint in self.endpoints if not endpoint.is_open()] or self._ranked()
+        pending = {asyncio.create_task(self._request(endpoint, method, params)) for endpoint in endpoints}
+        first_error_response = None
+        last_error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                    elif "error" in task.result():
+                        if is_already_known(task.result()["error"]):
+                            return task.result()
+                        first_error_response = first_error_response or task.result()
+                    else:
+                        return task.result()
+        finally:
+            # Slower endpoints still receive the transaction; keep their stats up to date
+            for task in pending:
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+        if first_error_response is not None:
+            return first_error_response
+        raise ProviderConnectionError(f"All RPC endpoints failed for {method}: {last_error}")
+
+    async def _probe_loop(self):
+        while True:
+            await asyncio.gather(*(self._probe(endpoint) for endpoint in self.endpoints))
+            await asyncio.sleep(RPC_PROBE_INTERVAL)
+
+    async def _probe(self, endpoint: RpcEndpoint):
+        # Let the breaker's backoff run out before trying an endpoint again
+        if endpoint.is_open():
+            return
+        try:
+            response = await self._request(endpoint, RPCEndpoint("eth_blockNumber"), [])
+            endpoint.block_number = int(response["result"], 16)
+        except Exception:
+            pass
@@ -0,0 +1,314 @@
+import asyncio
+import hmac
+import inspect
+import itertools
+import json
+import logging
+import os
+import secrets
+import time
+from typing import Any, Callable, Optional
+from fastapi import HTTPException
+from fastapi.responses import Response
+from fast_lane import encode_json
+from structured_logging import current_log_context, log_context
+from contract_config import SIGNER_ADDRESSES, SIGNER_REPLY_TIMEOUT, SIGNER_REQUEST_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# Largest reply line (GET /alerts pages hold up to 1000 events)
+LINE_LIMIT = 16 * 1024 * 1024
+HANDSHAKE_TIMEOUT = 5
+RECONNECT_DELAY = 0.1
+
+class SignerUnavailable(Exception):
+    pass
+
+def _line(message: dict) -> bytes:
+    return encode_json(message) + b"\n"
+
+def _proof(key: bytes, challenge: str) -> str:
+    return hmac.digest(key, challenge.encode(), 'sha256').hex()
+
+async def _open(address: str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    scheme, _, location = address.partition(":")
+    if scheme == "unix":
+        return await asyncio.open_unix_connection(location, limit=LINE_LIMIT)
+    if scheme == "tcp":
+        host, _, port = location.rpartition(":")
+        return await asyncio.open_connection(host, int(port), limit=LINE_LIMIT)
+    raise ValueError(f"Signer address must be unix:/path or tcp:host:port, not {address}")
+
+class SignerEndpoint:
+    """Serves ingest workers from the active signer.
+
+    Requests and replies are single lines of JSON on a unix or TCP socket: {"id", "op",
+    "args", "context"} in, {"id", "status", "body", "headers"} out, answered concurrently and matched by
+    ID, so one connection per worker carries all of its traffic. Each op calls a handler of
+    the server; dicts are answered 200, responses with their own status and HTTPExceptions
+    with theirs, exactly as over HTTP. Both ends first prove they hold the key derived from
+    /yeti/signer-ipc by answering each other's challenge.
+    """
+
+    def __init__(self, handlers: dict[str, Callable[..., Any]], key: bytes):
+        self.handlers = handlers
+        self.key = key
+        self.address: Optional[str] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._connections: set[asyncio.StreamWriter] = set()
+        self.requests = 0
+        self.rejected = 0
+
+    async def start(self, address: str):
+        scheme, _, location = address.partition(":")
+        if scheme == "unix":
+            # Only the lock holder gets here, so a socket file left behind is stale
+            if os.path.exists(location):
+                os.unlink(location)
+            self._server = await asyncio.start_unix_server(self._serve, location, limit=LINE_LIMIT)
+        elif scheme == "tcp":
+            host, _, port = location.rpartition(":")
+            self._server = await asyncio.start_server(self._serve, host, int(port), limit=LINE_LIMIT)
+        else:
+            raise ValueError(f"SIGNER_LISTEN must be unix:/path or tcp:host:port, not {address}")
+        self.address = address
+        logger.info(f"Serving ingest workers on {address}")
+
+    async def stop(self):
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._connections):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    def stats(self) -> dict:
+        return {
+            "listen": self.address,
+            "connections": len(self._connections),
+            "requests": self.requests,
+            "rejected_handshakes": self.rejected
+        }
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        tasks: set[asyncio.Task] = set()
+        try:
+            if not await self._handshake(reader, writer):
+                self.rejected += 1
+                logger.warning("Rejected an ingest worker that failed the signer handshake")
+                return
+            self._connections.add(writer)
+            while line := await reader.readline():
+                task = asyncio.create_task(self._answer(writer, json.loads(line)))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError) as e:
+            logger.warning(f"Ingest worker connection closed: {e}")
+        finally:
+            self._connections.discard(writer)
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _handshake(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        challenge = secrets.token_hex(16)
+        writer.write(_line({"challenge": challenge}))
+        hello = json.loads(await asyncio.wait_for(reader.readline(), HANDSHAKE_TIMEOUT) or b"{}")
+        if not hmac.compare_digest(str(hello.get("auth", "")), _proof(self.key, challenge)):
+            return False
+        writer.write(_line({"auth": _proof(self.key, str(hello.get("challenge", "")))}))
+        await writer.drain()
+        return True
+
+    async def _answer(self, writer: asyncio.StreamWriter, request: dict):
+        self.requests += 1
+        reply = {"id": request.get("id")}
+        try:
+            handler = self.handlers[request["op"]]
+            # Records logged for the request carry the ingest worker's request ID
+            with log_context(**request.get("context", {})):
+                result = handler(**request.get("args", {}))
+                if inspect.isawaitable(result):
+                    result = await result
+        except HTTPException as e:
+            reply.update(status=e.status_code, body={"detail": e.detail}, headers=e.headers)
+        except Exception as e:
+            logger.error(f"Signer request {request.get('op')} failed: {e}")
+            reply.update(status=500, body={"detail": "Internal Server Error"})
+        else:
+            if isinstance(result, Response):
+                reply.update(status=result.status_code, body=json.loads(result.body))
+            else:
+                reply.update(status=200, body=result)
+        if not writer.is_closing():
+            writer.write(_line(reply))
+            await writer.drain()
+
+class _Connection:
+    def __init__(self, address: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.address = address
+        self.reader = reader
+        self.writer = writer
+        self.pending: dict[int, asyncio.Future] = {}
+        self._ids = itertools.count()
+        self._reader = asyncio.create_task(self._read())
+
+    @property
+    def closed(self) -> bool:
+        return self._reader.done()
+
+    async def call(self, op: str, args: dict) -> dict:
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        try:
+            self.writer.write(_line({"id": request_id, "op": op, "args": args, "context": current_log_context()}))
+            await self.writer.drain()
+            return await future
+        finally:
+            self.pending.pop(request_id, None)
+
+    async def close(self):
+        self._reader.cancel()
+        self.writer.close()
+        try:
+            await self._reader
+        except asyncio.CancelledError:
+            pass
+
+    async def _read(self):
+        try:
+            while line := await self.reader.readline():
+                reply = json.loads(line)
+                future = self.pending.get(reply.get("id"))
+                if future is not None and not future.done():
+                    future.set_result(reply)
+        except (ConnectionError, ValueError) as e:
+            logger.warning(f"Connection to signer {self.address} failed: {e}")
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"Connection to signer {self.address} lost"))
+
+class SignerClient:
+    """An ingest worker's connection to whichever signer is active.
+
+    Addresses are tried in order until one completes the handshake (a standby signer does
+    not listen until it holds the signer lock), retrying for up to timeout seconds before
+    SignerUnavailable. A request cut off by a lost connection is sent again on the next
+    one, so a signer failover delays requests instead of failing them; an alert caught in
+    a crash may be submitted twice, which leaves the same action on chain. A request the
+    signer does not answer within reply_timeout seconds, as when it hangs with the
+    connection still open, fails with SignerUnavailable and is not sent again.
+
+    Requests passing the same shared key while one is in flight get its reply instead of
+    sending another. Nothing is remembered once it is answered: a worker only sees some of
+    each webhook's alerts, so repeats over time are for the signer to recognise.
+    """
+
+    def __init__(self, addresses: list[str] = SIGNER_ADDRESSES, timeout: float = SIGNER_REQUEST_TIMEOUT,
+                 reply_timeout: float = SIGNER_REPLY_TIMEOUT):
+        self.addresses = addresses
+        self.timeout = timeout
+        self.reply_timeout = reply_timeout
+        self.key: Optional[bytes] = None
+        self._connection: Optional[_Connection] = None
+        self._connect_lock = asyncio.Lock()
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+        self.requests = 0
+        self.coalesced = 0
+        self.reconnects = 0
+        self.timeouts = 0
+
+    def start(self, key: bytes):
+        self.key = key
+
+    async def connect(self):
+        """Open the connection to the active signer ahead of the first request, waiting for
+        one to take the signer lock if need be"""
+        await self._connect(float("inf"))
+
+    async def close(self):
+        if self._connection:
+            await self._connection.close()
+            self._connection = None
+
+    @property
+    def connected(self) -> bool:
+        return self._connection is not None and not self._connection.closed
+
+    def stats(self) -> dict:
+        return {
+            "addresses": self.addresses,
+            "connected": self._connection.address if self.connected else None,
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "reconnects": self.reconnects,
+            "timeouts": self.timeouts
+        }
+
+    async def request(self, op: str, args: Optional[dict] = None, shared: Optional[tuple] = None) -> tuple[int, Any, Optional[dict]]:
+        """(status, body, headers) of an op on the active signer"""
+        if shared is None:
+            return await self._request(op, args or {})
+        future = self._in_flight.get(shared)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = asyncio.ensure_future(self._request(op, args or {}))
+            self._in_flight[shared] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(shared, None))
+        return await asyncio.shield(future)
+
+    async def _request(self, op: str, args: dict) -> tuple[int, Any, Optional[dict]]:
+        self.requests += 1
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                connection = await self._connect(deadline)
+                # The request is dropped from the connection's pending replies when cancelled
+                reply = await asyncio.wait_for(connection.call(op, args), self.reply_timeout)
+                return reply["status"], reply["body"], reply.get("headers")
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise SignerUnavailable(f"Signer {connection.address} did not answer {op} within {self.reply_timeout}s")
+            except ConnectionError:
+                if time.monotonic() >= deadline:
+                    raise SignerUnavailable(f"No signer answered within {self.timeout}s")
+                await asyncio.sleep(RECONNECT_DELAY)
+
+    async def _connect(self, deadline: float) -> _Connection:
+        async with self._connect_lock:
+            if self.connected:
+                return self._connection
+            if self._connection is not None:
+                self.reconnects += 1
+                await self._connection.close()
+                self._connection = None
+            while True:
+                for address in self.addresses:
+                    try:
+                        self._connection = await self._handshake(address)
+                        logger.info(f"Connected to signer {address}")
+                        return self._connection
+                    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                        logger.debug(f"Signer {address} not available: {e}")
+                if time.monotonic() >= deadline:
+                    raise SignerUnavailable(f"No signer reachable at {', '.join(self.addresses)}")
+                await asyncio.sleep(RECONNECT_DELAY)
+
+    async def _handshake(self, address: str) -> _Connection:
+        reader, writer = await asyncio.wait_for(_open(address), HANDSHAKE_TIMEOUT)
+        try:
+            hello = json.loads(await asyncio.wait_for(reader.readline(), HANDSHAKE_TIMEOUT) or b"{}")
+            challenge = secrets.token_hex(16)
+            writer.write(_line({"auth": _proof(self.key, str(hello.get("challenge", ""))), "challenge": challenge}))
+            await writer.drain()
+            reply = json.loads(await asyncio.wait_for(reader.readline(), HANDSHAKE_TIMEOUT) or b"{}")
+            if not hmac.compare_digest(str(reply.get("auth", "")), _proof(self.key, challenge)):
+                raise ConnectionRefusedError(f"Signer {address} failed the handshake")
+        except BaseException:
+            writer.close()
+            raise
+        return _Connection(address, reader, writer)
@@ -0,0 +1,183 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, TextIO
+from contract_config import LOG_MODE, LOG_FORMAT, LOG_QUEUE_SIZE, LOG_INFO_RATE, LOG_SAMPLE_EVERY, LOG_DROP_SUMMARY_INTERVAL
+from metrics import LOG_RECORDS_DROPPED
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Fields attached to every record logged in the current context (and tasks created in it)
+_log_context: ContextVar[dict] = ContextVar("log_context", default={})
+_listener: Optional["LogWriter"] = None
+
+@contextmanager
+def log_context(**fields):
+    """Correlate records logged inside the block, e.g. with request_id and webhook_id (None values are left out)"""
+    token = _log_context.set({**_log_context.get(), **{name: value for name, value in fields.items() if value is not None}})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+def current_log_context() -> dict:
+    return _log_context.get()
+
+class ContextFilter(logging.Filter):
+    """Copies the log context onto the record while still on the logging thread"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.context = _log_context.get()
+        return True
+
+class InfoSampler(logging.Filter):
+    """Keeps the first rate info (and debug) records of every second and one in every
+    `every` after that; warnings and errors always pass. Runs before anything is formatted,
+    so a sampled-out record costs only its LogRecord."""
+
+    def __init__(self, rate: int = LOG_INFO_RATE, every: int = LOG_SAMPLE_EVERY):
+        super().__init__()
+        self.rate = rate
+        self.every = max(1, every)
+        self._second = 0
+        self._count = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate <= 0:
+            return True
+        second = int(time.monotonic())
+        if second != self._second:
+            self._second, self._count = second, 0
+        self._count += 1
+        if self._count <= self.rate or (self._count - self.rate) % self.every == 0:
+            return True
+        LOG_RECORDS_DROPPED.labels("sampled").inc()
+        return False
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        context = getattr(record, "context", None)
+        if not context:
+            return line
+        return f"{line} [{' '.join(f'{name}={value}' for name, value in context.items())}]"
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, the log context and any traceback"""
+
+    converter = time.gmtime
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": f"{self.formatTime(record, '%Y-%m-%dT%H:%M:%S')}.{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **getattr(record, "context", {})
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class AsyncLogHandler(QueueHandler):
+    """Hands records to a QueueListener thread, which formats and writes them.
+
+    QueueHandler.prepare would format every record on the caller; here it is left to the
+    writer thread, so a record's arguments are rendered there after the call and should be
+    values that do not change afterwards. Enqueueing never blocks: when the queue is full the
+    record is dropped and counted, warnings and errors under their own label, and the writer
+    reports how many were lost.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        # Only ever incremented here and read by the writer thread
+        self.dropped = {"info": 0, "warning": 0}
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno >= logging.WARNING:
+                self.dropped["warning"] += 1
+                LOG_RECORDS_DROPPED.labels("warning_dropped").inc()
+            else:
+                self.dropped["info"] += 1
+                LOG_RECORDS_DROPPED.labels("queue_full").inc()
+
+class LogWriter(QueueListener):
+    """Writes queued records and, at most every summary_interval seconds, a warning with the
+    number of records the handler dropped since the last one"""
+
+    def __init__(self, source: AsyncLogHandler, *handlers: logging.Handler,
+                 summary_interval: float = LOG_DROP_SUMMARY_INTERVAL):
+        super().__init__(source.queue, *handlers)
+        self.source = source
+        self.summary_interval = summary_interval
+        self._reported = dict(source.dropped)
+        self._reported_at = time.monotonic()
+
+    def handle(self, record: logging.LogRecord):
+        super().handle(record)
+        if time.monotonic() - self._reported_at >= self.summary_interval:
+            self.report_dropped()
+
+    def report_dropped(self):
+        self._reported_at = time.monotonic()
+        dropped = dict(self.source.dropped)
+        info, warnings = (dropped[level] - self._reported[level] for level in ("info", "warning"))
+        if info or warnings:
+            self._reported = dropped
+            super().handle(logging.makeLogRecord({
+                "name": __name__, "levelno": logging.WARNING, "levelname": "WARNING",
+                "msg": "Log queue full: dropped %d info and %d warning or error records",
+                "args": (info, warnings), "context": {}
+            }))
+
+    def enqueue_sentinel(self):
+        # Only the writer thread is waiting for this, so it may wait for room
+        self.queue.put(self._sentinel)
+
+    def stop(self):
+        super().stop()
+        self.report_dropped()
+
+def configure_logging(mode: str = LOG_MODE, log_format: str = LOG_FORMAT, stream: TextIO = sys.stdout,
+                      info_rate: int = LOG_INFO_RATE, sample_every: int = LOG_SAMPLE_EVERY,
+                      queue_size: int = LOG_QUEUE_SIZE):
+    """Route the root logger (and uvicorn's, given log_config=None) through one handler"""
+    global _listener
+    stop_logging()
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JsonFormatter() if log_format == "json" else TextFormatter(TEXT_FORMAT))
+    if mode == "async":
+        handler = AsyncLogHandler(queue.Queue(queue_size))
+        _listener = LogWriter(handler, output)
+        _listener.start()
+    else:
+        handler = output
+    handler.addFilter(InfoSampler(info_rate, sample_every))
+    handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for previous in root.handlers[:]:
+        root.removeHandler(previous)
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+
+@atexit.register
+def stop_logging():
+    """Write out the records still queued and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
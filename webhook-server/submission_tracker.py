@@ -0,0 +1,558 @@
+import asyncio
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+from hexbytes import HexBytes
+from web3.exceptions import TransactionNotFound
+from alert_journal import AlertJournal
+from blockchain_utils import BlockchainManager, PendingTransaction
+from metrics import ALERT_GAS, COALESCED, REORGED, STAGE_SECONDS, record_failure
+from nonce_manager import is_nonce_error
+from structured_logging import current_log_context, log_context
+from contract_config import (
+    SUBMISSION_WORKERS,
+    SUBMISSION_MAX_RETRIES,
+    MAX_TRACKED_SUBMISSIONS,
+    BATCH_MAX_SIZE,
+    BATCH_WINDOW_MS,
+    COALESCE_ALERTS,
+    COALESCE_MAX_REPLACEMENTS,
+    STUCK_TX_TIMEOUT,
+    MAX_FEE_REPLACEMENTS,
+    RECEIPT_POLL_INTERVAL
+)
+
+logger = logging.getLogger(__name__)
+
+class SubmissionStatus:
+    QUEUED = "queued"
+    BROADCAST = "broadcast"
+    MINED = "mined"
+    FAILED = "failed"
+    # Replaced by a newer alert for the same webhook ID before reaching chain
+    SUPERSEDED = "superseded"
+    FINAL = (MINED, FAILED, SUPERSEDED)
+
+class Submission:
+    def __init__(self, webhook_id: str, action: int, action_name: str, priority: int = 0):
+        self.webhook_id = webhook_id
+        self.action = action
+        self.action_name = action_name
+        # Lower goes first; test-mode alerts queue behind live ones
+        self.priority = priority
+        self.status = SubmissionStatus.QUEUED
+        self.attempts = 0
+        self.tx_hash: Optional[str] = None
+        self.block_number: Optional[int] = None
+        self.gas_used: Optional[int] = None
+        # Sequence number the oracle gave the alert in its AlertSubmitted event
+        self.alert_nonce: Optional[int] = None
+        self.batch_size: Optional[int] = None
+        self.error: Optional[str] = None
+        self.journal_id: Optional[int] = None
+        # Correlates the broadcast and receipt logs with the webhook request that accepted it
+        self.request_id: Optional[str] = current_log_context().get("request_id")
+        # Taken off the queue into a batch, so it can no longer be superseded in place
+        self.dispatched = False
+        self.queued_at = time.time()
+        self.updated_at = self.queued_at
+        self.broadcast_event = asyncio.Event()
+        self.done_event = asyncio.Event()
+
+    def update(self, status: str, **fields):
+        self.status = status
+        for name, value in fields.items():
+            setattr(self, name, value)
+        self.updated_at = time.time()
+        if status != SubmissionStatus.QUEUED:
+            self.broadcast_event.set()
+        if status in SubmissionStatus.FINAL:
+            self.done_event.set()
+
+    def to_dict(self) -> dict:
+        return {
+            "alert_id": self.webhook_id,
+            "status": self.status,
+            "action": self.action,
+            "action_name": self.action_name,
+            "attempts": self.attempts,
+            "tx_hash": self.tx_hash,
+            "block_number": self.block_number,
+            "gas_used": self.gas_used,
+            "alert_nonce": self.alert_nonce,
+            "batch_size": self.batch_size,
+            "error": self.error,
+            "queued_at": self.queued_at,
+            "updated_at": self.updated_at
+        }
+
+class InflightBatch:
+    """Submissions riding on one broadcast nonce, with the alerts each version sent for it carries"""
+
+    def __init__(self, submissions: list[Submission], pending: PendingTransaction):
+        self.submissions = submissions
+        self.pending = pending
+        self.versions: dict[str, list[Submission]] = {pending.tx_hashes[0].hex(): submissions}
+        self.replacements = 0
+        self.done = False
+
+    def add_version(self, submissions: list[Submission], tx_hash: HexBytes):
+        self.submissions = submissions
+        self.versions[tx_hash.hex()] = submissions
+        self.replacements += 1
+
+    def mined_version(self, tx_hash: HexBytes) -> list[Submission]:
+        # Fee bumps re-sign the latest version, so carry the alerts of the version before them
+        submissions = self.submissions
+        for sent in self.pending.tx_hashes:
+            submissions = self.versions.get(sent.hex(), submissions)
+            if sent == tx_hash:
+                break
+        return submissions
+
+class SubmissionTracker:
+    """Accept-then-confirm pipeline for alert submissions.
+
+    Webhook handlers enqueue an alert and return; a dispatcher per submitter shard groups
+    the alerts routed to that shard's account into batches of up to BATCH_MAX_SIZE (waiting at most BATCH_WINDOW_MS for a batch to fill),
+    broadcasts each batch as one transaction and starts a confirmation task that fans the
+    receipt back out to every alert in it, retrying failed submissions. The latest
+    submission per webhook ID is kept for status queries.
+
+    With a journal, alerts are durably recorded before enqueue returns and their state
+    is journaled as they progress, broadcasts with their nonce. On start, unfinished entries
+    are replayed: broadcast ones whose transaction was mined meanwhile are closed. Those
+    whose nonce is still open are taken over at that nonce, re-sent with bumped fees as a
+    replacement of the original, so only one of the two can be mined; if another version
+    of it (a fee bump) spent the nonce they are closed as mined. The rest are resubmitted.
+
+    With COALESCE_ALERTS, only the latest alert per webhook ID is kept in flight: a newer
+    alert supersedes a queued one in place, and replaces a broadcast but unmined one by
+    re-sending its transaction at the same nonce with higher fees (at most
+    COALESCE_MAX_REPLACEMENTS times per transaction). Whichever version gets mined wins;
+    alerts left out of it are resubmitted.
+
+    Mined alerts whose block is dropped by a reorg go back to broadcast and wait for their
+    transaction to be mined again; if it is not, they are resubmitted.
+    """
+
+    def __init__(self, blockchain_manager: BlockchainManager, journal: Optional[AlertJournal] = None):
+        self.blockchain_manager = blockchain_manager
+        self.journal = journal
+        # One priority queue and dispatcher per active submitter shard, keyed by shard index.
+        # Entries are (priority, sequence, submission) so equal priorities stay in order.
+        self.queues: dict[int, asyncio.PriorityQueue] = {
+            submitter.index: asyncio.PriorityQueue() for submitter in blockchain_manager.active_submitters
+        }
+        self._sequence = itertools.count()
+        self.submissions: OrderedDict[str, Submission] = OrderedDict()
+        self._inflight: dict[str, InflightBatch] = {}
+        self._broadcast_slots = asyncio.Semaphore(SUBMISSION_WORKERS)
+        self._dispatchers: list[asyncio.Task] = []
+        self._tasks: set[asyncio.Task] = set()
+        self._mined_listeners: list[Callable[[list[Submission]], None]] = []
+        # Settled batches by transaction hash, to reopen them if a reorg drops the transaction
+        self._mined: OrderedDict[str, list[Submission]] = OrderedDict()
+        blockchain_manager.block_follower.add_reorg_listener(self._on_reorg)
+
+    async def start(self):
+        if self.journal:
+            self.journal.start()
+            pruned = self.journal.prune(SubmissionStatus.FINAL)
+            if pruned:
+                logger.info(f"Pruned {pruned} finished journal entries")
+            await self._replay()
+        self._dispatchers = [asyncio.create_task(self._dispatch(queue)) for queue in self.queues.values()]
+        logger.info(f"Submission tracker started (batch size {BATCH_MAX_SIZE}, window {BATCH_WINDOW_MS}ms, "
+                    f"{len(self.queues)} submitter shards)")
+
+    async def stop(self):
+        tasks = list(self._tasks) + self._dispatchers
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._dispatchers = []
+        queued = self.backlog
+        if queued:
+            logger.warning(f"Submission tracker stopped with {queued} alerts still queued")
+        if self.journal:
+            await self.journal.close()
+
+    def add_mined_listener(self, listener: Callable[[list[Submission]], None]):
+        """Register a callback invoked with every batch of submissions once it is mined"""
+        self._mined_listeners.append(listener)
+
+    @property
+    def backlog(self) -> int:
+        """Alerts waiting to be broadcast"""
+        return sum(queue.qsize() for queue in self.queues.values())
+
+    async def enqueue(self, webhook_id: str, payload: dict, priority: int = 0) -> Submission:
+        action = self.blockchain_manager.action_from_payload(payload)
+        submission = Submission(webhook_id, action, self.blockchain_manager._action_to_name(action), priority)
+        if self.journal:
+            submission.journal_id = await self.journal.append(webhook_id, action)
+        previous = self.submissions.get(webhook_id)
+        self._track(submission)
+        
+        if COALESCE_ALERTS and previous is not None:
+            inflight = self._inflight.get(webhook_id)
+            if previous.status == SubmissionStatus.QUEUED and not previous.dispatched:
+                # Still waiting in the queue (or for a retry): it will be skipped there
+                self._supersede(previous, "queued")
+            elif (previous.status == SubmissionStatus.BROADCAST and inflight is not None
+                  and inflight.replacements < COALESCE_MAX_REPLACEMENTS):
+                submission.dispatched = True
+                self._spawn(self._replace(inflight, previous, submission))
+                return submission
+        self._put(submission)
+        return submission
+
+    def get_submission(self, webhook_id: str) -> Optional[dict]:
+        submission = self.submissions.get(webhook_id)
+        return submission.to_dict() if submission else None
+
+    def _track(self, submission: Submission):
+        self.submissions[submission.webhook_id] = submission
+        self.submissions.move_to_end(submission.webhook_id)
+        while len(self.submissions) > MAX_TRACKED_SUBMISSIONS:
+            self.submissions.popitem(last=False)
+
+    def _put(self, submission: Submission):
+        queue = self.queues[self.blockchain_manager.submitter_for(submission.webhook_id).index]
+        queue.put_nowait((submission.priority, next(self._sequence), submission))
+
+    def _supersede(self, submission: Submission, how: str):
+        submission.update(SubmissionStatus.SUPERSEDED)
+        self._journal([submission], SubmissionStatus.SUPERSEDED)
+        COALESCED.labels(how).inc()
+
+    def _requeue(self, submission: Submission):
+        # A retry must not land after a newer alert for the same webhook
+        if COALESCE_ALERTS and self.submissions.get(submission.webhook_id) not in (submission, None):
+            self._supersede(submission, "queued")
+            return
+        submission.dispatched = False
+        self._put(submission)
+
+    async def _replay(self):
+        entries = self.journal.unfinished(SubmissionStatus.FINAL)
+        if not entries:
+            return
+        
+        requeued = 0
+        # Broadcast alerts still waiting for their nonce, by account and nonce
+        unmined: dict[tuple[str, int], list[tuple[Submission, str]]] = {}
+        for entry in entries:
+            submission = Submission(entry["webhook_id"], entry["action"],
+                                    self.blockchain_manager._action_to_name(entry["action"]))
+            submission.journal_id = entry["id"]
+            self._track(submission)
+            
+            receipt = await self._find_receipt(entry["tx_hash"]) if entry["tx_hash"] else None
+            if receipt is not None:
+                status = SubmissionStatus.MINED if receipt.status == 1 else SubmissionStatus.FAILED
+                submission.update(status, tx_hash=entry["tx_hash"], block_number=receipt.blockNumber)
+                self._journal([submission], status)
+            elif entry["nonce"] is not None and self.blockchain_manager.submitter_at(entry["sender"]):
+                unmined.setdefault((entry["sender"], entry["nonce"]), []).append((submission, entry["tx_hash"]))
+            else:
+                self._put(submission)
+                requeued += 1
+        for (sender, nonce), sent in unmined.items():
+            await self._resume(sender, nonce, sent)
+        logger.info(f"Replayed {len(entries)} unfinished journal entries, resuming {len(unmined)} broadcast "
+                    f"transactions, resubmitting {requeued}")
+
+    async def _resume(self, sender: str, nonce: int, sent: list[tuple[Submission, str]]):
+        """Take over a transaction a previous process broadcast and did not see mined.
+
+        Resubmitting its alerts at a new nonce would let both transactions land. Instead
+        they are re-sent at the same nonce with fees bumped past the original, the way
+        coalescing replaces a transaction, and confirmed as usual.
+        """
+        w3 = self.blockchain_manager.w3
+        submissions = [submission for submission, _ in sent]
+        tx_hashes = list(dict.fromkeys(HexBytes(tx_hash) for _, tx_hash in sent))
+        if await w3.eth.get_transaction_count(sender, 'latest') > nonce:
+            # Spent without a receipt for the journaled hashes: by a fee bump of the same alerts
+            for submission in submissions:
+                submission.update(SubmissionStatus.MINED, tx_hash=None)
+            self._journal(submissions, SubmissionStatus.MINED)
+            logger.info(f"Nonce {nonce} of {sender} was spent by an unjournaled version, closing {len(submissions)} alerts")
+            return
+
+        await self.blockchain_manager.submitter_at(sender).nonce_manager.claim(nonce)
+        # Fees to outbid come from the original if the node still has it
+        transaction = {'from': sender, 'nonce': nonce}
+        for tx_hash in reversed(tx_hashes):
+            try:
+                original = await w3.eth.get_transaction(tx_hash)
+            except TransactionNotFound:
+                continue
+            transaction.update({field: original[field] for field in ('gasPrice', 'maxFeePerGas', 'maxPriorityFeePerGas')
+                                if original.get(field) is not None})
+            break
+        pending = PendingTransaction(transaction, tx_hashes[0])
+        pending.tx_hashes = tx_hashes
+        inflight = InflightBatch(submissions, pending)
+        for submission in submissions:
+            submission.attempts += 1
+            submission.dispatched = True
+            self._inflight[submission.webhook_id] = inflight
+        try:
+            tx_hash = await self.blockchain_manager.replace_alerts(
+                pending, [submission.webhook_id for submission in submissions], [submission.action for submission in submissions]
+            )
+        except Exception as e:
+            # E.g. underpriced against a fee bump of the original: wait for whatever holds the nonce
+            logger.warning(f"Could not re-send nonce {nonce} of {sender}, waiting for it to be spent: {e}")
+            for submission in submissions:
+                submission.update(SubmissionStatus.BROADCAST, tx_hash=tx_hashes[-1].hex(), batch_size=len(submissions))
+            self._spawn(self._await_nonce(inflight, sender))
+            return
+        inflight.add_version(submissions, tx_hash)
+        self._journal(submissions, SubmissionStatus.BROADCAST, tx_hash.hex(), pending.transaction)
+        for submission in submissions:
+            submission.update(SubmissionStatus.BROADCAST, tx_hash=tx_hash.hex(), batch_size=len(submissions))
+        self._spawn(self._confirm(inflight))
+
+    async def _await_nonce(self, inflight: InflightBatch, sender: str):
+        """Close a taken-over batch once its nonce is spent, which only a version of it can do,
+        or resubmit it if that does not happen as long as a stuck transaction is given"""
+        nonce_manager = self.blockchain_manager.submitter_at(sender).nonce_manager
+        nonce = inflight.pending.nonce
+        deadline = time.monotonic() + STUCK_TX_TIMEOUT * (MAX_FEE_REPLACEMENTS + 1)
+        spent = False
+        try:
+            while not spent and time.monotonic() < deadline:
+                await asyncio.sleep(RECEIPT_POLL_INTERVAL)
+                try:
+                    spent = await self.blockchain_manager.w3.eth.get_transaction_count(sender, 'latest') > nonce
+                except Exception as e:
+                    logger.warning(f"Checking nonce {nonce} of {sender} failed: {e}")
+        finally:
+            nonce_manager.confirm(nonce)
+        self._settle(inflight)
+        if spent:
+            for submission in inflight.submissions:
+                submission.update(SubmissionStatus.MINED, tx_hash=None)
+            self._journal(inflight.submissions, SubmissionStatus.MINED)
+            return
+        logger.error(f"Nonce {nonce} of {sender} was not spent, resubmitting {len(inflight.submissions)} alerts")
+        await nonce_manager.resync()
+        self._retry_or_fail(inflight.submissions, f"Transaction at nonce {nonce} was not mined")
+
+    async def _find_receipt(self, tx_hash: str):
+        try:
+            return await self.blockchain_manager.w3.eth.get_transaction_receipt(HexBytes(tx_hash))
+        except TransactionNotFound:
+            return None
+
+    def _journal(self, batch: list[Submission], status: str, tx_hash: Optional[str] = None,
+                 transaction: Optional[dict] = None):
+        journal_ids = [submission.journal_id for submission in batch if submission.journal_id is not None]
+        if self.journal and journal_ids:
+            nonce, sender = (transaction['nonce'], transaction['from']) if transaction else (None, None)
+            self.journal.update(journal_ids, status, tx_hash, nonce, sender)
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, queue: asyncio.PriorityQueue):
+        while True:
+            batch = await self._next_batch(queue)
+            await self._broadcast_slots.acquire()
+            # The broadcast task inherits the context it is created in
+            with log_context(**self._log_fields(batch)):
+                self._spawn(self._broadcast(batch))
+
+    @staticmethod
+    def _log_fields(batch: list[Submission]) -> dict:
+        if len(batch) == 1:
+            return {"webhook_id": batch[0].webhook_id, "request_id": batch[0].request_id}
+        return {"webhook_ids": [submission.webhook_id for submission in batch],
+                "request_ids": [submission.request_id for submission in batch]}
+
+    async def _next_batch(self, queue: asyncio.PriorityQueue) -> list[Submission]:
+        batch = []
+        loop = asyncio.get_running_loop()
+        deadline = None
+        while len(batch) < BATCH_MAX_SIZE:
+            if not batch:
+                _, _, submission = await queue.get()
+            elif not queue.empty():
+                _, _, submission = queue.get_nowait()
+            else:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    _, _, submission = await asyncio.wait_for(queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+            if submission.status == SubmissionStatus.SUPERSEDED:
+                continue
+            if not batch:
+                deadline = loop.time() + BATCH_WINDOW_MS / 1000
+            if submission.attempts == 0:
+                STAGE_SECONDS.labels("queue_wait").observe(time.time() - submission.queued_at)
+            submission.dispatched = True
+            batch.append(submission)
+        return batch
+
+    async def _broadcast(self, batch: list[Submission]):
+        try:
+            for submission in batch:
+                submission.attempts += 1
+            try:
+                if len(batch) == 1:
+                    transaction, tx_hash = await self.blockchain_manager.broadcast_alert(batch[0].webhook_id, batch[0].action)
+                else:
+                    transaction, tx_hash = await self.blockchain_manager.broadcast_alerts(
+                        [submission.webhook_id for submission in batch],
+                        [submission.action for submission in batch]
+                    )
+            except Exception as e:
+                logger.error(f"Broadcast failed for batch of {len(batch)} alerts: {e}")
+                record_failure("broadcast", "nonce" if is_nonce_error(e) else type(e).__name__)
+                self._retry_or_fail(batch, str(e))
+                return
+        finally:
+            self._broadcast_slots.release()
+
+        for submission in batch:
+            submission.update(SubmissionStatus.BROADCAST, tx_hash=tx_hash.hex(), batch_size=len(batch))
+        self._journal(batch, SubmissionStatus.BROADCAST, tx_hash.hex(), transaction)
+        inflight = InflightBatch(batch, PendingTransaction(transaction, tx_hash))
+        for submission in batch:
+            self._inflight[submission.webhook_id] = inflight
+        await self._confirm(inflight)
+
+    async def _replace(self, inflight: InflightBatch, previous: Submission, submission: Submission):
+        submissions = [submission if queued is previous else queued for queued in inflight.submissions]
+        submission.attempts += 1
+        try:
+            if inflight.done:
+                raise RuntimeError("transaction already confirmed")
+            tx_hash = await self.blockchain_manager.replace_alerts(
+                inflight.pending,
+                [queued.webhook_id for queued in submissions],
+                [queued.action for queued in submissions]
+            )
+        except Exception as e:
+            # Usually the previous version got mined first ("nonce too low")
+            logger.info(f"Could not replace {previous.tx_hash} for {submission.webhook_id}, submitting separately: {e}")
+            submission.attempts -= 1
+            self._requeue(submission)
+            return
+        
+        inflight.add_version(submissions, tx_hash)
+        submission.update(SubmissionStatus.BROADCAST, tx_hash=tx_hash.hex(), batch_size=len(submissions))
+        self._journal([submission], SubmissionStatus.BROADCAST, tx_hash.hex(), inflight.pending.transaction)
+        self._supersede(previous, "replaced")
+        logger.info("Replaced %s with %s for %s (%s -> %s)", previous.tx_hash, tx_hash.hex(), submission.webhook_id,
+                    previous.action_name, submission.action_name)
+
+    async def _confirm(self, inflight: InflightBatch):
+        pending = inflight.pending
+        try:
+            receipt, tx_hash = await self.blockchain_manager.wait_for_receipt(pending.transaction, pending.tx_hashes[0], pending)
+        except Exception as e:
+            self._settle(inflight)
+            batch = inflight.submissions
+            logger.error(f"Confirmation failed for {pending.tx_hashes[-1].hex()} ({len(batch)} alerts): {e}")
+            record_failure("receipt_wait", "timeout" if isinstance(e, TimeoutError) else type(e).__name__)
+            self._retry_or_fail(batch, str(e))
+            return
+        
+        self._settle(inflight)
+        batch = inflight.mined_version(tx_hash)
+        # Replacements that lost the race to an earlier version go out in a new transaction
+        for submission in inflight.submissions:
+            if submission not in batch:
+                submission.update(SubmissionStatus.QUEUED, tx_hash=None)
+                self._requeue(submission)
+        self._finish(batch, receipt, tx_hash)
+
+    def _finish(self, batch: list[Submission], receipt, tx_hash: HexBytes):
+        self._mined[tx_hash.hex()] = batch
+        self._mined.move_to_end(tx_hash.hex())
+        while len(self._mined) > MAX_TRACKED_SUBMISSIONS:
+            self._mined.popitem(last=False)
+
+        if receipt.status != 1:
+            # Reverts are deterministic, resubmitting would revert again
+            for submission in batch:
+                submission.update(SubmissionStatus.FAILED, tx_hash=tx_hash.hex(), block_number=receipt.blockNumber,
+                                  error=f"Transaction failed: {tx_hash.hex()}")
+            logger.error(f"Alert transaction reverted: {tx_hash.hex()} ({len(batch)} alerts)")
+            record_failure("receipt_wait", "reverted")
+            self._journal(batch, SubmissionStatus.FAILED, tx_hash.hex())
+            return
+
+        alert_nonces = self.blockchain_manager.alert_nonces(receipt)
+        for submission in batch:
+            submission.update(SubmissionStatus.MINED, tx_hash=tx_hash.hex(), block_number=receipt.blockNumber,
+                              gas_used=receipt.gasUsed // len(batch), alert_nonce=alert_nonces.get(submission.webhook_id),
+                              error=None)
+            # From acceptance to the receipt, across retries and replacements
+            STAGE_SECONDS.labels("inclusion").observe(submission.updated_at - submission.queued_at)
+            ALERT_GAS.observe(submission.gas_used)
+        self._journal(batch, SubmissionStatus.MINED, tx_hash.hex())
+        logger.info("Alerts mined: %s in block %s (%s alerts)", tx_hash.hex(), receipt.blockNumber, len(batch))
+        for listener in self._mined_listeners:
+            try:
+                listener(batch)
+            except Exception as e:
+                logger.error(f"Mined listener failed: {e}")
+
+    def _on_reorg(self, tx_hashes: list[HexBytes]):
+        for tx_hash in tx_hashes:
+            batch = self._mined.pop(tx_hash.hex(), None) or []
+            # Alerts retried or replaced since then have moved on to another transaction
+            reopened = [submission for submission in batch if submission.tx_hash == tx_hash.hex()
+                        and submission.status in (SubmissionStatus.MINED, SubmissionStatus.FAILED)]
+            if not reopened:
+                continue
+            for submission in reopened:
+                submission.update(SubmissionStatus.BROADCAST, block_number=None, gas_used=None, alert_nonce=None, error=None)
+            self._journal(reopened, SubmissionStatus.BROADCAST, tx_hash.hex())
+            REORGED.inc(len(reopened))
+            logger.warning(f"Reorg dropped {tx_hash.hex()} ({len(reopened)} alerts), waiting for it to be mined again")
+            self._spawn(self._reconfirm(reopened, tx_hash))
+
+    async def _reconfirm(self, batch: list[Submission], tx_hash: HexBytes):
+        # The transaction is normally back in the mempool and gets included again at the same nonce
+        try:
+            mined = await self.blockchain_manager.block_follower.wait([tx_hash], STUCK_TX_TIMEOUT * (MAX_FEE_REPLACEMENTS + 1))
+        except Exception as e:
+            mined = None
+            logger.error(f"Waiting for reorged {tx_hash.hex()} failed: {e}")
+        if mined is None:
+            logger.error(f"Reorged transaction {tx_hash.hex()} was not mined again, resubmitting {len(batch)} alerts")
+            record_failure("receipt_wait", "reorged")
+            self._retry_or_fail(batch, f"Transaction dropped by a chain reorganization: {tx_hash.hex()}")
+            return
+        self._finish(batch, *mined)
+
+    def _retry_or_fail(self, batch: list[Submission], error: str):
+        loop = asyncio.get_running_loop()
+        for submission in batch:
+            if submission.attempts > SUBMISSION_MAX_RETRIES:
+                submission.update(SubmissionStatus.FAILED, error=error)
+                self._journal([submission], SubmissionStatus.FAILED)
+                continue
+            submission.update(SubmissionStatus.QUEUED, error=error)
+            loop.call_later(2 ** submission.attempts, self._requeue, submission)
+
+    def _settle(self, inflight: InflightBatch):
+        inflight.done = True
+        for submissions in inflight.versions.values():
+            for submission in submissions:
+                if self._inflight.get(submission.webhook_id) is inflight:
+                    del self._inflight[submission.webhook_id]
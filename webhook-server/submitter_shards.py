@@ -0,0 +1,148 @@
+import asyncio
+import bisect
+import hashlib
+import logging
+from typing import Optional
+from eth_account import Account
+from web3 import AsyncWeb3
+from contract_config import SHARD_MIN_BALANCE_ETH, SHARD_TOPUP_ETH, SHARD_FUNDING_INTERVAL
+from metrics import SHARD_BALANCE
+from nonce_manager import NonceManager
+
+logger = logging.getLogger(__name__)
+
+class Submitter:
+    """One signing account with its own nonce stream. Shard 0 is the master account."""
+
+    def __init__(self, w3: AsyncWeb3, private_key: str, index: int):
+        self.index = index
+        self.private_key = private_key
+        self.account = Account.from_key(private_key)
+        self.address = self.account.address
+        self.nonce_manager = NonceManager(w3, self.address)
+        # Extra shards only take alerts once authorized and funded
+        self.active = index == 0
+        self.balance_eth: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "shard": self.index,
+            "address": self.address,
+            "active": self.active,
+            "balance_eth": self.balance_eth,
+            "in_flight": self.nonce_manager.in_flight
+        }
+
+class ShardRing:
+    """Consistent hash ring from webhook IDs to submitters.
+
+    Every alert for a webhook ID goes through the same account, so its transactions are
+    ordered by that account's nonces. Each submitter owns `replicas` points on the ring,
+    keyed on its address, so adding or removing a shard only moves the webhook IDs it
+    gains or loses.
+    """
+
+    def __init__(self, submitters: list[Submitter], replicas: int = 64):
+        points = sorted(
+            ((self._hash(f"{submitter.address}:{replica}"), submitter) for submitter in submitters
+             for replica in range(replicas)),
+            key=lambda point: point[0]
+        )
+        self._hashes = [point[0] for point in points]
+        self._submitters = [point[1] for point in points]
+
+    def get(self, webhook_id: str) -> Submitter:
+        index = bisect.bisect(self._hashes, self._hash(webhook_id)) % len(self._hashes)
+        return self._submitters[index]
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.sha256(value.encode()).digest()[:8], "big")
+
+class ShardFunder:
+    """Authorizes extra submitter shards on the oracle and keeps them funded.
+
+    On start, shards without SUBMITTER_ROLE are granted it with addAuthorizedSubmitter from
+    the master account (which must own the oracle), and shards below SHARD_MIN_BALANCE_ETH
+    receive SHARD_TOPUP_ETH from it. Shards that end up authorized and funded are activated;
+    the set stays fixed afterwards so webhook IDs keep their shard. Balances are re-checked
+    every SHARD_FUNDING_INTERVAL seconds.
+    """
+
+    def __init__(self, blockchain_manager):
+        self.blockchain_manager = blockchain_manager
+        self.w3 = blockchain_manager.w3
+        self.min_balance = self.w3.to_wei(SHARD_MIN_BALANCE_ETH, 'ether')
+        self.topup = self.w3.to_wei(SHARD_TOPUP_ETH, 'ether')
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def shards(self) -> list[Submitter]:
+        return self.blockchain_manager.submitters[1:]
+
+    async def start(self):
+        contract = self.blockchain_manager.contract
+        owner = await contract.functions.owner().call()
+        role = await contract.functions.SUBMITTER_ROLE().call()
+        await asyncio.gather(*(self._set_up(shard, owner, role) for shard in self.shards))
+        active = [shard.index for shard in self.shards if shard.active]
+        logger.info(f"Submitter shards active: 0 (master), {', '.join(map(str, active)) or 'no extra shards'}")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _set_up(self, shard: Submitter, owner: str, role: int):
+        try:
+            shard.active = await self._authorize(shard, owner, role) and await self._top_up(shard)
+        except Exception as e:
+            logger.error(f"Submitter shard {shard.index} ({shard.address}) setup failed: {e}")
+
+    async def _authorize(self, shard: Submitter, owner: str, role: int) -> bool:
+        contract = self.blockchain_manager.contract
+        if await contract.functions.hasAnyRole(shard.address, role).call():
+            return True
+        if owner.lower() != self.blockchain_manager.account.address.lower():
+            logger.error(f"Submitter shard {shard.index} ({shard.address}) lacks SUBMITTER_ROLE; "
+                         f"grant it with addAuthorizedSubmitter from the oracle owner {owner}")
+            return False
+
+        receipt = await self.blockchain_manager.send_admin_transaction({
+            'to': contract.address,
+            'data': contract.encode_abi("addAuthorizedSubmitter", args=[shard.address])
+        })
+        if receipt.status != 1:
+            logger.error(f"addAuthorizedSubmitter reverted for shard {shard.index} ({shard.address})")
+            return False
+        logger.info(f"Granted SUBMITTER_ROLE to shard {shard.index} ({shard.address})")
+        return True
+
+    async def _top_up(self, shard: Submitter) -> bool:
+        """Fund the shard if it is below the minimum balance; whether it can pay for alerts"""
+        balance = await self.w3.eth.get_balance(shard.address)
+        if balance < self.min_balance and self.topup > 0:
+            receipt = await self.blockchain_manager.send_admin_transaction({'to': shard.address, 'value': self.topup})
+            if receipt.status == 1:
+                balance += self.topup
+                logger.info(f"Topped up shard {shard.index} ({shard.address}) with {SHARD_TOPUP_ETH} ETH")
+        shard.balance_eth = float(self.w3.from_wei(balance, 'ether'))
+        SHARD_BALANCE.labels(str(shard.index)).set(shard.balance_eth)
+        if balance < self.min_balance:
+            logger.warning(f"Submitter shard {shard.index} ({shard.address}) balance {shard.balance_eth} ETH "
+                           f"is below {SHARD_MIN_BALANCE_ETH} ETH")
+            return False
+        return True
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(SHARD_FUNDING_INTERVAL)
+            for shard in self.shards:
+                if not shard.active:
+                    continue
+                try:
+                    await self._top_up(shard)
+                except Exception as e:
+                    logger.warning(f"Top-up of shard {shard.index} ({shard.address}) failed: {e}")
@@ -0,0 +1,83 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Optional
+from contract_config import CAPTURE_PATH, CAPTURE_FLUSH_INTERVAL, CAPTURE_MAX_BUFFER
+
+logger = logging.getLogger(__name__)
+
+class TrafficCapture:
+    """Records authenticated webhook arrivals for replay by benchmarks/replay.py.
+
+    The request path only appends a tuple to an in-memory buffer; a background task writes
+    the buffer out every CAPTURE_FLUSH_INTERVAL seconds from a worker thread, one JSON line
+    per arrival: {"ts", "webhook_id", "action", "key"}. Bodies are never recorded. "key" is
+    a short digest of the idempotency key (the Idempotency-Key header, or the hash of the
+    body), enough to tell a repeated delivery from a new alert on replay without keeping
+    anything derived from the secret in recoverable form.
+    """
+
+    def __init__(self, path: str = CAPTURE_PATH):
+        self.path = path
+        self._buffer: list[tuple[float, str, str, str]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.captured = 0
+        self.dropped = 0
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Capturing webhook arrivals to {self.path}")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._flush()
+
+    def record(self, webhook_id: str, action: str, idempotency_key: str):
+        if len(self._buffer) >= CAPTURE_MAX_BUFFER:
+            self.dropped += 1
+            return
+        self._buffer.append((time.time(), webhook_id, action, idempotency_key))
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "captured": self.captured,
+            "buffered": len(self._buffer),
+            "dropped": self.dropped
+        }
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(CAPTURE_FLUSH_INTERVAL)
+            try:
+                await self._flush()
+            except OSError as e:
+                logger.error(f"Writing traffic capture failed: {e}")
+
+    async def _flush(self):
+        if not self._buffer:
+            return
+        arrivals, self._buffer = self._buffer, []
+        await asyncio.to_thread(self._write, arrivals)
+        self.captured += len(arrivals)
+
+    def _write(self, arrivals: list[tuple[float, str, str, str]]):
+        lines = "".join(
+            json.dumps({
+                "ts": round(timestamp, 6),
+                "webhook_id": webhook_id,
+                "action": action,
+                "key": hashlib.sha256(idempotency_key.encode()).hexdigest()[:16]
+            }) + "\n"
+            for timestamp, webhook_id, action, idempotency_key in arrivals
+        )
+        with open(self.path, "a") as capture:
+            capture.write(lines)
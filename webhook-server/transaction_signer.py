@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+from eth_account import Account
+from eth_keys.backends import get_default_backend_class
+from hexbytes import HexBytes
+from contract_config import SIGNER_MODE, SIGNER_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# Keys of the submitter accounts, set once per worker process by the pool initializer
+_worker_keys: dict[str, str] = {}
+
+def _init_worker(keys: dict[str, str]):
+    _worker_keys.update(keys)
+
+def _sign_batch(transactions: list[dict], keys: Optional[dict[str, str]] = None) -> list[tuple[bytes, bytes]]:
+    """Sign and RLP-encode transactions, returning (raw transaction, hash) pairs"""
+    keys = keys or _worker_keys
+    signed = [Account.sign_transaction(transaction, keys[transaction['from']]) for transaction in transactions]
+    return [(bytes(transaction.raw_transaction), bytes(transaction.hash)) for transaction in signed]
+
+def native_backend() -> bool:
+    """Whether eth_keys signs with coincurve (libsecp256k1) rather than pure Python"""
+    return "CoinCurve" in get_default_backend_class()
+
+def _resolve_mode(mode: str, workers: int) -> str:
+    if mode == "auto":
+        mode = "thread" if native_backend() else "process"
+    return mode if workers > 0 else "inline"
+
+def _process_context() -> multiprocessing.context.BaseContext:
+    # Forking a process that runs an event loop and HTTP sessions is unsafe; workers
+    # are forked from a clean server process that only imports this module
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+def start_fork_server(mode: str = SIGNER_MODE, workers: int = SIGNER_WORKERS):
+    """Start the server signing workers are forked from ahead of the pool (which needs the
+    keys), so its imports run while the keys are derived and the RPC connection opens"""
+    if _resolve_mode(mode, workers) == "process" and "forkserver" in multiprocessing.get_all_start_methods():
+        from multiprocessing import forkserver
+        _process_context()
+        forkserver.ensure_running()
+
+class TransactionSigner:
+    """Signs transactions away from the event loop.
+
+    secp256k1 signing and RLP/keccak encoding are CPU-bound, and with the pure Python
+    backend they hold the GIL, so in "process" mode they run in a pool of worker processes
+    that receive the submitter keys once at startup. Signing requests issued while the
+    previous ones are being handed over are grouped into one call per worker, so a burst
+    pays the inter-process round trip once per batch rather than once per transaction.
+    """
+
+    def __init__(self, keys: dict[str, str], mode: str = SIGNER_MODE, workers: int = SIGNER_WORKERS):
+        self.keys = keys
+        self.mode = _resolve_mode(mode, workers)
+        self.workers = workers
+        self._executor: Optional[Executor] = None
+        self._pending: list[tuple[dict, asyncio.Future]] = []
+
+    async def start(self):
+        if self.mode == "process":
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=_process_context(),
+                                                 initializer=_init_worker, initargs=(self.keys,))
+            # Spawn the workers now rather than on the first alert
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(loop.run_in_executor(self._executor, _sign_batch, []) for _ in range(self.workers)))
+        elif self.mode == "thread":
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="signer")
+        logger.info(f"Transaction signer started ({self.mode}, {self.workers} workers, "
+                    f"{'coincurve' if native_backend() else 'pure Python'} secp256k1)")
+
+    async def close(self):
+        if self._executor:
+            # Waiting lets the pool stop its workers instead of orphaning them on exit
+            await asyncio.to_thread(self._executor.shutdown, wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def sign(self, transaction: dict) -> tuple[bytes, HexBytes]:
+        """Signed raw transaction and its hash"""
+        if self._executor is None:
+            raw_transaction, tx_hash = _sign_batch([transaction], self.keys)[0]
+            return raw_transaction, HexBytes(tx_hash)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((transaction, future))
+        if len(self._pending) == 1:
+            asyncio.get_running_loop().call_soon(self._flush)
+        raw_transaction, tx_hash = await future
+        return raw_transaction, HexBytes(tx_hash)
+
+    async def sign_many(self, transactions: list[dict]) -> list[tuple[bytes, HexBytes]]:
+        return await asyncio.gather(*(self.sign(transaction) for transaction in transactions))
+
+    def _flush(self):
+        pending, self._pending = self._pending, []
+        if self._executor is None:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(RuntimeError("Transaction signer closed"))
+            return
+
+        loop = asyncio.get_running_loop()
+        chunk = -(-len(pending) // self.workers)
+        for start in range(0, len(pending), chunk):
+            batch = pending[start:start + chunk]
+            keys = self.keys if self.mode == "thread" else None
+            signed = loop.run_in_executor(self._executor, _sign_batch, [transaction for transaction, _ in batch], keys)
+            signed.add_done_callback(lambda done, batch=batch: self._resolve(batch, done))
+
+    @staticmethod
+    def _resolve(batch: list[tuple[dict, asyncio.Future]], done: asyncio.Future):
+        error = done.exception() if not done.cancelled() else asyncio.CancelledError()
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(done.result()[index])
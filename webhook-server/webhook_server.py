@@ -1,15 +1,53 @@
+import asyncio
 import logging
 import json
-import uuid
 import hmac
 import hashlib
+import itertools
+import secrets
 import time
+from contextlib import contextmanager
 from typing import Optional
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
+from starlette.types import Receive
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from dstack_sdk import AsyncTappdClient, DeriveKeyResponse
-from blockchain_utils import BlockchainManager
-from contract_config import CONTRACT_ADDRESS, TEE_SECRET
+from admission import AdmissionController, Lane
+from fast_lane import FastJSONResponse, WebhookFastLane, read_body
+from blockchain_utils import BlockchainManager, action_from_payload
+from submission_tracker import SubmissionTracker, SubmissionStatus
+from alert_cache import AlertCache
+from alert_dedup import AlertDeduplicator, RPC_CALLS_PER_SUBMISSION
+from alert_indexer import AlertIndexer, AlertStore
+from alert_journal import AlertJournal
+from alert_callbacks import AlertCallbacks
+from traffic_capture import TrafficCapture
+from structured_logging import log_context
+from leader_lock import LeaderLock
+from signer_ipc import SignerClient, SignerEndpoint, SignerUnavailable
+from metrics import (
+    ALERTS, DEDUP_SAVED_GAS, DEDUP_SAVED_RPC_CALLS, DUPLICATES, MetricsCollector, record_failure, stage, startup_profile
+)
+from transaction_signer import start_fork_server
+from contract_config import (
+    CONTRACT_ADDRESS,
+    TEE_SECRET,
+    TEE_LIVENESS_TTL,
+    ACCEPT_MODE,
+    BROADCAST_WAIT_TIMEOUT,
+    DEDUP_SKIP_UNCHANGED,
+    SUBMITTER_SHARDS,
+    WEBHOOK_BULK_MAX,
+    ALERT_CALLBACK_URLS,
+    CAPTURE_PATH,
+    SERVER_ROLE,
+    SIGNER_LISTEN,
+    STARTUP_RETRY_DELAY,
+    STARTUP_RETRY_MAX_DELAY,
+    WEBHOOK_FAST_LANE
+)
 
 logger = logging.getLogger(__name__)
 
@@ -23,81 +61,205 @@ class TradingViewIPValidator:
     def verify_ip(cls, client_ip: str) -> bool:
         return client_ip in cls.TRADINGVIEW_IPS
 
-def generate_webhook_with_secret(secret: bytes) -> tuple[str, str]:
-    # 4 bytes timestamp + 12 bytes HMAC = 16 bytes total for webhook ID
-    # Remaining 20 bytes of HMAC used as verification secret
+# Webhook IDs are 16 bytes: an HMAC message followed by the start of its HMAC, whose next
+# 20 bytes are the verification secret. The message used to be a 4-byte timestamp, so IDs
+# created in the same second were identical; it is now the timestamp and a 4-byte salt
+# from a per-process counter (8-byte message, 8-byte signature). IDs in the old layout
+# still verify.
+SALTED_MESSAGE_LENGTH = 8
+LEGACY_MESSAGE_LENGTH = 4
+SECRET_LENGTH = 20
+
+# Starts at a random offset so processes started in the same second use different salts
+_webhook_salts = itertools.count(secrets.randbits(32))
+
+def generate_webhooks_with_secret(secret: bytes, count: int) -> list[tuple[str, str]]:
+    """count unique (webhook ID, verification secret) pairs"""
     timestamp = int(time.time()).to_bytes(4, 'big')
-    full_signature = hmac.new(secret, timestamp, hashlib.sha256).digest()  # 32 bytes
+    webhooks = []
+    for _ in range(count):
+        message = timestamp + (next(_webhook_salts) & 0xFFFFFFFF).to_bytes(4, 'big')
+        full_signature = hmac.digest(secret, message, 'sha256')  # 32 bytes
+        
+        webhook_id = (message + full_signature[:SALTED_MESSAGE_LENGTH]).hex()
+        webhook_id = f"{webhook_id[:8]}-{webhook_id[8:12]}-{webhook_id[12:16]}-{webhook_id[16:20]}-{webhook_id[20:]}"
+        verification_secret = full_signature[SALTED_MESSAGE_LENGTH:SALTED_MESSAGE_LENGTH + SECRET_LENGTH].hex()
+        webhooks.append((webhook_id, verification_secret))
+    return webhooks
+
+def generate_webhook_with_secret(secret: bytes) -> tuple[str, str]:
+    return generate_webhooks_with_secret(secret, 1)[0]
+
+def webhook_id_bytes(webhook_id: str) -> Optional[bytes]:
+    """The 16 bytes of a webhook ID in UUID form (hyphenated or 32 hex digits), or None"""
+    if len(webhook_id) == 36:
+        if webhook_id[8] != '-' or webhook_id[13] != '-' or webhook_id[18] != '-' or webhook_id[23] != '-':
+            return None
+        webhook_id = webhook_id.replace('-', '')
+    if len(webhook_id) != 32:
+        return None
+    try:
+        webhook_bytes = bytes.fromhex(webhook_id)
+    except ValueError:
+        return None
+    # fromhex skips whitespace, which would leave fewer than 16 bytes
+    return webhook_bytes if len(webhook_bytes) == 16 else None
+
+def _verify_layout(webhook_bytes: bytes, master_secret: bytes, message_length: int,
+                   provided_secret: Optional[bytes] = None) -> bool:
+    """Check an ID (and secret) against one layout, with a single HMAC operation"""
+    signature_length = 16 - message_length
+    full_signature = hmac.digest(master_secret, webhook_bytes[:message_length], 'sha256')
     
-    # Use first 12 bytes for webhook ID
-    webhook_signature = full_signature[:12]
-    webhook_bytes = timestamp + webhook_signature
-    webhook_id = str(uuid.UUID(bytes=webhook_bytes))
+    # Use constant-time comparison to prevent timing attacks
+    id_valid = hmac.compare_digest(webhook_bytes[message_length:], full_signature[:signature_length])
+    if provided_secret is None:
+        return id_valid
     
-    # Use remaining 20 bytes as verification secret
-    verification_secret = full_signature[12:].hex()  # 20 bytes as hex string
+    # The secret is compared as its ASCII hex bytes
+    expected_secret = full_signature[signature_length:signature_length + SECRET_LENGTH].hex().encode()
+    secret_valid = hmac.compare_digest(provided_secret, expected_secret)
     
-    return webhook_id, verification_secret
+    return id_valid and secret_valid
 
 def verify_webhook_id(webhook_id: str, secret: bytes) -> bool:
-    try:
-        webhook_uuid = uuid.UUID(webhook_id)
-        webhook_bytes = webhook_uuid.bytes
-        
-        if len(webhook_bytes) != 16:
-            return False
-            
-        # Extract timestamp and signature components
-        timestamp = webhook_bytes[:4]
-        provided_signature = webhook_bytes[4:]
-        expected_signature = hmac.new(secret, timestamp, hashlib.sha256).digest()[:12]
-        
-        # Use constant-time comparison to prevent timing attacks
-        return hmac.compare_digest(provided_signature, expected_signature)
-        
-    except (ValueError, TypeError):
+    webhook_bytes = webhook_id_bytes(webhook_id)
+    if webhook_bytes is None:
+        return False
+    return (_verify_layout(webhook_bytes, secret, SALTED_MESSAGE_LENGTH) or
+            _verify_layout(webhook_bytes, secret, LEGACY_MESSAGE_LENGTH))
+
+def verify_webhook_id_and_secret(webhook_id: str, provided_secret: bytes, master_secret: bytes) -> bool:
+    """Verify both webhook ID and secret, trying the salted layout before the legacy one"""
+    webhook_bytes = webhook_id_bytes(webhook_id)
+    if webhook_bytes is None:
         return False
+    return (_verify_layout(webhook_bytes, master_secret, SALTED_MESSAGE_LENGTH, provided_secret) or
+            _verify_layout(webhook_bytes, master_secret, LEGACY_MESSAGE_LENGTH, provided_secret))
 
-def verify_webhook_id_and_secret(webhook_id: str, provided_secret: str, master_secret: bytes) -> bool:
-    """Verify both webhook ID and secret in a single HMAC operation"""
+def parse_action_secret(body: bytes) -> tuple[str, bytes]:
+    """Action and secret from an ACTION_SECRET (or legacy JSON) body, parsed as bytes"""
+    message = body.strip()
+    
+    # Handle both JSON (legacy) and ACTION_SECRET formats
+    if message.startswith(b'{'):
+        try:
+            payload = json.loads(message)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise HTTPException(status_code=400, detail="Invalid JSON format")
+        if not isinstance(payload, dict) or 'action' not in payload or 'secret' not in payload:
+            raise HTTPException(status_code=400, detail="JSON must contain 'action' and 'secret' fields")
+        action, secret = payload['action'], payload['secret']
+        if not isinstance(action, str) or not isinstance(secret, str):
+            raise HTTPException(status_code=400, detail="JSON 'action' and 'secret' must be strings")
+        return action, secret.encode('utf-8', 'surrogatepass')
+    
+    # Parse ACTION_SECRET format, splitting on the first underscore only
+    action, separator, secret = message.partition(b'_')
+    if not separator:
+        raise HTTPException(status_code=400, detail="Message must be in ACTION_SECRET format (e.g., 'buy_abc123')")
+    if not action or not secret:
+        raise HTTPException(status_code=400, detail="Both action and secret must be non-empty")
     try:
-        webhook_uuid = uuid.UUID(webhook_id)
-        webhook_bytes = webhook_uuid.bytes
-        
-        if len(webhook_bytes) != 16:
-            return False
+        return action.decode('utf-8'), secret
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Action must be UTF-8")
+
+class TEEProcessor:
+    """Derives keys from the TEE through one shared client.
+
+    Derived keys are deterministic per path, so each is fetched once and served from
+    memory afterwards; the cached buffers are zeroed on shutdown. TEE liveness is probed
+    at most once per TEE_LIVENESS_TTL in the background so health checks never wait on it.
+    """
+
+    def __init__(self):
+        self.client = AsyncTappdClient()
+        self._keys: dict[str, bytearray] = {}
+        self._key_locks: dict[str, asyncio.Lock] = {}
+        self._available: Optional[bool] = None
+        self._checked_at = 0.0
+        self._probe: Optional[asyncio.Task] = None
+    
+    async def derive_key_bytes(self, path: str) -> bytes:
+        key = self._keys.get(path)
+        if key is None:
+            lock = self._key_locks.setdefault(path, asyncio.Lock())
+            async with lock:
+                key = self._keys.get(path)
+                if key is None:
+                    try:
+                        derive_key = await self.client.derive_key(path, TEE_SECRET)
+                    except Exception:
+                        self._set_available(False)
+                        raise
+                    assert isinstance(derive_key, DeriveKeyResponse)
+                    key = bytearray(derive_key.toBytes(32))
+                    self._keys[path] = key
+                    self._set_available(True)
+        return bytes(key)
+    
+    async def derive_user_key(self, webhook_id: str, user_id: str) -> Optional[str]:
+        try:
+            user_key = (await self.derive_key_bytes(f'/yeti/user/{user_id}')).hex()
+            logger.info(f"TEE key derived for user {user_id}")
+            return user_key
+        except Exception as e:
+            logger.warning(f"TEE key derivation failed for user {user_id}: {e}")
+            return None
+    
+    async def derive_private_key(self) -> str:
+        try:
+            private_key = (await self.derive_key_bytes('/yeti/master')).hex()
+            if not private_key.startswith('0x'):
+                private_key = '0x' + private_key
             
-        # Extract timestamp and provided signature from webhook ID
-        timestamp = webhook_bytes[:4]
-        provided_id_signature = webhook_bytes[4:]
-        
-        # Generate the full HMAC once
-        full_signature = hmac.new(master_secret, timestamp, hashlib.sha256).digest()
-        
-        # Expected components
-        expected_id_signature = full_signature[:12]
-        expected_secret = full_signature[12:].hex()
-        
-        # Verify both components with constant-time comparison
-        id_valid = hmac.compare_digest(provided_id_signature, expected_id_signature)
-        secret_valid = hmac.compare_digest(provided_secret, expected_secret)
-        
-        return id_valid and secret_valid
-        
-    except (ValueError, TypeError):
-        return False
+            logger.info("TEE master private key derived")
+            return private_key
+        except Exception as e:
+            logger.error(f"TEE private key derivation failed: {e}")
+            raise
+    
+    async def derive_shard_keys(self, shards: int) -> list[str]:
+        """Private keys of the extra submitter shards; shard 0 is the master key"""
+        keys = await asyncio.gather(*(self.derive_key_bytes(f'/yeti/submitter/{index}') for index in range(1, shards)))
+        return ['0x' + key.hex() for key in keys]
+    
+    def is_available(self) -> bool:
+        """Last known TEE liveness; schedules a refresh probe once the cached result expires"""
+        stale = time.monotonic() - self._checked_at >= TEE_LIVENESS_TTL
+        if stale and (self._probe is None or self._probe.done()):
+            self._probe = asyncio.create_task(self._check_liveness())
+        return bool(self._available)
+    
+    async def _check_liveness(self):
+        try:
+            await self.client.info()
+            self._set_available(True)
+        except Exception as e:
+            logger.warning(f"TEE liveness check failed: {e}")
+            self._set_available(False)
+    
+    def _set_available(self, available: bool):
+        self._available = available
+        self._checked_at = time.monotonic()
+    
+    def clear(self):
+        """Zero and drop all cached key material"""
+        for key in self._keys.values():
+            key[:] = bytes(len(key))
+        self._keys.clear()
+    
 
 class WebhookManager:
-    def __init__(self):
+    def __init__(self, tee_processor: TEEProcessor):
+        self.tee_processor = tee_processor
         self.webhook_secret: Optional[bytes] = None
     
     async def initialize(self):
         """Initialize webhook secret from TEE - called once on startup"""
         if self.webhook_secret is None:
-            client = AsyncTappdClient()
-            derive_key = await client.derive_key('/yeti/hmac', TEE_SECRET)
-            assert isinstance(derive_key, DeriveKeyResponse)
-            self.webhook_secret = derive_key.toBytes(32)  # 32 bytes for HMAC key
+            self.webhook_secret = await self.tee_processor.derive_key_bytes('/yeti/hmac')  # 32 bytes for HMAC key
             logger.info("Webhook secret derived from TEE")
     
     def create_webhook(self) -> dict:
@@ -106,8 +268,25 @@ class WebhookManager:
             
         webhook_id, verification_secret = generate_webhook_with_secret(self.webhook_secret)
         
-        logger.info(f"Created secure webhook {webhook_id}")
+        logger.info("Created secure webhook %s", webhook_id)
+        
+        return self._webhook_response(webhook_id, verification_secret)
+    
+    def create_webhooks(self, count: int) -> list[dict]:
+        if self.webhook_secret is None:
+            raise RuntimeError("WebhookManager not initialized")
+        
+        webhooks = [
+            self._webhook_response(webhook_id, verification_secret)
+            for webhook_id, verification_secret in generate_webhooks_with_secret(self.webhook_secret, count)
+        ]
+        
+        logger.info(f"Created {count} secure webhooks")
         
+        return webhooks
+    
+    @staticmethod
+    def _webhook_response(webhook_id: str, verification_secret: str) -> dict:
         return {
             "webhook_id": webhook_id,
             "webhook_url": f"/webhook/{webhook_id}",
@@ -121,41 +300,12 @@ class WebhookManager:
             raise RuntimeError("WebhookManager not initialized")
         return verify_webhook_id(webhook_id, self.webhook_secret)
 
-class TEEProcessor:
-    @staticmethod
-    async def derive_user_key(webhook_id: str, user_id: str) -> Optional[str]:
-        try:
-            client = AsyncTappdClient()
-            derive_key = await client.derive_key(f'/yeti/user/{user_id}', TEE_SECRET)
-            assert isinstance(derive_key, DeriveKeyResponse)
-            user_key = derive_key.toBytes(32).hex()
-            logger.info(f"TEE key derived for user {user_id}")
-            return user_key
-        except Exception as e:
-            logger.warning(f"TEE key derivation failed for user {user_id}: {e}")
-            return None
-    
-    @staticmethod
-    async def derive_private_key() -> str:
-        try:
-            client = AsyncTappdClient()
-            derive_key = await client.derive_key('/yeti/master', TEE_SECRET)
-            assert isinstance(derive_key, DeriveKeyResponse)
-            
-            private_key = derive_key.toBytes(32).hex()
-            if not private_key.startswith('0x'):
-                private_key = '0x' + private_key
-            
-            logger.info("TEE master private key derived")
-            return private_key
-        except Exception as e:
-            logger.error(f"TEE private key derivation failed: {e}")
-            raise
-    
-
 class WebhookServer:
     def __init__(self):
-        self.app = FastAPI(title="TradingView Webhook Server")
+        self.app = FastAPI(title="TradingView Webhook Server", default_response_class=FastJSONResponse)
+        if WEBHOOK_FAST_LANE:
+            # Added before CORS so CORS headers still wrap its responses
+            self.app.add_middleware(WebhookFastLane, server=self)
         origins = [
             "http://localhost",
             "http://localhost:3008",
@@ -168,15 +318,49 @@ class WebhookServer:
             allow_methods=["*"],
             allow_headers=["*"],
         )
-        self.webhook_manager = WebhookManager()
-        self.blockchain_manager = None
         self.tee_processor = TEEProcessor()
+        self.webhook_manager = WebhookManager(self.tee_processor)
+        self.blockchain_manager = None
+        self.submission_tracker = None
+        self.alert_cache = AlertCache()
+        self.alert_dedup = AlertDeduplicator()
+        self.admission = AdmissionController(lambda: self.submission_tracker.backlog if self.submission_tracker else 0)
+        self.alert_indexer = None
+        self.alert_callbacks = AlertCallbacks() if ALERT_CALLBACK_URLS else None
+        self.traffic_capture = TrafficCapture() if CAPTURE_PATH else None
+        self.metrics_collector = None
+        # Ingest workers forward alerts to the active signer; signers wait for the signer lock
+        self.signer_client = SignerClient() if SERVER_ROLE == "ingest" else None
+        self.signer_lock = LeaderLock() if SERVER_ROLE == "signer" else None
+        self.signer_endpoint = None
+        # Webhooks are answered once started; GET /ready passes once ready (see _start)
+        self.started = False
+        self.ready = False
+        self._startup: Optional[asyncio.Task] = None
         self._setup_routes()
         
         @self.app.on_event("startup")
         async def startup_event():
-            await self.webhook_manager.initialize()
-            await self._initialize_blockchain()
+            # Listen right away; /health and /ready answer while the rest starts up
+            self._startup = asyncio.create_task(self._start())
+            if self.traffic_capture:
+                self.traffic_capture.start()
+        
+        @self.app.on_event("shutdown")
+        async def shutdown_event():
+            if self._startup:
+                self._startup.cancel()
+                await asyncio.gather(self._startup, return_exceptions=True)
+            if self.signer_endpoint:
+                await self.signer_endpoint.stop()
+            if self.signer_client:
+                await self.signer_client.close()
+            await self._stop_blockchain()
+            if self.traffic_capture:
+                await self.traffic_capture.stop()
+            if self.signer_lock:
+                self.signer_lock.release()
+            self.tee_processor.clear()
     
     def _setup_routes(self):
         
@@ -186,116 +370,475 @@ class WebhookServer:
 
         @self.app.post("/create-webhook")
         async def create_webhook():
+            self._require_started()
             return self.webhook_manager.create_webhook()
 
+        @self.app.post("/create-webhooks")
+        async def create_webhooks(count: int = 1):
+            if not 1 <= count <= WEBHOOK_BULK_MAX:
+                raise HTTPException(status_code=400, detail=f"count must be between 1 and {WEBHOOK_BULK_MAX}")
+            self._require_started()
+            # Encoded directly; jsonable_encoder would cost more than generating the IDs
+            return FastJSONResponse({"webhooks": self.webhook_manager.create_webhooks(count)})
+
         @self.app.post("/webhook/{webhook_id}")
         async def receive_webhook(webhook_id: str, request: Request):
             return await self._handle_webhook(webhook_id, request)
 
         @self.app.get("/webhook/{webhook_id}/testing/{action}")
         async def receive_webhook(webhook_id: str, action: str, request: Request):
-            return await self._handle_webhook_testing(webhook_id, action, request)
+            with self.admission_slot(Lane.TESTING, webhook_id):
+                return await self._handle_webhook_testing(webhook_id, action, request)
 
 
         @self.app.get("/alert/{webhook_id}")
         async def get_alert(webhook_id: str):
+            self._require_started()
+            if self.signer_client:
+                return await self._on_signer("alert", webhook_id=webhook_id)
             return await self._get_alert(webhook_id)
 
+        @self.app.get("/alert/{webhook_id}/submission")
+        async def get_alert_submission(webhook_id: str):
+            self._require_started()
+            if self.signer_client:
+                return await self._on_signer("submission", webhook_id=webhook_id)
+            return self._get_submission(webhook_id)
+
+        @self.app.get("/alerts")
+        async def list_alerts(since_block: int = 0, alert_id: Optional[str] = None, limit: int = 500):
+            self._require_started()
+            if self.signer_client:
+                return await self._on_signer("alerts", since_block=since_block, alert_id=alert_id, limit=limit)
+            return await self._list_alerts(since_block, alert_id, limit)
+
+        @self.app.get("/alerts/stream")
+        async def stream_alerts(request: Request, since_block: Optional[int] = None):
+            if self.signer_client:
+                raise HTTPException(status_code=503, detail="The alert stream is served by the signer")
+            self._require_active()
+            return StreamingResponse(self._stream_alerts(request, since_block), media_type="text/event-stream")
+
+        @self.app.get("/metrics")
+        async def metrics():
+            return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
         @self.app.get("/health")
         async def health_check():
             return await self._health_check()
 
+        @self.app.get("/ready")
+        async def readiness_check():
+            return self._readiness_check()
+
         @self.app.get("/status")
         async def server_status():
             return await self._get_server_status()
     
+    async def _start(self):
+        """Initialize in the background, retrying after a growing delay rather than exiting, since
+        a restart would pay for the imports again. Ready once alerts can be handled here: on a
+        signer once it holds the signer lock, on an ingest worker once it reached the signer."""
+        delay = STARTUP_RETRY_DELAY
+        while True:
+            try:
+                await self._initialize()
+                break
+            except Exception as e:
+                logger.critical(f"Startup failed, retrying in {delay:g}s: {e!r}")
+                await self._stop_blockchain()
+                if self.signer_lock:
+                    self.signer_lock.release()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, STARTUP_RETRY_MAX_DELAY)
+        self.ready = True
+        startup_profile.ready()
+        logger.info(f"Ready after {startup_profile.phases['ready']:.2f}s: " +
+                    ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in startup_profile.phases.items() if phase != "ready"))
+    
+    async def _initialize(self):
+        if SERVER_ROLE == "ingest":
+            with startup_profile.phase("tee_keys"):
+                _, key = await asyncio.gather(
+                    self.webhook_manager.initialize(), self.tee_processor.derive_key_bytes('/yeti/signer-ipc')
+                )
+            self.signer_client.start(key)
+            self.started = True
+            # Connect before reporting ready rather than on the first webhook
+            with startup_profile.phase("signer_connection"):
+                await self.signer_client.connect()
+            return
+        # The signing workers' fork server does its imports meanwhile (on a standby, while it waits)
+        start_fork_server()
+        if SERVER_ROLE == "signer":
+            with startup_profile.phase("tee_keys"):
+                await self.webhook_manager.initialize()
+            self.started = True
+            await self._lead()
+        else:
+            await asyncio.gather(self.webhook_manager.initialize(), self._initialize_blockchain())
+            self.started = True
+    
     async def _initialize_blockchain(self):
+        logger.info("Initializing blockchain connection")
+        manager = BlockchainManager()
         try:
-            logger.info("Initializing blockchain connection")
-            private_key = await self.tee_processor.derive_private_key()
-            self.blockchain_manager = BlockchainManager(private_key)
-            logger.info("Blockchain connection established")
-        except Exception as e:
-            logger.critical(f"Blockchain initialization failed: {e}")
-            raise SystemExit(f"Blockchain connection required but failed: {e}")
+            # The keys are derived while the RPC connection opens
+            results = await asyncio.gather(
+                startup_profile.timed("tee_keys", asyncio.gather(
+                    self.tee_processor.derive_private_key(), self.tee_processor.derive_shard_keys(SUBMITTER_SHARDS)
+                )),
+                manager.open(),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            manager.add_submitters(*results[0])
+            await manager.connect()
+        except BaseException:
+            await manager.close()
+            raise
+        self.blockchain_manager = manager
+        with startup_profile.phase("services"):
+            self.submission_tracker = SubmissionTracker(self.blockchain_manager, AlertJournal())
+            self.submission_tracker.add_mined_listener(self._invalidate_cached_alerts)
+            if self.alert_callbacks:
+                self.alert_callbacks.start()
+                self.submission_tracker.add_mined_listener(self.alert_callbacks.notify)
+            await self.submission_tracker.start()
+            self.alert_indexer = AlertIndexer(self.blockchain_manager, AlertStore())
+            self.alert_indexer.add_listener(lambda event: self.alert_cache.invalidate(event["alert_id"]))
+            self.alert_indexer.start()
+            self.metrics_collector = MetricsCollector(self.blockchain_manager)
+            self.metrics_collector.start()
+        logger.info("Blockchain connection established")
+    
+    async def _stop_blockchain(self):
+        """Stop what _initialize_blockchain started, on shutdown or before a retry"""
+        if self.submission_tracker:
+            await self.submission_tracker.stop()
+            self.submission_tracker = None
+        if self.alert_indexer:
+            await self.alert_indexer.stop()
+            self.alert_indexer = None
+        if self.alert_callbacks:
+            await self.alert_callbacks.stop()
+        if self.metrics_collector:
+            await self.metrics_collector.stop()
+            self.metrics_collector = None
+        if self.blockchain_manager:
+            await self.blockchain_manager.close()
+            self.blockchain_manager = None
+    
+    async def _lead(self):
+        """Signer role: once this process holds the signer lock, take over the keys, nonces and
+        journal (replaying what the previous signer left unfinished) and serve ingest workers"""
+        with startup_profile.phase("signer_lock"):
+            await self.signer_lock.acquire()
+        await self._initialize_blockchain()
+        self.signer_endpoint = SignerEndpoint({
+            "submit": self._submit_forwarded,
+            "submission": self._get_submission,
+            "alert": self._get_alert,
+            "alerts": self._list_alerts,
+            "health": self._health_check
+        }, await self.tee_processor.derive_key_bytes('/yeti/signer-ipc'))
+        await self.signer_endpoint.start(SIGNER_LISTEN)
+    
+    def _require_started(self):
+        """503 while the webhook secret (and on ingest workers the signer key) is being derived"""
+        if not self.started:
+            raise HTTPException(status_code=503, detail="Server is starting", headers={"Retry-After": "1"})
+    
+    def _require_active(self):
+        """503 until alerts can be submitted here, which on a standby signer is once it takes over"""
+        if self.submission_tracker is None:
+            detail = "Not the active signer" if self.signer_lock and not self.signer_lock.held else "Server is starting"
+            raise HTTPException(status_code=503, detail=detail, headers={"Retry-After": "1"})
+    
+    def _readiness_check(self) -> Response:
+        """Whether a load balancer should send webhooks here. Unlike /health (is the process
+        and what it depends on alive), this stays 503 until startup, including the warm-up of
+        the signing workers and RPC connections, is complete and on standby signers."""
+        return FastJSONResponse(
+            {"status": "ready" if self.ready else "starting", "startup": startup_profile.phases},
+            status_code=200 if self.ready else 503
+        )
+    
+    async def _signer_request(self, op: str, args: Optional[dict] = None, shared: Optional[tuple] = None) -> tuple[int, dict]:
+        """Ingest role: status and body of an op on the active signer, errors raised as over HTTP"""
+        try:
+            status_code, body, headers = await self.signer_client.request(op, args, shared)
+        except SignerUnavailable as e:
+            logger.error(f"Signer request {op} failed: {e}")
+            raise HTTPException(status_code=503, detail="No signer available", headers={"Retry-After": "1"})
+        if status_code >= 400:
+            raise HTTPException(status_code=status_code, detail=body.get("detail"), headers=headers)
+        return status_code, body
+    
+    async def _on_signer(self, op: str, **args) -> dict:
+        return (await self._signer_request(op, args))[1]
+    
+    @contextmanager
+    def admission_slot(self, lane: int, webhook_id: str):
+        """Hold an admission slot for a webhook, or answer 429/503 right away if there is none"""
+        # Checked first, so webhooks refused while starting do not use up the webhook's rate
+        self._require_started()
+        rejection = self.admission.admit(webhook_id, lane)
+        if rejection is not None:
+            record_failure("admission", rejection.reason)
+            raise HTTPException(status_code=rejection.status_code, detail=rejection.detail,
+                                headers={"Retry-After": str(rejection.retry_after)})
+        try:
+            yield
+        finally:
+            self.admission.release(lane)
     
     async def _handle_webhook(self, webhook_id: str, request: Request) -> dict:
-        logger.info(f"Received webhook: {webhook_id}")
-        
-        client_ip = self._extract_client_ip(request)
-        if not TradingViewIPValidator.verify_ip(client_ip):
-            logger.warning(f"Unauthorized IP: {client_ip}")
-            raise HTTPException(status_code=403, detail="Request not from TradingView IP")
-
-        action, secret = await self._parse_action_secret(request)
+        return await self.receive_webhook(
+            webhook_id, request.client.host if request.client else "", request.headers.get("x-forwarded-for"),
+            request.headers.get("idempotency-key"), request.receive
+        )
+    
+    async def receive_webhook(self, webhook_id: str, peer: str, forwarded_for: Optional[str],
+                              idempotency_key: Optional[str], receive: Receive) -> dict:
+        """Authenticate a TradingView webhook and submit its alert; shared by the route and WebhookFastLane"""
+        with log_context(request_id=secrets.token_hex(8), webhook_id=webhook_id):
+            # Hot path: log arguments are only formatted if the record is written, on the log thread
+            logger.info("Received webhook: %s", webhook_id)
+            
+            with stage("ip_check"):
+                client_ip = self._client_ip(peer, forwarded_for)
+                if not TradingViewIPValidator.verify_ip(client_ip):
+                    logger.warning("Unauthorized IP: %s", client_ip)
+                    record_failure("ip_check", "unauthorized_ip")
+                    raise HTTPException(status_code=403, detail="Request not from TradingView IP")
+            
+            # Only after the allowlist, so other clients cannot spend TradingView's rate or capacity
+            with self.admission_slot(Lane.LIVE, webhook_id):
+                return await self._receive_webhook(webhook_id, client_ip, idempotency_key, receive)
+    
+    async def _receive_webhook(self, webhook_id: str, client_ip: str, idempotency_key: Optional[str],
+                               receive: Receive) -> dict:
+        with stage("body_parse"):
+            try:
+                body = await read_body(receive)
+                action, secret = parse_action_secret(body)
+            except HTTPException:
+                record_failure("body_parse", "invalid_body")
+                raise
         
         # Verify webhook ID and secret in one operation
-        if not verify_webhook_id_and_secret(webhook_id, secret, self.webhook_manager.webhook_secret):
-            logger.warning(f"Invalid webhook ID or secret for {webhook_id}")
-            raise HTTPException(status_code=403, detail="Invalid webhook ID or secret")
+        with stage("hmac_verify"):
+            if not verify_webhook_id_and_secret(webhook_id, secret, self.webhook_manager.webhook_secret):
+                logger.warning("Invalid webhook ID or secret for %s", webhook_id)
+                record_failure("hmac_verify", "invalid_secret")
+                raise HTTPException(status_code=403, detail="Invalid webhook ID or secret")
         
-        logger.info(f"Processing webhook {webhook_id} with action '{action}' from {client_ip}")
+        logger.info("Processing webhook %s with action '%s' from %s", webhook_id, action, client_ip)
+        
+        idempotency_key = idempotency_key or hashlib.sha256(body).hexdigest()
+        if self.traffic_capture:
+            self.traffic_capture.record(webhook_id, action, idempotency_key)
         
         # Create payload for blockchain submission
         payload = {"action": action}
         
-        blockchain_result = await self.blockchain_manager.submit_alert_on_chain(webhook_id, payload)
-        
-        if blockchain_result["success"]:
-            logger.info(f"Alert submitted: TX {blockchain_result['tx_hash']}")
-        else:
-            logger.error(f"Blockchain submission failed: {blockchain_result['error']}")
-            raise HTTPException(status_code=500, detail="Failed to process webhook")
-        
-        return {"status": "received"}
+        return await self._submit_alert(webhook_id, payload, idempotency_key)
 
     async def _handle_webhook_testing(self, webhook_id: str, action: str, request: Request) -> dict:
-        logger.info(f"Received webhook: {webhook_id} (testing mode)")
+        with log_context(request_id=secrets.token_hex(8), webhook_id=webhook_id):
+            return await self._receive_webhook_testing(webhook_id, action, request)
+    
+    async def _receive_webhook_testing(self, webhook_id: str, action: str, request: Request) -> dict:
+        logger.info("Received webhook: %s (testing mode)", webhook_id)
 
         if not self.webhook_manager.webhook_exists(webhook_id):
             raise HTTPException(status_code=404, detail="Invalid webhook ID")
         
-        logger.info(f"Processing test webhook {webhook_id} with action '{action}' (secret verification bypassed)")
+        logger.info("Processing test webhook %s with action '%s' (secret verification bypassed)", webhook_id, action)
         
         # Create payload for blockchain submission
         payload = {"action": action}
         
-        blockchain_result = await self.blockchain_manager.submit_alert_on_chain(webhook_id, payload)
+        return await self._submit_alert(webhook_id, payload, await self._idempotency_key(request), Lane.TESTING)
+    
+    async def _idempotency_key(self, request: Request) -> str:
+        """Client-supplied Idempotency-Key header, or a hash of the body so resends match"""
+        key = request.headers.get("idempotency-key")
+        if key:
+            return key
+        return hashlib.sha256(await request.body()).hexdigest()
+    
+    async def _submit_alert(self, webhook_id: str, payload: dict, idempotency_key: str, lane: int = Lane.LIVE):
+        """Submit an authenticated alert according to ACCEPT_MODE, suppressing duplicates"""
+        if self.signer_client:
+            return await self._forward_alert(webhook_id, payload, idempotency_key, lane)
+        self._require_active()
+        action = self.blockchain_manager.action_from_payload(payload)
+        
+        if DEDUP_SKIP_UNCHANGED and await self._action_unchanged(webhook_id, action):
+            logger.info("Skipping alert for %s: action unchanged", webhook_id)
+            await self._record_saved("unchanged")
+            return {"status": "unchanged", "submission_url": f"/alert/{webhook_id}/submission"}
         
-        if blockchain_result["success"]:
-            logger.info(f"Alert submitted: TX {blockchain_result['tx_hash']}")
+        submission, duplicate = await self.alert_dedup.submit(
+            (webhook_id, action, idempotency_key),
+            lambda: self.submission_tracker.enqueue(webhook_id, payload, lane)
+        )
+        if duplicate:
+            logger.info("Duplicate delivery for %s, answering with the original submission", webhook_id)
+            await self._record_saved("duplicate", submission)
         else:
-            logger.error(f"Blockchain submission failed: {blockchain_result['error']}")
-            raise HTTPException(status_code=500, detail="Failed to process webhook")
+            ALERTS.labels(submission.action_name).inc()
         
-        return {"status": "received"}
+        if ACCEPT_MODE == "sync":
+            await submission.done_event.wait()
+            
+            if submission.status == SubmissionStatus.MINED:
+                logger.info("Alert submitted: TX %s", submission.tx_hash)
+            elif submission.status == SubmissionStatus.SUPERSEDED:
+                return {"status": SubmissionStatus.SUPERSEDED}
+            else:
+                logger.error("Blockchain submission failed: %s", submission.error)
+                raise HTTPException(status_code=500, detail="Failed to process webhook")
+            
+            return {"status": "received"}
+        
+        if ACCEPT_MODE == "broadcast":
+            try:
+                await asyncio.wait_for(submission.broadcast_event.wait(), timeout=BROADCAST_WAIT_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("Alert for %s not broadcast within %ss, answering as queued", webhook_id, BROADCAST_WAIT_TIMEOUT)
+            if submission.status == SubmissionStatus.FAILED:
+                raise HTTPException(status_code=500, detail="Failed to process webhook")
+        
+        return FastJSONResponse(status_code=202, content={
+            "status": submission.status,
+            "submission_url": f"/alert/{webhook_id}/submission"
+        })
+    
+    async def _forward_alert(self, webhook_id: str, payload: dict, idempotency_key: str, lane: int):
+        """Ingest role: hand an alert to the active signer, which deduplicates across all workers.
+        Identical deliveries arriving while one is being forwarded share its answer."""
+        status_code, body = await self._signer_request(
+            "submit",
+            {"webhook_id": webhook_id, "payload": payload, "idempotency_key": idempotency_key, "lane": lane},
+            shared=(webhook_id, action_from_payload(payload), idempotency_key)
+        )
+        return FastJSONResponse(status_code=status_code, content=body)
+    
+    async def _submit_forwarded(self, webhook_id: str, payload: dict, idempotency_key: str, lane: int):
+        """Signer role: an alert from an ingest worker, admitted against this signer's limits,
+        which so apply to the traffic of all workers together"""
+        with self.admission_slot(lane, webhook_id):
+            return await self._submit_alert(webhook_id, payload, idempotency_key, lane)
+    
+    async def _action_unchanged(self, webhook_id: str, action: int) -> bool:
+        """Whether the latest pending or mined submission, or else the chain, already has this action"""
+        latest = self.submission_tracker.submissions.get(webhook_id)
+        if latest is not None and latest.status != SubmissionStatus.FAILED:
+            return latest.action == action
+        result = await self.alert_cache.get(webhook_id, self.blockchain_manager.get_alert_from_chain)
+        return result["success"] and result["exists"] and result["action"] == action
+    
+    async def _record_saved(self, reason: str, submission=None):
+        # Gas actually used by the original once mined, otherwise the calibrated limit
+        if submission and submission.gas_used:
+            gas = submission.gas_used
+        else:
+            gas = await self.blockchain_manager.fee_oracle.gas_limit() or 0
+        self.alert_dedup.record_saved(gas, unchanged=reason == "unchanged")
+        DUPLICATES.labels(reason).inc()
+        DEDUP_SAVED_GAS.inc(gas)
+        DEDUP_SAVED_RPC_CALLS.inc(RPC_CALLS_PER_SUBMISSION)
+    
+    def _get_submission(self, webhook_id: str) -> dict:
+        if not self.webhook_manager.webhook_exists(webhook_id):
+            raise HTTPException(status_code=404, detail="Invalid webhook ID")
+        self._require_active()
+        
+        submission = self.submission_tracker.get_submission(webhook_id)
+        if submission is None:
+            raise HTTPException(status_code=404, detail="No submission recorded for this webhook")
+        return submission
+    
+    def _invalidate_cached_alerts(self, submissions: list):
+        for submission in submissions:
+            self.alert_cache.invalidate(submission.webhook_id)
     
     async def _get_alert(self, webhook_id: str) -> dict:
         if not self.webhook_manager.webhook_exists(webhook_id):
             raise HTTPException(status_code=404, detail="Invalid webhook ID")
+        self._require_active()
         
         try:
-            result = await self.blockchain_manager.get_alert_from_chain(webhook_id)
+            result = await self.alert_cache.get(webhook_id, self.blockchain_manager.get_alert_from_chain)
             if not result["success"]:
                 raise HTTPException(status_code=500, detail=result["error"])
             return result
         except Exception as e:
-            logger.error(f"Failed to retrieve alert {webhook_id}: {e}")
+            logger.error("Failed to retrieve alert %s: %s", webhook_id, e)
             raise HTTPException(status_code=500, detail=f"Failed to retrieve alert: {e}")
     
+    async def _list_alerts(self, since_block: int, alert_id: Optional[str], limit: int) -> dict:
+        """Indexed AlertSubmitted events from since_block onwards, oldest first"""
+        self._require_active()
+        limit = max(1, min(limit, 1000))
+        return {
+            "alerts": await asyncio.to_thread(self.alert_indexer.store.events_since, since_block, alert_id, limit),
+            "indexed_block": self.alert_indexer.indexed_block
+        }
+    
+    async def _stream_alerts(self, request: Request, since_block: Optional[int]):
+        """Server-Sent Events stream of AlertSubmitted events, optionally replaying from since_block"""
+        queue = self.alert_indexer.subscribe()
+        try:
+            # Position of the last event replayed, to skip the live events the replay already sent
+            last_seen = (-1, -1)
+            if since_block is not None:
+                last_seen = (since_block, -1)
+                while True:
+                    events = await asyncio.to_thread(
+                        self.alert_indexer.store.events_since, last_seen[0], None, 1000, last_seen[1]
+                    )
+                    for event in events:
+                        yield f"event: alert\ndata: {json.dumps(dict(event, type='alert'))}\n\n"
+                    if events:
+                        last_seen = (events[-1]["block_number"], events[-1]["log_index"])
+                    if len(events) < 1000:
+                        break
+            
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    break
+                if event["type"] == "reorg":
+                    # Alerts re-indexed after a reorg are new to the subscriber, wherever they are
+                    last_seen = (-1, -1)
+                elif (event["block_number"], event["log_index"]) <= last_seen:
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            self.alert_indexer.unsubscribe(queue)
+    
     async def _health_check(self) -> dict:
         try:
-            blockchain_healthy = (
-                self.blockchain_manager is not None and 
-                self.blockchain_manager.account is not None and
-                self.blockchain_manager.w3.is_connected()
-            )
+            if self.signer_client:
+                blockchain_healthy = (await self._on_signer("health"))["status"] == "pass"
+            else:
+                blockchain_healthy = (
+                    self.blockchain_manager is not None and 
+                    self.blockchain_manager.account is not None and
+                    await self.blockchain_manager.w3.is_connected()
+                )
             
-            tee_healthy = True
-            try:
-                await self.tee_processor.derive_private_key()
-            except Exception:
-                tee_healthy = False
+            tee_healthy = self.tee_processor.is_available()
             
             all_healthy = blockchain_healthy and tee_healthy
             
@@ -324,27 +867,27 @@ class WebhookServer:
             # Get blockchain info (filtered for security)
             blockchain_info = {"oracle": CONTRACT_ADDRESS}
             if self.blockchain_manager:
-                blockchain_info.update(self.blockchain_manager.get_account_balance())
+                blockchain_info.update(await self.blockchain_manager.get_account_balance())
             
             # TEE status
-            tee_status = {"available": False}
-            try:
-                await self.tee_processor.derive_private_key()
-                tee_status = {
-                    "available": True
-                }
-            except Exception:
-                tee_status = {
-                    "available": False
-                }
+            tee_status = {"available": self.tee_processor.is_available()}
             
             return {
                 "server": {
                     "status": "running",
+                    "role": SERVER_ROLE,
+                    "ready": self.ready,
+                    "startup": startup_profile.phases,
                     "timestamp": self._get_current_timestamp()
                 },
                 "blockchain": blockchain_info,
-                "tee": tee_status
+                "tee": tee_status,
+                "alert_cache": self.alert_cache.stats(),
+                "dedup": self.alert_dedup.stats(),
+                "admission": self.admission.stats(),
+                "callbacks": self.alert_callbacks.stats() if self.alert_callbacks else [],
+                "capture": self.traffic_capture.stats() if self.traffic_capture else None,
+                "signer": self._signer_status()
             }
         except Exception as e:
             logger.error(f"Status check failed: {e}")
@@ -356,49 +899,29 @@ class WebhookServer:
                 }
             }
     
+    def _signer_status(self) -> Optional[dict]:
+        if self.signer_client:
+            return self.signer_client.stats()
+        if self.signer_lock:
+            return {
+                "active": self.signer_lock.held,
+                "lock": self.signer_lock.path,
+                "endpoint": self.signer_endpoint.stats() if self.signer_endpoint else None
+            }
+        return None
+    
     def _get_current_timestamp(self) -> str:
         """Get current timestamp in ISO format"""
         from datetime import datetime, timezone
         return datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
     
-    def _extract_client_ip(self, request: Request) -> str:
-        """Extract client IP from request headers"""
-        client_ip = request.client.host
-        
+    @staticmethod
+    def _client_ip(peer: str, forwarded_for: Optional[str]) -> str:
+        """Client IP of a request from its peer address and X-Forwarded-For header"""
         # Handle reverse proxy scenarios (ngrok, etc.)
-        if client_ip.startswith('172') or client_ip.startswith('10.'):
-            forwarded_for = request.headers.get('x-forwarded-for')
-            if forwarded_for:
-                client_ip = forwarded_for.split(',')[0].strip()
-        
-        return client_ip
-    
-    async def _parse_action_secret(self, request: Request) -> tuple[str, str]:
-        """Parse ACTION_SECRET format from request body"""
-        body = await request.body()
-        message = body.decode('utf-8').strip()
-        
-        # Handle both JSON (legacy) and ACTION_SECRET formats
-        if message.startswith('{'):
-            try:
-                payload = json.loads(message)
-                if 'action' in payload and 'secret' in payload:
-                    return payload['action'], payload['secret']
-                else:
-                    raise HTTPException(status_code=400, detail="JSON must contain 'action' and 'secret' fields")
-            except json.JSONDecodeError:
-                raise HTTPException(status_code=400, detail="Invalid JSON format")
-        else:
-            # Parse ACTION_SECRET format
-            parts = message.split('_', 1)  # Split on first underscore only
-            if len(parts) != 2:
-                raise HTTPException(status_code=400, detail="Message must be in ACTION_SECRET format (e.g., 'buy_abc123')")
-            
-            action, secret = parts
-            if not action or not secret:
-                raise HTTPException(status_code=400, detail="Both action and secret must be non-empty")
-                
-            return action, secret
+        if forwarded_for and (peer.startswith('172') or peer.startswith('10.')):
+            return forwarded_for.split(',')[0].strip()
+        return peer
 
 def create_app() -> FastAPI:
     """Factory function to create FastAPI app"""